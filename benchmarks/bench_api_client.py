@@ -0,0 +1,87 @@
+import asyncio
+import json
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.harness import benchmark
+from trading_strategies.apis.api_utility import query_api
+from trading_strategies.apis.session import (
+    close_all_sessions,
+    configure_sessions,
+    get_session_config,
+)
+from trading_strategies.models.custom_models import AuthConfig
+
+CASE_PAYLOAD = json.dumps(
+    {
+        "name": "STUB",
+        "period": 1,
+        "tick": 42,
+        "ticks_per_period": 300,
+        "status": "ACTIVE",
+    }
+).encode()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Answers every request with a fixed case payload over keep-alive HTTP/1.1."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+    def _reply(self):
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(CASE_PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(CASE_PAYLOAD)
+
+    do_GET = do_POST = do_DELETE = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def stub_server():
+    """Runs the stub RIT server on a free local port in a background thread."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+async def _repeat(coroutine_factory, number: int):
+    for _ in range(number):
+        await coroutine_factory()
+
+
+@benchmark("query_api_round_trip")
+@contextmanager
+def query_api_round_trip():
+    """Sequential GET /v1/case through query_api against a local stub server."""
+    previous = get_session_config()
+    # Measure client overhead, not the rate limiter
+    configure_sessions(previous.model_copy(update={"rate_limit": 1e9, "burst": 10**6}))
+    loop = asyncio.new_event_loop()
+    with stub_server() as port:
+        auth = AuthConfig(
+            username="bench", password="bench", server="127.0.0.1", port=port
+        )
+
+        def run(number: int):
+            loop.run_until_complete(
+                _repeat(lambda: query_api("get", "/v1/case", auth), number)
+            )
+
+        try:
+            yield run
+        finally:
+            loop.run_until_complete(close_all_sessions())
+            loop.close()
+            configure_sessions(previous)
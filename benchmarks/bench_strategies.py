@@ -0,0 +1,231 @@
+import asyncio
+import io
+import random
+from contextlib import contextmanager, redirect_stdout
+from unittest.mock import patch
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+from trading_strategies.models.custom_models import AuthConfig
+from trading_strategies.models.rit_records import OrderBookRecord
+
+BOOK_DEPTHS = (20, 100, 500)
+PORTFOLIO_SIZES = (4, 50, 200)
+AUTH = AuthConfig(username="bench", password="bench", server="127.0.0.1", port=1)
+
+
+def make_order_book(depth: int, mid: float = 25.0, seed: int = 7) -> dict:
+    """Builds an RIT style book with `depth` resting orders per side."""
+    rng = random.Random(seed)
+
+    def side(action: str, sign: int):
+        return [
+            {
+                "order_id": level,
+                "ticker": "CRZY",
+                "type": "LIMIT",
+                "action": action,
+                "price": round(mid + sign * (0.01 + level * 0.01), 2),
+                "quantity": rng.randrange(100, 10000, 100),
+                "quantity_filled": 0,
+                "status": "OPEN",
+            }
+            for level in range(depth)
+        ]
+
+    return {"bids": side("BUY", -1), "asks": side("SELL", 1)}
+
+
+@contextmanager
+def _patched_book(depth: int):
+    """Serves a prebuilt book instead of fetching one, so only compute is timed."""
+    record = OrderBookRecord.from_json(make_order_book(depth), "CRZY")
+
+    async def fetch_order_book_record(ticker, auth, limit=20):
+        return record
+
+    with patch(
+        "trading_strategies.strategy.strategy_utility.fetch_order_book_record",
+        fetch_order_book_record,
+    ):
+        yield
+
+
+async def _repeat(coroutine_factory, number: int):
+    for _ in range(number):
+        await coroutine_factory()
+
+
+@benchmark("market_depth", params=BOOK_DEPTHS)
+@contextmanager
+def market_depth(depth: int):
+    from trading_strategies.strategy.strategy_utility import (
+        generate_single_market_depth_for_ticker,
+    )
+
+    loop = asyncio.new_event_loop()
+    with _patched_book(depth):
+
+        def run(number: int):
+            loop.run_until_complete(
+                _repeat(
+                    lambda: generate_single_market_depth_for_ticker(
+                        AUTH, "CRZY", depth
+                    ),
+                    number,
+                )
+            )
+
+        yield run
+    loop.close()
+
+
+@benchmark("lt3_signal", params=BOOK_DEPTHS)
+@contextmanager
+def lt3_signal(depth: int):
+    from trading_strategies.strategy.LT3_strategy_utility import generate_lt3_signal
+
+    loop = asyncio.new_event_loop()
+    with _patched_book(depth):
+
+        def run(number: int):
+            loop.run_until_complete(
+                _repeat(
+                    lambda: generate_lt3_signal(
+                        AUTH, "CRZY", 25.5, "SELL", 50000, 0.10, depth
+                    ),
+                    number,
+                )
+            )
+
+        yield run
+    loop.close()
+
+
+@benchmark("tender_valuation", params=PORTFOLIO_SIZES)
+@contextmanager
+def tender_valuation(tenders: int):
+    from trading_strategies.models.market_depth import MarketDepth
+    from trading_strategies.models.rit_records import TenderRecord
+    from trading_strategies.strategy.LT3_strategy_utility import value_tenders
+
+    rng = random.Random(11)
+    depths = {
+        f"T{i}": MarketDepth.from_record(
+            OrderBookRecord.from_json(make_order_book(20, seed=i), f"T{i}")
+        )
+        for i in range(10)
+    }
+    batch = [
+        TenderRecord(
+            i,
+            f"T{rng.randrange(10)}",
+            rng.randrange(1000, 200000, 1000),
+            rng.choice(("BUY", "SELL")),
+            round(rng.uniform(24.5, 25.5), 2),
+        )
+        for i in range(tenders)
+    ]
+
+    def run(number: int):
+        for _ in range(number):
+            value_tenders(batch, depths, 0.10, 0.00001)
+
+    yield run
+
+
+def _tickers_market_depth(depth: int):
+    from trading_strategies.strategy.strategy_utility import (
+        generate_single_market_depth_for_ticker,
+    )
+
+    loop = asyncio.new_event_loop()
+    with _patched_book(depth):
+        depth_data = loop.run_until_complete(
+            generate_single_market_depth_for_ticker(AUTH, "CRZY", depth)
+        )
+    loop.close()
+    return {"CRZY_A": list(depth_data), "CRZY_M": list(depth_data)}
+
+
+@benchmark("aggregate_orderbook", params=BOOK_DEPTHS)
+@contextmanager
+def aggregate_orderbook(depth: int):
+    from trading_strategies.strategy.strategy_utility import (
+        generate_aggregate_orderbook,
+    )
+
+    books = _tickers_market_depth(depth)
+    tickers = list(books)
+
+    def run(number: int):
+        for _ in range(number):
+            generate_aggregate_orderbook(books, tickers, depth)
+
+    yield run
+
+
+@benchmark("integrated_global_orderbook", params=BOOK_DEPTHS)
+@contextmanager
+def integrated_global_orderbook(depth: int):
+    from trading_strategies.strategy.strategy_utility import (
+        generate_integrated_global_orderbook,
+    )
+
+    books = _tickers_market_depth(depth)
+    tickers = list(books)
+
+    def run(number: int):
+        for _ in range(number):
+            generate_integrated_global_orderbook(books, tickers, depth)
+
+    yield run
+
+
+def _random_portfolio(size: int, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    volatilities = rng.uniform(0.005, 0.02, size)
+    factors = rng.normal(size=(size, 3))
+    covariance = factors @ factors.T + np.eye(size)
+    scale = np.sqrt(np.diag(covariance))
+    correlation = covariance / np.outer(scale, scale)
+    weights = rng.dirichlet(np.ones(size))
+    return volatilities, correlation, weights
+
+
+@benchmark("calculate_var", params=PORTFOLIO_SIZES)
+@contextmanager
+def calculate_var(size: int):
+    from trading_strategies.strategy.Var_utility import calculate_var
+
+    volatilities, correlation, weights = _random_portfolio(size)
+
+    def run(number: int):
+        for _ in range(number):
+            calculate_var(volatilities, correlation, weights, 1_000_000, 0.99)
+
+    yield run
+
+
+@benchmark("optimize_portfolio")
+@contextmanager
+def optimize_portfolio():
+    from cvxopt import solvers
+
+    from trading_strategies.strategy.Var_utility import optimize_portfolio
+
+    solvers.options["show_progress"] = False
+    current = {"US": 100.0, "BRIC": 50.0, "BOND": 95.0}
+    expected = {"US": 102.0, "BRIC": 49.0, "BOND": 95.5}
+    volatilities = np.array([1.31, 1.61, 0.55]) / 100
+    correlation = np.array(
+        [[1.000, 0.480, 0.068], [0.480, 1.000, 0.005], [0.068, 0.005, 1.000]]
+    )
+
+    def run(number: int):
+        with redirect_stdout(io.StringIO()):
+            for _ in range(number):
+                optimize_portfolio(current, expected, volatilities, correlation)
+
+    yield run
@@ -0,0 +1,128 @@
+import json
+import statistics
+import time
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# name -> factory returning a context manager that yields run(number)
+BENCHMARKS: Dict[str, Callable[[], AbstractContextManager]] = {}
+
+BASELINE_FILE = Path(__file__).with_name("baselines.json")
+
+
+def benchmark(name: str, params: Optional[Iterable] = None):
+    """Registers a benchmark factory, once per param value if params are given.
+    The factory must return a context manager yielding run(number), which runs
+    the measured operation `number` times.
+    """
+
+    def register(factory):
+        if params is None:
+            BENCHMARKS[name] = factory
+        else:
+            for value in params:
+                BENCHMARKS[f"{name}[{value}]"] = lambda value=value: factory(value)
+        return factory
+
+    return register
+
+
+def _time(run: Callable[[int], None], number: int) -> float:
+    start = time.perf_counter()
+    run(number)
+    return time.perf_counter() - start
+
+
+def measure(
+    run: Callable[[int], None], repeat: int = 5, min_time: float = 0.05
+) -> dict:
+    """Times run() in batches large enough to last min_time and returns per-call
+    microseconds for the best and median batch.
+    """
+    run(1)  # warm up caches, connections and lazy imports
+    number = 1
+    while True:
+        elapsed = _time(run, number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    samples = [_time(run, number) / number for _ in range(repeat)]
+    return {
+        "best_us": round(min(samples) * 1e6, 3),
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "number": number,
+    }
+
+
+def reference_us() -> float:
+    """Times a fixed pure-Python workload so results can be scaled between machines."""
+
+    def workload(number: int):
+        for _ in range(number):
+            total = 0
+            for i in range(2000):
+                total += i * i
+
+    return measure(workload)["best_us"]
+
+
+def load_baselines(path: Path = BASELINE_FILE) -> dict:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def run_suite(names: Iterable[str], repeat: int = 5) -> Tuple[Dict[str, float], float]:
+    """Runs the named benchmarks; returns their best per-call times in
+    reference units, i.e. as multiples of the reference workload, and the
+    reference in microseconds. The reference is timed on both sides of the
+    suite, so a machine that slows down or speeds up meanwhile skews the
+    units less than a single reading would.
+    """
+    before = reference_us()
+    best = {}
+    for name in names:
+        with BENCHMARKS[name]() as run:
+            best[name] = measure(run, repeat=repeat)["best_us"]
+    reference = (before + reference_us()) / 2
+    return {name: value / reference for name, value in best.items()}, reference
+
+
+def save_baselines(
+    units: Dict[str, float],
+    reference: float,
+    path: Path = BASELINE_FILE,
+    **recorded: str,
+):
+    """Stores benchmarks in reference units, plus where they were recorded."""
+    payload = {
+        "reference_us": round(reference, 3),
+        "recorded": recorded,
+        "benchmarks": {name: round(value, 4) for name, value in units.items()},
+    }
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+
+def compare(
+    units: Dict[str, float], reference: float, baselines: dict, threshold: float
+) -> List[dict]:
+    """Compares results against stored baselines, both in reference units.
+    Best batches are compared, being the least disturbed by other load on the
+    machine; a benchmark regresses when it is more than `threshold` times its
+    baseline. Times are reported in microseconds on this machine.
+    """
+    rows = []
+    for name, value in units.items():
+        baseline = baselines.get("benchmarks", {}).get(name)
+        ratio = value / baseline if baseline else None
+        rows.append(
+            {
+                "name": name,
+                "best_us": round(value * reference, 3),
+                "baseline_us": round(baseline * reference, 3) if baseline else None,
+                "ratio": round(ratio, 2) if ratio else None,
+                "regressed": ratio is not None and ratio > threshold,
+            }
+        )
+    return rows
@@ -0,0 +1,119 @@
+"""
+Runs the benchmark suite and compares it against the stored baselines.
+
+    poetry run python -m benchmarks.run                    # compare, exit 1 on regression
+    poetry run python -m benchmarks.run -k lt3_signal      # only matching benchmarks
+    poetry run python -m benchmarks.run --update-baseline  # store new baselines
+
+Baselines are only stored from a full run on a clean checkout, so they always
+describe one committed tree measured against one reference workload.
+"""
+
+import argparse
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+from rich.console import Console
+from rich.table import Table
+
+import benchmarks.bench_api_client  # noqa: F401  (registers benchmarks)
+import benchmarks.bench_strategies  # noqa: F401  (registers benchmarks)
+from benchmarks.harness import (
+    BENCHMARKS,
+    compare,
+    load_baselines,
+    run_suite,
+    save_baselines,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark hot paths")
+    parser.add_argument(
+        "-k", dest="keyword", help="Only run benchmarks containing this"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=float(os.getenv("BENCH_THRESHOLD", 2.0)),
+        help="Fail when a benchmark is more than this many times its baseline",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=3,
+        help="Full runs whose median --update-baseline stores",
+    )
+    args = parser.parse_args()
+
+    recorded = {}
+    if args.update_baseline:
+        if args.keyword:
+            parser.error("--update-baseline stores the full suite, drop -k")
+        status = _git("status", "--porcelain", "--untracked-files=no")
+        if status is None or status:
+            parser.error("--update-baseline needs a clean git checkout")
+        recorded = {
+            "commit": _git("rev-parse", "--short", "HEAD"),
+            "machine": f"{platform.node()} {platform.machine()}",
+            "python": platform.python_version(),
+        }
+
+    names = [name for name in BENCHMARKS if not args.keyword or args.keyword in name]
+    if args.update_baseline:
+        # The median of several full runs, so one noisy run does not set the bar
+        runs = [run_suite(names, args.repeat) for _ in range(args.rounds)]
+        units = {
+            name: statistics.median(run_units[name] for run_units, _ in runs)
+            for name in names
+        }
+        reference = statistics.median(run_reference for _, run_reference in runs)
+        save_baselines(units, reference, **recorded)
+        print(f"Stored baselines for {len(units)} benchmarks at {recorded['commit']}")
+        return 0
+
+    baselines = load_baselines()
+    units, reference = run_suite(names, args.repeat)
+    rows = compare(units, reference, baselines, args.threshold)
+    # A regression must show again in a second run before it fails the check
+    suspects = [row["name"] for row in rows if row["regressed"]]
+    if suspects:
+        again, _ = run_suite(suspects, args.repeat)
+        for name, value in again.items():
+            units[name] = min(units[name], value)
+        rows = compare(units, reference, baselines, args.threshold)
+    table = Table(title="Benchmarks (per call)", header_style="bold cyan")
+    for column in ("Benchmark", "Best us", "Baseline us", "Ratio", "Status"):
+        table.add_column(column, justify="left" if column == "Benchmark" else "right")
+    for row in rows:
+        status = "REGRESSED" if row["regressed"] else "ok"
+        if row["baseline_us"] is None:
+            status = "new"
+        table.add_row(
+            row["name"],
+            f"{row['best_us']:,.2f}",
+            "-" if row["baseline_us"] is None else f"{row['baseline_us']:,.2f}",
+            "-" if row["ratio"] is None else f"{row['ratio']:.2f}",
+            status,
+        )
+    Console().print(table)
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+
+def _git(*args: str):
+    """Output of a git command in this checkout, or None if it cannot run."""
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    sys.exit(main())
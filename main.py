@@ -1,11 +1,14 @@
 import asyncio
 
 from trading_strategies.strategy.VaR_strategy import Var
-from trading_strategies.strategy.LT3_strategy import run_l3_strategy, limit_square_off_ticker_randomized_price
+from trading_strategies.strategy.LT3_strategy import run_l3_strategy, adaptive_square_off
 from trading_strategies.strategy.LT3_strategy_utility import parse_lt3_env_variables
 import trading_strategies.apis.rit_apis as rit
 from trading_strategies.strategy.SOR_strategy import SOR
+from trading_strategies.strategy.VWAP_strategy import VWAP
 from trading_strategies.models.custom_models import AuthConfig
+from trading_strategies.apis.session import close_all_sessions
+from trading_strategies.apis.market_data import stop_all_market_data
 
 from trading_strategies.strategy.SOR_strategy_utility import parse_SOR_env_variables
 
@@ -74,23 +77,43 @@ async def main():
     # bid, ask = await generate_single_market_depth_for_ticker(auth=get_auth_config(), ticker=ticker)
     # display_market_depth_table(ticker=ticker, bid_data=bid, ask_data=ask)
 
-    # Uncomment this to run orderbook
+    # Uncomment this to run orderbook from the shared poller, books are fetched concurrently
+    # market_data = get_market_data_service(get_auth_config())
+    # market_data.watch_books(["CRZY_A", "CRZY_M"])
+    # await market_data.start()
+    # updates = market_data.subscribe(("books",), maxsize=1)
+    # while True:
+    #     event = await updates.get()
+    #     for ticker, (bid_data, ask_data) in event.snapshot.books.items():
+    #         display_market_depth_table(ticker=ticker, bid_data=bid_data, ask_data=ask_data)
+
+    # Or poll each ticker in turn
     # while True:
     #     market_depth = 20
     #     tickers = ["CRZY_A", "CRZY_M"]
     #     tickers_market_depth = {}
     #     for ticker in tickers:
-    #         bid_data, ask_data = await generate_single_market_depth_for_ticker(
+    #         depth = await generate_single_market_depth_for_ticker(
     #             auth=get_auth_config(), ticker=ticker, market_depth=market_depth
     #         )
-    #         tickers_market_depth[ticker] = [bid_data, ask_data]
+    #         tickers_market_depth[ticker] = depth
     #         display_market_depth_table(
-    #             ticker=ticker, bid_data=bid_data, ask_data=ask_data
+    #             ticker=ticker, bid_data=depth.bids, ask_data=depth.asks
     #         )
     #     # print(tickers_market_depth)
-    #     # generate_integrated_global_orderbook(tickers_market_depth=tickers_market_depth, tickers=tickers)
-    #     generate_aggregate_orderbook(
-    #         tickers_market_depth=tickers_market_depth, tickers=tickers
+    #     # book = generate_integrated_global_orderbook(
+    #     #     tickers_market_depth=tickers_market_depth,
+    #     #     tickers=tickers,
+    #     #     market_depth=market_depth,
+    #     # )
+    #     # display_global_orderbook(book.bids, book.asks)
+    #     book = generate_aggregate_orderbook(
+    #         tickers_market_depth=tickers_market_depth,
+    #         tickers=tickers,
+    #         market_depth=market_depth,
+    #     )
+    #     display_market_depth_table(
+    #         ticker="-".join(tickers), bid_data=book.bids, ask_data=book.asks
     #     )
     #     await asyncio.sleep(0.2)
 
@@ -104,16 +127,22 @@ async def main():
     #     display_market_depth_table("CRZY", bid, ask)
     #     await asyncio.sleep(0.05)
 
-    # Uncomment this below line to run LT3 Strategy
-    await run_l3_strategy(
-        limit_square_off_ticker_randomized_price, parse_lt3_env_variables()
-    )
+    try:
+        # Uncomment this below line to run LT3 Strategy
+        await run_l3_strategy(adaptive_square_off, parse_lt3_env_variables())
+
+        # Uncomment this to be used for VaR run
+        # await Var()
 
-    # Uncomment this to be used for VaR run
-    # await Var()
+        # Uncomment this to be used for SOR run
+        # await SOR()
 
-    # Uncomment this to be used for SOR run
-    # await SOR()
+        # Uncomment this to be used for VWAP/TWAP execution run
+        # await VWAP()
+    finally:
+        # Stop shared market-data pollers, then close pooled HTTP sessions
+        await stop_all_market_data()
+        await close_all_sessions()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+from typing import Callable, Optional
+
+import httpx
+import pytest
+
+from trading_strategies.apis.session import get_session
+from trading_strategies.models.custom_models import (
+    AuthConfig,
+    SimSecurityConfig,
+    SimulatorConfig,
+)
+from trading_strategies.simulator.exchange import SimulatedExchange
+from trading_strategies.simulator.server import create_app
+
+
+# The account every test trades as; sessions are per event loop, so tests can share it
+@pytest.fixture
+def auth() -> AuthConfig:
+    return AuthConfig(
+        username="trader", password="secret", server="localhost", port=9999
+    )
+
+
+@pytest.fixture
+def simulated_exchange(auth: AuthConfig):
+    """Points the account's session at an in-process simulator.
+
+    Call it with the securities to list and, optionally, `on_request`, which
+    sees every request before the simulator does. The simulator runs no clock,
+    offers no tenders and sends no noise trades unless `config` says otherwise.
+    """
+
+    def connect(
+        *securities: SimSecurityConfig,
+        on_request: Optional[Callable[[httpx.Request], None]] = None,
+        **config,
+    ) -> SimulatedExchange:
+        config = {
+            "tick_duration": 0,
+            "tender_probability": 0,
+            "noise_trade_probability": 0,
+            "seed": 1,
+            **config,
+        }
+        exchange = SimulatedExchange(
+            SimulatorConfig(securities=list(securities), **config)
+        )
+        transport = httpx.ASGITransport(create_app(exchange))
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            on_request(request)
+            return await transport.handle_async_request(request)
+
+        get_session(auth).client._transport = (
+            transport if on_request is None else httpx.MockTransport(handler)
+        )
+        return exchange
+
+    return connect
@@ -0,0 +1,228 @@
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from trading_strategies.apis.api_utility import (
+    accept_tender,
+    cancel_all_open_order,
+    cancel_open_orders,
+    fetch_order,
+    fetch_securities,
+    is_tender_processed,
+    market_square_off_ticker,
+    post_order,
+    tender_reflected,
+)
+from trading_strategies.apis.session import close_all_sessions, get_session
+from trading_strategies.models.custom_models import AuthConfig, SimSecurityConfig
+from trading_strategies.simulator.exchange import SimulatedExchange
+
+SECURITIES = [
+    SimSecurityConfig(ticker="CRZY", start_price=10.0),
+    SimSecurityConfig(ticker="TAME", start_price=20.0),
+]
+
+
+def _log_requests(requests: list):
+    return lambda request: requests.append((request.method, request.url.path))
+
+
+class TestMarketSquareOff:
+    @pytest.mark.asyncio
+    @patch("trading_strategies.apis.api_utility.post_order", new_callable=AsyncMock)
+    async def test_only_failed_slices_are_retried(
+        self, mock_post_order, auth: AuthConfig
+    ) -> None:
+        """Children go out together; a failed and a partial child are re-sent."""
+        calls = []
+
+        async def post_order(auth, ticker, ticker_type, quantity, action):
+            calls.append(quantity)
+            if len(calls) == 2:
+                raise HTTPException(status_code=429, detail="slow down")
+            filled = 4000 if len(calls) == 3 else quantity
+            return {"quantity_filled": filled}
+
+        mock_post_order.side_effect = post_order
+        results = await market_square_off_ticker(25000, "CRZY", auth, batch_size=10000)
+
+        assert calls[:3] == [10000, 10000, 5000]
+        assert sorted(calls[3:]) == [1000, 10000]
+        assert [r["quantity_filled"] for r in results] == [10000, 10000, 5000]
+        assert all(r["action"] == "SELL" and r["error"] is None for r in results)
+
+    @pytest.mark.asyncio
+    async def test_lost_acks_are_looked_up_before_resending(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """A child the server took before the read timed out is found among
+        our orders and not sent again; one refused at connect is re-sent.
+        """
+        exchange = simulated_exchange(*SECURITIES)
+        transport = get_session(auth).client._transport
+        exchange.account(auth.username).apply_fill("CRZY", "BUY", 3000, 10.0)
+        posts = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST" and request.url.path == "/v1/orders":
+                posts.append(request.url.params["quantity"])
+                sent = len(posts)
+                if sent == 2:
+                    raise httpx.ConnectError("refused", request=request)
+                response = await transport.handle_async_request(request)
+                if sent == 1:
+                    raise httpx.ReadTimeout("timed out", request=request)
+                return response
+            return await transport.handle_async_request(request)
+
+        get_session(auth).client._transport = httpx.MockTransport(handler)
+        results = await market_square_off_ticker(3000, "CRZY", auth, batch_size=1000)
+
+        assert len(posts) == 4
+        assert [r["quantity_filled"] for r in results] == [1000, 1000, 1000]
+        assert all(r["error"] is None for r in results)
+        assert exchange.account(auth.username).positions["CRZY"] == 0
+        await close_all_sessions()
+
+
+def _rest_orders(
+    auth: AuthConfig, exchange: SimulatedExchange, ticker: str, count: int
+):
+    return [
+        exchange.place_order(
+            auth.username, ticker, "LIMIT", 100, "BUY", round(1.0 + i / 100, 2)
+        )
+        for i in range(count)
+    ]
+
+
+def _hold_tick(auth: AuthConfig):
+    """Makes the session's snapshot cache believe a tick has just started."""
+    now = time.monotonic()
+    cache = get_session(auth).snapshot_cache
+    cache.store_case({"tick": 1}, now)
+    cache.store_case({"tick": 2}, now)
+
+
+class TestPositionCache:
+    @pytest.mark.asyncio
+    async def test_fills_and_fresh_reads_skip_cached_positions(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """A fill seen on one of our orders drops the tick's cached positions,
+        and a fresh read sees a change nothing of ours caused.
+        """
+        requests = []
+        exchange = simulated_exchange(*SECURITIES, on_request=_log_requests(requests))
+        sell = await post_order(auth, "CRZY", "LIMIT", 100, "SELL", 10.01)
+        exchange._requote("CRZY")
+        _hold_tick(auth)
+        assert (await fetch_securities(auth, "CRZY"))[0]["position"] == 0
+
+        requests.clear()
+        exchange.place_order("buyer", "CRZY", "MARKET", 100, "BUY")
+        assert (await fetch_securities(auth, "CRZY"))[0]["position"] == 0
+        assert requests == []
+        assert (await fetch_order(auth, sell["order_id"]))["status"] == "TRANSACTED"
+        assert (await fetch_securities(auth, "CRZY"))[0]["position"] == -100
+
+        exchange.account(auth.username).apply_fill("CRZY", "BUY", 300, 10.0)
+        assert (await fetch_securities(auth, "CRZY"))[0]["position"] == -100
+        fresh = await fetch_securities(auth, "CRZY", fresh=True)
+        assert fresh[0]["position"] == 200
+        assert (await fetch_securities(auth, "CRZY"))[0]["position"] == 200
+        await close_all_sessions()
+
+
+class TestCancelOrders:
+    @pytest.mark.asyncio
+    async def test_cancel_all_takes_one_round_trip(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Hundreds of orders go in one bulk cancel whose confirmation is trusted."""
+        requests = []
+        exchange = simulated_exchange(*SECURITIES, on_request=_log_requests(requests))
+        _rest_orders(auth, exchange, "CRZY", 150)
+        _rest_orders(auth, exchange, "TAME", 150)
+
+        assert await cancel_all_open_order(auth) == []
+        assert requests == [("POST", "/v1/commands/cancel")]
+        assert exchange.orders_for(auth.username, "OPEN") == []
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_cancel_by_ticker_and_id_batches(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Ticker cancels leave other tickers alone; id lists go out in batches."""
+        requests = []
+        exchange = simulated_exchange(*SECURITIES, on_request=_log_requests(requests))
+        _rest_orders(auth, exchange, "CRZY", 5)
+        tame_orders = _rest_orders(auth, exchange, "TAME", 5)
+
+        assert await cancel_all_open_order(auth, "CRZY") == []
+        assert len(exchange.orders_for(auth.username, "OPEN")) == 5
+
+        requests.clear()
+        assert await cancel_open_orders(tame_orders, auth, batch_size=2) == []
+        assert requests.count(("POST", "/v1/commands/cancel")) == 3
+        assert requests.count(("GET", "/v1/orders")) == 0
+        assert exchange.orders_for(auth.username, "OPEN") == []
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_only_transient_errors_are_cancelled_again(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """An id the server rejects is done after one round; a server error
+        leaves its state unknown, so it is cancelled again.
+        """
+        requests = []
+        simulated_exchange(*SECURITIES, on_request=_log_requests(requests))
+        assert await cancel_open_orders([{"order_id": 999999}], auth) == []
+        assert requests == [
+            ("POST", "/v1/commands/cancel"),
+            ("GET", "/v1/orders/999999"),
+        ]
+
+        requests.clear()
+        with patch(
+            "trading_strategies.apis.api_utility.fetch_order", new_callable=AsyncMock
+        ) as fetch_order:
+            fetch_order.side_effect = HTTPException(status_code=503, detail="busy")
+            assert await cancel_open_orders([{"order_id": 999999}], auth) == [999999]
+        assert requests.count(("POST", "/v1/commands/cancel")) == 3
+        await close_all_sessions()
+
+
+class TestTenderProcessed:
+    def test_own_fills_do_not_hide_the_tender(self) -> None:
+        """The whole tender must show, net of our own fills meanwhile."""
+        assert tender_reflected("BUY", 1000, 0, 1000)
+        assert not tender_reflected("BUY", 1000, 0, 500)
+        assert tender_reflected("BUY", 1000, 0, 600, own_flow=-400)
+        assert tender_reflected("SELL", 1000, 200, -800)
+        assert not tender_reflected("SELL", 1000, 200, 1200)
+
+    @pytest.mark.asyncio
+    async def test_polls_until_deadline(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Confirms an accepted tender and gives up on one never processed."""
+        exchange = simulated_exchange(*SECURITIES)
+        exchange._offer_tender()
+        tender_id, tender = next(iter(exchange.tenders.items()))
+        ticker, quantity = tender["ticker"], tender["quantity"]
+        await post_order(auth, ticker, "MARKET", 100, "BUY")
+        await accept_tender(tender_id, tender["price"], auth)
+
+        assert await is_tender_processed(
+            auth, ticker, quantity, 100, tender["action"], timeout=0.5
+        )
+        assert not await is_tender_processed(
+            auth, ticker, 2 * quantity, 100, tender["action"], timeout=0.2
+        )
+        await close_all_sessions()
@@ -5,6 +5,11 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from trading_strategies.apis.custom_apis import router
+from trading_strategies.apis.metrics import (
+    REQUEST_METRICS,
+    metrics_snapshot,
+    reset_metrics,
+)
 from trading_strategies.logger_config import setup_logger
 
 # Configure logging
@@ -41,5 +46,27 @@ class TestTickEndpoint:
         mock_query_api.assert_awaited_once()
 
 
+class TestMetricsEndpoint:
+    def test_get_metrics(self, client: TestClient) -> None:
+        """Test the metrics endpoint renders Prometheus text."""
+        reset_metrics()
+        key = REQUEST_METRICS.key("post", "/v1/orders/1234")
+        REQUEST_METRICS.started(key)
+        REQUEST_METRICS.finished(key, 0.02)
+        REQUEST_METRICS.started(key)
+        REQUEST_METRICS.finished(key, 0.3, "429")
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert (
+            'rit_client_requests_total{method="POST",endpoint="/v1/orders/{id}"} 2'
+            in response.text
+        )
+        assert 'error="429"} 1' in response.text
+        snapshot = metrics_snapshot()["POST /v1/orders/{id}"]
+        assert snapshot["requests"] == 2 and snapshot["in_flight"] == 0
+        assert snapshot["latency_p50_s"] == 0.025
+
+
 if __name__ == "__main__":
     pytest.main()
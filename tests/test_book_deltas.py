@@ -0,0 +1,59 @@
+import numpy as np
+
+from trading_strategies.apis.book_deltas import BookDeltaEngine, ConsolidatedView
+from trading_strategies.models.market_depth import BookSide
+from trading_strategies.models.rit_records import OrderBookRecord
+
+
+def record(ticker: str, bids, asks) -> OrderBookRecord:
+    return OrderBookRecord(
+        ticker,
+        np.array([p for p, _ in bids], dtype=float),
+        np.array([q for _, q in bids], dtype=float),
+        np.array([p for p, _ in asks], dtype=float),
+        np.array([q for _, q in asks], dtype=float),
+    )
+
+
+class TestBookDeltaEngine:
+    def test_only_changed_levels_are_reported(self) -> None:
+        """Identical snapshots are silent; unchanged sides keep their object."""
+        engine = BookDeltaEngine()
+        deltas = []
+        engine.subscribe(deltas.append)
+        bids = [(10.0, 100), (9.9, 200), (9.8, 300)]
+        asks = [(10.1, 100)]
+
+        first = engine.apply(record("CRZY", bids, asks))
+        assert first.bids.first_level == 0 and len(first.bids.prices) == 3
+        assert engine.apply(record("CRZY", bids, asks)) is None
+
+        bids[1] = (9.9, 50)
+        delta = engine.apply(record("CRZY", bids, asks))
+        assert delta.asks is None and delta.depth.asks is first.depth.asks
+        assert delta.bids.first_level == 1
+        assert delta.bids.prices.tolist() == [9.9]
+        assert delta.bids.quantities.tolist() == [50.0]
+        np.testing.assert_allclose(delta.depth.bids.cumulative, [100, 150, 450])
+        expected = BookSide(np.array([10.0, 9.9, 9.8]), np.array([100, 50, 300]))
+        np.testing.assert_allclose(delta.depth.bids.vwap, expected.vwap)
+
+        delta = engine.apply(record("CRZY", bids[1:], asks))
+        assert delta.bids.prices.tolist() == [10.0]
+        assert delta.bids.quantities.tolist() == [0.0]
+        assert len(deltas) == 3
+
+    def test_consolidated_view_rebuilds_changed_side(self) -> None:
+        """A venue update rebuilds only the side that changed."""
+        engine = BookDeltaEngine()
+        view = ConsolidatedView(engine, ["CRZY_A", "CRZY_M"])
+        engine.apply(record("CRZY_A", [(10.0, 100)], [(10.2, 100)]))
+        engine.apply(record("CRZY_M", [(9.9, 100)], [(10.1, 100)]))
+        book = view.book
+        assert [level[4] for level in book.asks] == ["CRZY_M", "CRZY_A"]
+        assert view.book is book
+
+        engine.apply(record("CRZY_M", [(10.05, 100)], [(10.1, 100)]))
+        updated = view.book
+        assert updated.asks is book.asks
+        assert updated.bids.prices.tolist() == [10.05, 10.0]
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from trading_strategies.models.consolidated_book import (
+    consolidate,
+    group_venues,
+    split_across_venues,
+)
+from trading_strategies.models.market_depth import BookSide, MarketDepth
+from trading_strategies.strategy.strategy_utility import (
+    generate_aggregate_orderbook,
+    generate_integrated_global_orderbook,
+)
+
+
+def depth(bids, asks) -> MarketDepth:
+    return MarketDepth(
+        BookSide(np.array([p for p, _ in bids]), np.array([q for _, q in bids])),
+        BookSide(np.array([p for p, _ in asks]), np.array([q for _, q in asks])),
+    )
+
+
+BOOKS = {
+    "CRZY_A": depth([(10.0, 100), (9.9, 200)], [(10.1, 300), (10.3, 100)]),
+    "CRZY_M": depth([(10.0, 50), (9.95, 100)], [(10.2, 100)]),
+}
+
+
+class TestConsolidatedBook:
+    def test_merge_keeps_venue_attribution(self) -> None:
+        """Levels merge best first; equal prices keep venue order."""
+        book = consolidate(BOOKS)
+        assert list(book.bids) == [
+            (10.0, 100.0, 100.0, 10.0, "CRZY_A"),
+            (10.0, 50.0, 150.0, 10.0, "CRZY_M"),
+            (9.95, 100.0, 250.0, 9.98, "CRZY_M"),
+            (9.9, 200.0, 450.0, (1500 + 995 + 1980) / 450, "CRZY_A"),
+        ]
+        np.testing.assert_allclose(book.asks.prices, [10.1, 10.2, 10.3])
+        assert [level[4] for level in book.asks] == ["CRZY_A", "CRZY_M", "CRZY_A"]
+
+    def test_aggregate_sums_per_price(self) -> None:
+        """The aggregate book has one level per price with each venue's size."""
+        bids, asks = generate_aggregate_orderbook(BOOKS, ["CRZY_A", "CRZY_M"])
+        np.testing.assert_allclose(bids.prices, [10.0, 9.95, 9.9])
+        np.testing.assert_allclose(bids.quantities, [150, 100, 200])
+        np.testing.assert_allclose(
+            bids.venue_quantities, [[100, 50], [0, 100], [200, 0]]
+        )
+        assert len(asks) == 3 and asks.total_volume == 500
+        bids, _ = generate_integrated_global_orderbook(BOOKS, ["CRZY_M"])
+        assert bids.venue_names == ["CRZY_M"] and len(bids) == 2
+
+    def test_market_depth_limits_levels_per_venue(self) -> None:
+        bids, asks = generate_integrated_global_orderbook(BOOKS, list(BOOKS), 1)
+        assert [level[0] for level in bids] == [10.0, 10.0]
+        assert [level[0] for level in asks] == [10.1, 10.2]
+        bids, asks = generate_aggregate_orderbook(BOOKS, list(BOOKS), 1)
+        np.testing.assert_allclose(bids.quantities, [150])
+        assert asks.total_volume == 400
+        top = BOOKS["CRZY_A"].bids.head(1)
+        assert list(top) == [BOOKS["CRZY_A"].bids[0]]
+
+    def test_split_across_venues(self) -> None:
+        """Best levels are taken first across venues, none beyond the limit."""
+        book = consolidate(BOOKS)
+        split = split_across_venues(book.asks, 350, descending=False)
+        assert split.quantities == {"CRZY_A": 300, "CRZY_M": 50}
+        assert split.limits == {"CRZY_A": 10.1, "CRZY_M": 10.2}
+        assert split_across_venues(book.asks, 450, False).limits["CRZY_A"] == 10.3
+        assert split.vwap == pytest.approx((3030 + 510) / 350)
+        split = split_across_venues(book.bids, 400, True, limit_price=9.96)
+        assert split.quantities == {"CRZY_A": 100, "CRZY_M": 50}
+        assert split.total == 150 and split.limits == {"CRZY_A": 10.0, "CRZY_M": 10.0}
+        assert split_across_venues(book.asks, 100, False, 10.0).quantities == {}
+
+    def test_group_venues(self) -> None:
+        assert group_venues(["THOR_A", "THOR_M", "CRZY"]) == {
+            "THOR": ["THOR_A", "THOR_M"],
+            "CRZY": ["CRZY"],
+        }
@@ -0,0 +1,122 @@
+import pytest
+from fastapi import HTTPException
+
+from trading_strategies.apis.api_utility import get_position_ledger
+from trading_strategies.apis.session import close_all_sessions
+from trading_strategies.models.custom_models import AuthConfig, SimSecurityConfig
+from trading_strategies.strategy import execution_engine
+from trading_strategies.strategy.execution_engine import ExecutionEngine
+
+CRZY = SimSecurityConfig(ticker="CRZY", start_price=25.0, volatility=0)
+
+
+class TestExecutionEngine:
+    @pytest.mark.asyncio
+    async def test_replaces_stale_children_and_fills_exactly(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Fills come from child states, repriced children are cancelled first and
+        the remainder is swept at the deadline, leaving nothing resting.
+        """
+        exchange = simulated_exchange(CRZY)
+        engine = ExecutionEngine(
+            auth, "CRZY", "SELL", 1500, end_tick=10, max_child=500, interval=0
+        )
+
+        exchange.advance_tick()
+        await engine.step(exchange.tick)
+        (first,) = engine.children.values()
+        assert (first.type, first.price, first.quantity) == ("LIMIT", 25.01, 500)
+
+        # Re-quoting queues the market maker behind us, so a buyer hits our child
+        exchange.advance_tick()
+        exchange.place_order("buyer", "CRZY", "MARKET", 300, "BUY")
+        exchange.fair_values["CRZY"] = 24.5
+        exchange.advance_tick()
+        await engine.step(exchange.tick)
+        assert (engine.filled, engine.remaining) == (300, 1200)
+        assert not first.live
+        assert exchange.orders[first.order_id].status == "CANCELLED"
+        live = [child for child in engine.children.values() if child.live]
+        assert [(c.price, c.quantity) for c in live] == [(24.51, 500)]
+
+        engine.end_tick = exchange.tick
+        await engine.run()
+        assert (engine.filled, engine.remaining, engine.open_quantity) == (1500, 0, 0)
+        assert exchange.orders_for("trader") == []
+        assert get_position_ledger(auth).position("CRZY") == -1500
+        assert exchange.account("trader").positions["CRZY"] == -1500
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_resting_child_is_not_topped_up_twice(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """With no fills and an unchanged price a later step sends nothing."""
+        exchange = simulated_exchange(CRZY)
+        engine = ExecutionEngine(
+            auth, "CRZY", "SELL", 3000, end_tick=100, max_child=500, interval=0
+        )
+        exchange.advance_tick()
+        await engine.step(exchange.tick)
+        await engine.step(exchange.tick)
+        live = [child for child in engine.children.values() if child.live]
+        assert [(c.price, c.quantity) for c in live] == [(25.01, 500)]
+        assert engine.open_quantity == 500
+        assert len(exchange.orders_for("trader", status="OPEN")) == 1
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_unreadable_cancel_is_rechecked_before_sweeping(
+        self, auth: AuthConfig, monkeypatch: pytest.MonkeyPatch, simulated_exchange
+    ) -> None:
+        """A child that cannot be read back after its cancel is checked again,
+        and never swept while its state is unknown.
+        """
+        exchange = simulated_exchange(CRZY)
+        failures = {"left": 1}
+        fetch_order = execution_engine.fetch_order
+
+        async def flaky_fetch_order(auth, order_id):
+            if failures["left"]:
+                failures["left"] -= 1
+                raise HTTPException(status_code=500, detail="read timed out")
+            return await fetch_order(auth, order_id)
+
+        monkeypatch.setattr(execution_engine, "fetch_order", flaky_fetch_order)
+        engine = ExecutionEngine(
+            auth, "CRZY", "SELL", 800, end_tick=100, max_child=500, interval=0
+        )
+        exchange.advance_tick()
+        await engine.step(exchange.tick)
+        engine.end_tick = exchange.tick
+        await engine.run()
+        assert (engine.filled, engine.remaining, engine.open_quantity) == (800, 0, 0)
+        assert exchange.orders_for("trader", status="OPEN") == []
+
+        # Left unknown for good, the child is not swept over and run() returns
+        engine = ExecutionEngine(auth, "CRZY", "SELL", 800, end_tick=100)
+        await engine.step(exchange.tick)
+        failures["left"] = 100
+        engine.end_tick = exchange.tick
+        await engine.run()
+        assert (engine.filled, engine.open_quantity) == (0, 800)
+        assert exchange.account("trader").positions["CRZY"] == -800
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_crosses_the_spread_near_the_deadline(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Inside the urgency window children are priced at the opposite touch."""
+        exchange = simulated_exchange(CRZY)
+        exchange.advance_tick()
+        engine = ExecutionEngine(
+            auth, "CRZY", "BUY", 400, end_tick=exchange.tick + 2, urgency_ticks=2
+        )
+        await engine.step(exchange.tick)
+        (child,) = engine.children.values()
+        assert child.price == 25.01
+        assert (engine.filled, engine.remaining) == (400, 0)
+        assert engine.vwap == pytest.approx(25.01)
+        await close_all_sessions()
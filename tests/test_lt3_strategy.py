@@ -0,0 +1,159 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from trading_strategies.apis.api_utility import (
+    fetch_securities,
+    fetch_security_records,
+)
+from trading_strategies.apis.market_data import MarketDataService
+from trading_strategies.apis.session import close_all_sessions, get_session
+from trading_strategies.models.custom_models import (
+    AuthConfig,
+    MarketDataConfig,
+    SimSecurityConfig,
+)
+from trading_strategies.models.rit_records import TenderRecord
+from trading_strategies.strategy.LT3_strategy import (
+    _confirm_and_square_off,
+    process_tenders,
+)
+from trading_strategies.strategy.LT3_strategy_utility import (
+    TenderDecision,
+    select_tenders,
+)
+
+LT3_CONFIG = {
+    "T3_MIN_VWAP_MARGIN": 0.05,
+    "T3_NET_LIMIT": 1200,
+    "T3_GROSS_LIMIT": 5000,
+    "T3_SQUARE_OFF_BATCH_SIZE": 1000,
+    "T3_IMPACT_PER_SHARE": 0.0,
+    "T3_TENDER_CONFIRM_TIMEOUT": 1.0,
+}
+
+
+SECURITIES = [
+    SimSecurityConfig(ticker="CRZY", start_price=10.0),
+    SimSecurityConfig(ticker="ABC", start_price=10.0),
+]
+
+
+def decision(tender_id, ticker, action, quantity, edge, accept=True):
+    tender = TenderRecord(tender_id, ticker, quantity, action, 10.0)
+    return TenderDecision(tender, accept, 10.0, edge)
+
+
+def offer_tender(exchange, tender_id, ticker, action, quantity, price):
+    exchange.tenders[tender_id] = {
+        "tender_id": tender_id,
+        "period": exchange.period,
+        "tick": exchange.tick,
+        "expires": exchange.tick + 30,
+        "caption": "",
+        "quantity": quantity,
+        "action": action,
+        "is_fixed_bid": True,
+        "price": price,
+        "ticker": ticker,
+    }
+    return TenderRecord(tender_id, ticker, quantity, action, price)
+
+
+class TestSelectTenders:
+    def test_ranks_by_edge_within_limits(self) -> None:
+        """A tender over a limit is skipped and smaller ones still fit."""
+        decisions = [
+            decision(1, "CRZY", "BUY", 500, 100.0),
+            decision(2, "CRZY", "BUY", 1000, 900.0),
+            decision(3, "ABC", "BUY", 200, 50.0),
+            decision(4, "ABC", "BUY", 100, 999.0, accept=False),
+        ]
+        chosen = select_tenders(decisions, {"CRZY": 0, "ABC": 0}, 1200, 5000)
+        assert [d.tender.tender_id for d in chosen] == [2, 3]
+
+    def test_offsetting_tender_frees_net_limit(self) -> None:
+        """Net and gross include the current positions and each pick."""
+        decisions = [
+            decision(1, "CRZY", "SELL", 1000, 10.0),
+            decision(2, "ABC", "BUY", 1000, 5.0),
+        ]
+        chosen = select_tenders(decisions, {"CRZY": 1000}, 1000, 2000)
+        assert [d.tender.tender_id for d in chosen] == [1, 2]
+        assert select_tenders(decisions[1:], {"CRZY": 1000}, 1000, 2000) == []
+
+
+class TestProcessTenders:
+    @pytest.mark.asyncio
+    async def test_accepts_best_set_concurrently(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Every tender is valued in one pass and the best fitting set accepted."""
+        requests = []
+        exchange = simulated_exchange(
+            *SECURITIES,
+            on_request=lambda request: requests.append(
+                (request.method, request.url.path)
+            ),
+        )
+        tenders = [
+            offer_tender(exchange, 1, "CRZY", "BUY", 500, 5.0),
+            offer_tender(exchange, 2, "CRZY", "BUY", 1000, 5.0),
+            offer_tender(exchange, 3, "ABC", "BUY", 200, 5.0),
+        ]
+        square_off = AsyncMock()
+
+        accepted = await process_tenders(auth, tenders, square_off, LT3_CONFIG)
+
+        assert sorted(accepted) == [2, 3]
+        book_requests = [r for r in requests if r[1] == "/v1/securities/book"]
+        assert len(book_requests) == 2  # one per ticker, not per tender
+        positions = {s.ticker: s.position for s in await fetch_security_records(auth)}
+        assert positions == {"CRZY": 1000, "ABC": 200}
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_confirms_tender_booked_within_the_tick(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Positions cached before the tender was booked do not delay its
+        confirmation, with or without the securities stream.
+        """
+        exchange = simulated_exchange(*SECURITIES)
+        tender = offer_tender(exchange, 1, "CRZY", "BUY", 500, 5.0)
+        now = time.monotonic()
+        cache = get_session(auth).snapshot_cache
+        cache.store_case({"tick": 1}, now)
+        cache.store_case({"tick": 2}, now)
+        await fetch_securities(auth, "CRZY")  # the pre-tender position, cached
+        account = exchange.account(auth.username)
+        square_off = AsyncMock()
+
+        # Booked shortly after the accept, while fallback polls are under way
+        asyncio.get_running_loop().call_later(
+            0.15, account.apply_fill, "CRZY", "BUY", 500, 5.0
+        )
+        await _confirm_and_square_off(auth, None, tender, 0, square_off, LT3_CONFIG)
+        square_off.assert_awaited_once_with(auth, "CRZY", "SELL", 5.0, 500, 1000)
+
+        # The stream polled before the booking and will not poll again for 10s
+        config = MarketDataConfig(
+            case_interval=0,
+            securities_interval=10,
+            tenders_interval=0,
+            books_interval=0,
+            news_interval=0,
+        )
+        service = MarketDataService(auth, config)
+        await service.start()
+        await asyncio.sleep(0.05)
+        account.apply_fill("CRZY", "BUY", 500, 5.0)
+        square_off.reset_mock()
+        await _confirm_and_square_off(
+            auth, service, tender, 500, square_off, LT3_CONFIG
+        )
+        square_off.assert_awaited_once()
+        await service.stop()
+        await close_all_sessions()
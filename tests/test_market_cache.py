@@ -0,0 +1,50 @@
+import time
+
+from trading_strategies.apis.market_cache import MarketSnapshotCache
+
+
+class TestMarketSnapshotCache:
+    def test_case_is_cached_only_after_a_tick_change_is_seen(self) -> None:
+        """Without a seen tick change the start of the tick is unknown."""
+        cache = MarketSnapshotCache(tick_duration=1.0)
+        now = time.monotonic()
+        cache.store_case({"tick": 10}, now)
+        assert cache.get_case() is None
+        cache.store_case({"tick": 11}, now)
+        assert cache.get_case() == {"tick": 11}
+
+    def test_case_expires_when_the_tick_can_have_moved(self) -> None:
+        cache = MarketSnapshotCache(tick_duration=1.0)
+        now = time.monotonic()
+        cache.store_case({"tick": 10}, now - 0.9)
+        cache.store_case({"tick": 11}, now - 0.1)
+        # Tick 11 started after now - 0.9, so it may end from now + 0.1 on
+        assert cache.get_case() == {"tick": 11}
+        cache.store_case({"tick": 11}, now - 1.0)
+        cache._case_expires_at = now - 0.01
+        assert cache.get_case() is None
+
+    def test_securities_are_served_for_the_same_tick(self) -> None:
+        cache = MarketSnapshotCache(tick_duration=1.0)
+        now = time.monotonic()
+        cache.store_case({"tick": 1}, now)
+        cache.store_case({"tick": 2}, now)
+        securities = [
+            {"ticker": "CRZY", "position": 100},
+            {"ticker": "TAME", "position": 0},
+        ]
+        cache.store_securities(securities, generation=cache.generation)
+        assert cache.get_securities() is securities
+        assert cache.get_securities("TAME") == [{"ticker": "TAME", "position": 0}]
+
+    def test_own_orders_invalidate_securities(self) -> None:
+        cache = MarketSnapshotCache(tick_duration=1.0)
+        now = time.monotonic()
+        cache.store_case({"tick": 1}, now)
+        cache.store_case({"tick": 2}, now)
+        generation = cache.generation
+        cache.invalidate_securities()
+        # Response to a request sent before the invalidation is not stored
+        cache.store_securities([{"ticker": "CRZY", "position": 0}], None, generation)
+        assert cache.get_securities() is None
+        assert cache.get_case() == {"tick": 2}
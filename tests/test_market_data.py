@@ -0,0 +1,143 @@
+import asyncio
+import time
+
+import pytest
+
+from trading_strategies.apis.market_data import (
+    MarketDataService,
+    get_market_data_service,
+    stop_all_market_data,
+)
+from trading_strategies.apis.session import close_all_sessions, get_session
+from trading_strategies.models.custom_models import (
+    AuthConfig,
+    MarketDataConfig,
+    SimSecurityConfig,
+)
+
+CRZY = SimSecurityConfig(ticker="CRZY", start_price=10.0)
+
+
+def hold_tick(auth: AuthConfig):
+    """Makes the session's snapshot cache believe a tick has just started."""
+    now = time.monotonic()
+    cache = get_session(auth).snapshot_cache
+    cache.store_case({"tick": 1}, now)
+    cache.store_case({"tick": 2}, now)
+
+
+class TestMarketDataService:
+    @pytest.mark.asyncio
+    async def test_fans_out_changes_to_subscribers(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """One poll feeds every subscriber; unchanged payloads are not resent."""
+        requests = []
+        exchange = simulated_exchange(
+            CRZY, on_request=lambda request: requests.append(request.url.path)
+        )
+        service = MarketDataService(auth, MarketDataConfig())
+        service.watch_books(["CRZY"])
+        first = service.subscribe(("case", "books"))
+        second = service.subscribe(("case",))
+
+        await service.poll_case()
+        await service.poll_books()
+        await service.poll_case()  # same tick, nothing published
+        assert [first.get_nowait().stream for _ in range(2)] == ["case", "books"]
+        event = second.get_nowait()
+        assert second.empty() and event.snapshot.tick == exchange.tick
+        with pytest.raises(TypeError):
+            event.snapshot.case["tick"] = 99  # snapshots are read-only
+
+        exchange.advance_tick()
+        await service.poll_securities()
+        await service.poll_securities()
+        assert service.snapshot.security("CRZY").position == 0
+        assert requests.count("/v1/securities") == 2
+        assert first.empty()  # not subscribed to securities
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_polls_positions_within_a_tick(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """The securities stream sees position changes without waiting for
+        the tick to end, and refills the tick cache as it goes.
+        """
+        requests = []
+        exchange = simulated_exchange(
+            CRZY, on_request=lambda request: requests.append(request.url.path)
+        )
+        service = MarketDataService(auth, MarketDataConfig())
+        hold_tick(auth)
+        await service.poll_securities()
+        exchange.place_order(auth.username, "CRZY", "MARKET", 500, "BUY")
+        await service.poll_securities()
+        assert service.snapshot.security("CRZY").position == 500
+        assert requests.count("/v1/securities") == 2
+        cache = get_session(auth).snapshot_cache
+        assert cache.get_securities("CRZY")[0]["position"] == 500
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_keeps_latest(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """A full queue drops its oldest event rather than blocking pollers."""
+        simulated_exchange(CRZY)
+        service = MarketDataService(auth, MarketDataConfig())
+        queue = service.subscribe(maxsize=1)
+        service._publish("case", case={"tick": 1})
+        service._publish("case", case={"tick": 2})
+        assert (await service.next_event(queue)).snapshot.case["tick"] == 2
+        assert await service.next_event(queue, timeout=0.01) is None
+        with pytest.raises(ValueError):
+            service.subscribe(("orders",))
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_shared_service_runs_pollers(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Strategies on one account share the service and its polling tasks."""
+        simulated_exchange(CRZY)
+        service = get_market_data_service(auth)
+        assert get_market_data_service(auth) is service
+        service.config = MarketDataConfig(case_interval=0.01)
+        queue = service.subscribe(("case",))
+        await service.start()
+        event = await asyncio.wait_for(queue.get(), 1)
+        assert event.snapshot.status == "ACTIVE"
+        await stop_all_market_data()
+        assert not service.running
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_wait_for_position(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Position waits resolve on their own poll, the securities stream or
+        the deadline.
+        """
+        exchange = simulated_exchange(CRZY)
+        service = MarketDataService(auth, MarketDataConfig())
+        hold_tick(auth)
+        await service.poll_securities()
+        exchange.place_order(auth.username, "CRZY", "MARKET", 500, "BUY")
+        # Already there: the wait's own poll sees it within the tick
+        assert await service.wait_for_position("CRZY", lambda p: p >= 500, 1) == 500
+
+        waiter = asyncio.create_task(
+            service.wait_for_position("CRZY", lambda position: position >= 800, 1)
+        )
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        exchange.place_order(auth.username, "CRZY", "MARKET", 300, "BUY")
+        await service.poll_securities()
+        assert await waiter == 800
+        assert (
+            await service.wait_for_position("CRZY", lambda p: p < 0, timeout=0.01)
+            is None
+        )
+        await close_all_sessions()
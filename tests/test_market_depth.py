@@ -0,0 +1,86 @@
+import math
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from trading_strategies.models.custom_models import AuthConfig
+from trading_strategies.models.market_depth import BookSide, MarketDepth, walk_books
+from trading_strategies.models.rit_records import OrderBookRecord
+from trading_strategies.strategy.LT3_strategy_utility import generate_lt3_signal
+from trading_strategies.strategy.strategy_utility import format_vwap
+
+
+class TestBookSide:
+    def test_cumulative_columns(self) -> None:
+        """Cumulative volume and running VWAP come from cumulative sums."""
+        side = BookSide(np.array([10.0, 9.9, 9.8]), np.array([100, 300, 0]))
+        np.testing.assert_allclose(side.cumulative, [100, 400, 400])
+        np.testing.assert_allclose(side.vwap, [10.0, (1000 + 2970) / 400, 9.925])
+        assert side[1] == (9.9, 300.0, 400.0, 9.925)
+        assert list(side)[0] == (10.0, 100.0, 100.0, 10.0)
+        assert side.total_volume == 400
+
+    def test_vwap_to_fill(self) -> None:
+        """Fills take part of the last level; beyond visible depth is NaN."""
+        side = BookSide(np.array([10.0, 9.9, 9.8]), np.array([100, 300, 100]))
+        assert side.vwap_to_fill(100) == 10.0
+        assert side.vwap_to_fill(200) == pytest.approx((1000 + 990) / 200)
+        assert math.isnan(side.vwap_to_fill(501))
+        np.testing.assert_allclose(
+            side.vwap_to_fill(np.array([50, 400, 1000])), [10.0, 9.925, np.nan]
+        )
+        assert math.isnan(BookSide.empty().vwap_to_fill(10))
+        assert format_vwap(BookSide.empty().vwap_to_fill(10)) == "#DIV/0!"
+
+    def test_walk_books(self) -> None:
+        """Walks several sides at once and extrapolates past visible depth."""
+        side = BookSide(np.array([10.0, 9.9, 9.8]), np.array([100, 300, 100]))
+        thin = BookSide(np.array([10.1]), np.array([50]))
+        vwaps = walk_books(
+            [side, side, thin, BookSide.empty()],
+            np.array([200, 500, 100, 10]),
+            np.array([0.0, 0.0, 0.001, 0.001]),
+        )
+        np.testing.assert_allclose(
+            vwaps[:3], [side.vwap_to_fill(200), side.vwap_to_fill(500), 10.1125]
+        )
+        assert math.isnan(vwaps[3])
+        # Without impact the excess is priced at the last visible level
+        assert walk_books([side], np.array([600]))[0] == pytest.approx(
+            (side.notional[-1] + 100 * 9.8) / 600
+        )
+
+
+class TestLT3Signal:
+    @pytest.mark.asyncio
+    @patch(
+        "trading_strategies.strategy.strategy_utility.fetch_order_book_record",
+        new_callable=AsyncMock,
+    )
+    async def test_signal_uses_unwind_vwap(self, mock_fetch, auth: AuthConfig) -> None:
+        """A BUY tender is accepted when selling it into the bids beats its price."""
+        mock_fetch.return_value = OrderBookRecord(
+            "CRZY",
+            np.array([10.0, 9.0]),
+            np.array([100.0, 100.0]),
+            np.array([10.1]),
+            np.array([50.0]),
+        )
+        assert await generate_lt3_signal(auth, "CRZY", 9.4, "BUY", 200, 0.05) == (
+            True,
+            9.5,
+        )
+        assert await generate_lt3_signal(auth, "CRZY", 9.65, "BUY", 150, 0.05) == (
+            False,
+            pytest.approx(29 / 3),
+        )
+        # Asks too thin for 100 shares: the rest is extrapolated with impact
+        assert await generate_lt3_signal(
+            auth, "CRZY", 10.3, "SELL", 100, 0.05, impact_per_share=0.001
+        ) == (True, pytest.approx(10.1125))
+        assert await generate_lt3_signal(
+            auth, "CRZY", 10.3, "SELL", 100, 0.05, impact_per_share=0.02
+        ) == (False, pytest.approx(10.35))
+        depth = MarketDepth.from_record(mock_fetch.return_value, 1)
+        assert len(depth.bids) == 1 and len(depth.asks) == 1
@@ -0,0 +1,55 @@
+import pytest
+
+from trading_strategies.apis.news_feed import NewsFeed
+from trading_strategies.apis.session import close_all_sessions
+from trading_strategies.models.custom_models import AuthConfig, SimSecurityConfig
+from trading_strategies.strategy.Var_utility import (
+    AnalystExpectations,
+    parse_analyst_expectation,
+)
+
+
+def expectation_body(tick: int, us: float) -> str:
+    return f"By tick {tick} analysts expect: US = ${us:.2f}, BRIC = $49.00, BOND 95.25"
+
+
+class TestNewsFeed:
+    @pytest.mark.asyncio
+    async def test_polls_after_cursor_and_parses_once(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Only news after the last id is fetched, parsed and dispatched."""
+        cursors, parsed = [], []
+        exchange = simulated_exchange(
+            SimSecurityConfig(ticker="US", start_price=100.0),
+            on_request=lambda request: cursors.append(request.url.params.get("after")),
+        )
+
+        def parser(news: dict):
+            parsed.append(news["news_id"])
+            return parse_analyst_expectation(news)
+
+        feed = NewsFeed(auth, parser=parser)
+        expectations = AnalystExpectations()
+        feed.subscribe(expectations.on_news)
+
+        exchange.publish_news("Welcome", "Case started")
+        exchange.publish_news("Analysts", expectation_body(60, 101.5))
+        assert len(await feed.poll()) == 2
+        assert await feed.poll() == []
+        exchange.publish_news("Analysts", expectation_body(120, 98.0))
+        assert [n["news_id"] for n in await feed.poll()] == [3]
+
+        assert cursors == [None, "2", "2"]
+        assert parsed == [1, 2, 3]
+        assert expectations.version == 2 and len(expectations) == 2
+        assert expectations.latest == {
+            "tick": 120,
+            "US": 98.0,
+            "BRIC": 49.0,
+            "BOND": 95.25,
+        }
+        assert expectations.for_tick(30)["US"] == 101.5
+        assert expectations.for_tick(61)["US"] == 98.0
+        assert expectations.for_tick(121) is None
+        await close_all_sessions()
@@ -0,0 +1,93 @@
+import pytest
+
+from trading_strategies.apis.api_utility import (
+    cancel_all_open_order,
+    get_order_store,
+    get_position_ledger,
+    post_order,
+    refresh_open_orders,
+)
+from trading_strategies.apis.order_store import OrderStore
+from trading_strategies.apis.session import close_all_sessions
+from trading_strategies.models.custom_models import AuthConfig, SimSecurityConfig
+
+
+def order(order_id, status="OPEN", filled=0, ticker="CRZY", action="BUY"):
+    return {
+        "order_id": order_id,
+        "ticker": ticker,
+        "type": "LIMIT",
+        "quantity": 100,
+        "action": action,
+        "price": 10.0,
+        "quantity_filled": filled,
+        "status": status,
+    }
+
+
+class TestOrderStore:
+    def test_late_responses_do_not_reopen_orders(self) -> None:
+        """A settled order stays settled and fills never go backwards."""
+        store = OrderStore()
+        store.record(order(1, filled=40))
+        store.record(order(1, "TRANSACTED", 100))
+        assert store.record(order(1, filled=40)).status == "TRANSACTED"
+        store.record(order(2, filled=60))
+        assert store.record(order(2, filled=20)).quantity_filled == 60
+        assert [o.order_id for o in store.live()] == [2]
+        assert store.cancelled([1, 2, 3]) == 1
+        assert store.live() == [] and store.get(2).status == "CANCELLED"
+
+    def test_queries_by_ticker_side_and_status(self) -> None:
+        store = OrderStore()
+        store.record(order(1))
+        store.record(order(2, action="SELL"))
+        store.record(order(3, ticker="TAME"))
+        store.record(order(4, "TRANSACTED", 100))
+        assert [o.order_id for o in store.live("CRZY")] == [1, 2]
+        assert [o.order_id for o in store.query(action="BUY")] == [1, 3, 4]
+        assert [o.order_id for o in store.query("CRZY", "BUY", "OPEN")] == [1]
+        assert [o.order_id for o in store.query(status="TRANSACTED")] == [4]
+
+
+class TestOwnOrderTracking:
+    @pytest.mark.asyncio
+    async def test_polls_and_cancels_only_our_live_orders(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Fills are found by polling live orders by id, and a cancel-all is one
+        command; /v1/orders is never listed.
+        """
+        requests = []
+        exchange = simulated_exchange(
+            SimSecurityConfig(ticker="CRZY", start_price=10.0, volatility=0),
+            SimSecurityConfig(ticker="TAME", start_price=20.0, volatility=0),
+            on_request=lambda request: requests.append(
+                (request.method, request.url.path)
+            ),
+        )
+        sell = await post_order(auth, "CRZY", "LIMIT", 100, "SELL", 10.01)
+        bid = await post_order(auth, "CRZY", "LIMIT", 100, "BUY", 9.0)
+        tame = await post_order(auth, "TAME", "LIMIT", 100, "BUY", 19.0)
+        # Re-quoting queues the market maker behind our offer, a buyer lifts it
+        exchange.advance_tick()
+        exchange.place_order("buyer", "CRZY", "MARKET", 100, "BUY")
+
+        requests.clear()
+        live = await refresh_open_orders(auth, "CRZY")
+        assert [o.order_id for o in live] == [bid["order_id"]]
+        assert sorted(requests) == sorted(
+            ("GET", f"/v1/orders/{o['order_id']}") for o in (sell, bid)
+        )
+        store = get_order_store(auth)
+        assert store.get(sell["order_id"]).status == "TRANSACTED"
+        assert get_position_ledger(auth).position("CRZY") == -100
+
+        requests.clear()
+        assert await cancel_all_open_order(auth, "CRZY") == []
+        assert requests == [("POST", "/v1/commands/cancel")]
+        assert store.get(bid["order_id"]).status == "CANCELLED"
+        assert [o.order_id for o in store.live()] == [tame["order_id"]]
+        open_ids = [o["order_id"] for o in exchange.orders_for(auth.username)]
+        assert open_ids == [tame["order_id"]]
+        await close_all_sessions()
@@ -0,0 +1,130 @@
+import time
+
+import pytest
+
+from trading_strategies.apis.api_utility import (
+    accept_tender,
+    fetch_order,
+    fetch_security_records,
+    get_position_ledger,
+    post_order,
+    sync_positions,
+)
+from trading_strategies.apis.position_ledger import PositionLedger
+from trading_strategies.apis.session import close_all_sessions
+from trading_strategies.models.custom_models import AuthConfig, SimSecurityConfig
+from trading_strategies.models.rit_records import TenderRecord
+
+
+def order(order_id, filled, vwap, action="BUY", ticker="CRZY"):
+    return {
+        "order_id": order_id,
+        "ticker": ticker,
+        "action": action,
+        "quantity_filled": filled,
+        "vwap": vwap,
+    }
+
+
+class TestPositionLedger:
+    def test_applies_only_new_fills(self) -> None:
+        """Repeated status polls of one order apply each fill once."""
+        ledger = PositionLedger()
+        changes = []
+        ledger.subscribe(lambda ticker, position: changes.append((ticker, position)))
+        assert ledger.on_order(order(1, 100, 10.0)) == 100
+        assert ledger.on_order(order(1, 100, 10.0)) == 0
+        assert ledger.on_order(order(1, 300, 10.5)) == 200
+        assert ledger.position("CRZY") == 300
+        assert ledger.cash == pytest.approx(-3150.0)
+        ledger.on_order(order(2, 500, 11.0, action="SELL", ticker="ABC"))
+        assert (ledger.net, ledger.gross) == (-200, 800)
+        assert ledger.with_trade("ABC", 500) == (300, 300)
+        assert changes == [("CRZY", 100), ("CRZY", 300), ("ABC", -500)]
+
+    def test_reconcile_skips_responses_older_than_local_updates(self) -> None:
+        """A snapshot requested before our last fill cannot undo it."""
+        ledger = PositionLedger()
+        requested_at = time.monotonic()
+        ledger.on_tender(TenderRecord(1, "CRZY", 1000, "SELL", 10.0))
+        assert not ledger.reconcile([{"ticker": "CRZY", "position": 0}], requested_at)
+        assert ledger.position("CRZY") == -1000
+
+        securities = [
+            {"ticker": "CRZY", "position": -900},
+            {"ticker": "CAD", "type": "CURRENCY", "position": 5.0},
+        ]
+        assert ledger.reconcile(securities, time.monotonic())
+        assert (ledger.position("CRZY"), ledger.cash) == (-900, 5.0)
+        assert (ledger.net, ledger.gross) == (-900, 900)
+
+    def test_reconciled_fills_are_not_applied_again(self) -> None:
+        """Fills a reconcile includes, of orders seen or not, count once."""
+        ledger = PositionLedger()
+        ledger.on_order(order(1, 0, None))
+        ledger.on_order(order(1, 100, 10.0))
+        securities = [{"ticker": "CRZY", "position": 500}]
+        assert ledger.reconcile(securities, time.monotonic(), [order(1, 500, 10.0)])
+        assert ledger.on_order(order(1, 500, 10.0)) == 0
+        assert ledger.on_order(order(1, 600, 10.0)) == 100
+        assert (ledger.position("CRZY"), ledger.net) == (600, 600)
+
+        # Left over from an earlier run and first found by a listing
+        assert ledger.on_order(order(2, 300, 10.0), known_only=True) == 0
+        assert ledger.on_order(order(2, 400, 10.0), known_only=True) == 100
+        assert ledger.position("CRZY") == 700
+
+
+class TestLedgerIntegration:
+    @pytest.mark.asyncio
+    async def test_tracks_orders_and_tenders(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Order acks and accepted tenders keep the ledger in step with the server."""
+        exchange = simulated_exchange(
+            SimSecurityConfig(ticker="CRZY", start_price=10.0)
+        )
+        ledger = get_position_ledger(auth)
+
+        await post_order(auth, "CRZY", "MARKET", 300, "BUY")
+        await post_order(auth, "CRZY", "MARKET", 100, "SELL", dry_run=1)
+        assert ledger.position("CRZY") == 300
+
+        exchange._offer_tender()
+        tender_id, offer = next(iter(exchange.tenders.items()))
+        tender = TenderRecord(
+            tender_id,
+            offer["ticker"],
+            offer["quantity"],
+            offer["action"],
+            offer["price"],
+        )
+        await accept_tender(tender_id, tender.price, auth, tender=tender)
+
+        securities = await fetch_security_records(auth, "CRZY")
+        assert ledger.position("CRZY") == securities[0].position
+        await sync_positions(auth)
+        assert ledger.position("CRZY") == securities[0].position
+        assert ledger.reconciled_at is not None
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_sync_then_poll_counts_a_fill_once(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """A resting order filled by someone else shows in a sync; polling the
+        order afterwards does not add the fill again.
+        """
+        exchange = simulated_exchange(
+            SimSecurityConfig(ticker="CRZY", start_price=10.0, volatility=0)
+        )
+        ledger = get_position_ledger(auth)
+        sell = await post_order(auth, "CRZY", "LIMIT", 100, "SELL", 10.01)
+        exchange._requote("CRZY")
+        exchange.place_order("buyer", "CRZY", "MARKET", 100, "BUY")
+
+        await sync_positions(auth)
+        assert ledger.position("CRZY") == -100
+        assert (await fetch_order(auth, sell["order_id"]))["status"] == "TRANSACTED"
+        assert (ledger.position("CRZY"), ledger.net) == (-100, -100)
+        await close_all_sessions()
@@ -0,0 +1,46 @@
+import asyncio
+
+import httpx
+import pytest
+
+from trading_strategies.apis.rate_limiter import (
+    MARKET_DATA_PRIORITY,
+    ORDER_PRIORITY,
+    TokenBucketScheduler,
+)
+from trading_strategies.apis.session import close_all_sessions, get_session
+from trading_strategies.models.custom_models import AuthConfig
+
+
+class TestTokenBucketScheduler:
+    @pytest.mark.asyncio
+    async def test_orders_are_released_before_market_data(self) -> None:
+        """Once the bucket is empty, queued order requests go out first."""
+        scheduler = TokenBucketScheduler(rate=100, burst=1)
+        await scheduler.acquire(MARKET_DATA_PRIORITY)  # drain the bucket
+        released = []
+
+        async def request(name: str, priority: int):
+            await scheduler.acquire(priority)
+            released.append(name)
+
+        await asyncio.gather(
+            request("case", MARKET_DATA_PRIORITY),
+            request("securities", MARKET_DATA_PRIORITY),
+            request("order", ORDER_PRIORITY),
+        )
+        assert released == ["order", "case", "securities"]
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_request_is_retried(self, auth: AuthConfig) -> None:
+        """A 429 with a wait hint is retried transparently by the session."""
+        responses = [
+            httpx.Response(429, json={"code": "TOO_MANY_REQUESTS", "wait": 0.01}),
+            httpx.Response(200, json={"success": True}),
+        ]
+        session = get_session(auth)
+        session.client._transport = httpx.MockTransport(lambda _: responses.pop(0))
+        response = await session.request("post", "/v1/orders")
+        assert response.status_code == 200
+        assert responses == []
+        await close_all_sessions()
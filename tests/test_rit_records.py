@@ -0,0 +1,46 @@
+import numpy as np
+
+from trading_strategies.models.rit_records import (
+    OrderBookRecord,
+    SecurityRecord,
+    decode_tenders,
+)
+
+
+class TestRitRecords:
+    def test_security_record_supports_attribute_and_key_access(self) -> None:
+        record = SecurityRecord.from_json(
+            {"ticker": "CRZY", "position": 500, "last": 10.5, "unused": "x"}
+        )
+        assert record.position == 500
+        assert record["last"] == 10.5
+        assert not hasattr(record, "__dict__")
+
+    def test_order_book_record_is_sorted_and_uses_resting_quantity(self) -> None:
+        book = OrderBookRecord.from_json(
+            {
+                "bids": [
+                    {"price": 9.9, "quantity": 100, "quantity_filled": 0},
+                    {"price": 10.0, "quantity": 300, "quantity_filled": 100},
+                ],
+                "asks": [{"price": 10.1, "quantity": 50, "quantity_filled": 0}],
+            },
+            "CRZY",
+        )
+        np.testing.assert_array_equal(book.bid_prices, [10.0, 9.9])
+        np.testing.assert_array_equal(book.bid_quantities, [200, 100])
+        np.testing.assert_array_equal(book.ask_quantities, [50])
+
+    def test_decode_tenders(self) -> None:
+        (tender,) = decode_tenders(
+            [
+                {
+                    "tender_id": 7,
+                    "ticker": "CRZY",
+                    "quantity": 10000,
+                    "action": "BUY",
+                    "price": 10.25,
+                }
+            ]
+        )
+        assert (tender.tender_id, tender.price, tender["action"]) == (7, 10.25, "BUY")
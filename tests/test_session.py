@@ -0,0 +1,64 @@
+import asyncio
+
+import httpx
+import pytest
+
+from trading_strategies.apis.api_utility import query_api
+from trading_strategies.apis.session import close_all_sessions, get_session
+from trading_strategies.models.custom_models import AuthConfig
+
+
+class TestSession:
+    @pytest.mark.asyncio
+    async def test_session_is_reused_per_account(self, auth: AuthConfig) -> None:
+        """The same account on the same loop shares one pooled client."""
+        other = AuthConfig(
+            username="other", password="x", server="localhost", port=9999
+        )
+        assert get_session(auth) is get_session(auth)
+        assert get_session(auth) is not get_session(other)
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_query_api_goes_through_pooled_client(self, auth: AuthConfig) -> None:
+        """query_api sends auth headers from the session and decodes JSON."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json={"tick": 5})
+
+        session = get_session(auth)
+        session.client._transport = httpx.MockTransport(handler)
+        assert await query_api("get", "/v1/case", auth) == {"tick": 5}
+        assert await query_api("get", "/v1/case", auth) == {"tick": 5}
+        assert len(seen) == 2
+        assert seen[0].headers["authorization"].startswith("Basic ")
+        assert get_session(auth) is session
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_gets_are_coalesced(
+        self, auth: AuthConfig
+    ) -> None:
+        """Concurrent GETs with the same params share one upstream request."""
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.url.params.get("ticker"))
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=[{"ticker": "CRZY", "position": 0}])
+
+        session = get_session(auth)
+        session.client._transport = httpx.MockTransport(handler)
+        results = await asyncio.gather(
+            *(
+                query_api("get", "/v1/securities", auth, {"ticker": "CRZY"})
+                for _ in range(5)
+            ),
+            query_api("get", "/v1/securities", auth, {"ticker": "TAME"}),
+        )
+        assert sorted(seen) == ["CRZY", "TAME"]
+        assert all(result is results[0] for result in results[:5])
+        assert session.inflight_gets == {}
+        await close_all_sessions()
@@ -0,0 +1,90 @@
+import base64
+
+from fastapi.testclient import TestClient
+
+from trading_strategies.models.custom_models import SimSecurityConfig, SimulatorConfig
+from trading_strategies.simulator.exchange import SimulatedExchange
+from trading_strategies.simulator.matching_engine import MatchingEngine, SimOrder
+from trading_strategies.simulator.server import create_app
+
+HEADERS = {"authorization": "Basic " + base64.b64encode(b"trader1:pw").decode()}
+
+
+def make_exchange(**overrides) -> SimulatedExchange:
+    config = SimulatorConfig(
+        securities=[SimSecurityConfig(ticker="CRZY", start_price=10.0)],
+        tick_duration=0,
+        tender_probability=0,
+        noise_trade_probability=0,
+        seed=1,
+        **overrides,
+    )
+    return SimulatedExchange(config)
+
+
+class TestMatchingEngine:
+    def test_price_time_priority(self) -> None:
+        engine = MatchingEngine("CRZY")
+        engine.submit(SimOrder(1, "a", "CRZY", "LIMIT", 100, "SELL", 10.02))
+        engine.submit(SimOrder(2, "b", "CRZY", "LIMIT", 100, "SELL", 10.01))
+        engine.submit(SimOrder(3, "c", "CRZY", "LIMIT", 100, "SELL", 10.01))
+        trades = engine.submit(SimOrder(4, "d", "CRZY", "MARKET", 250, "BUY"))
+        assert [(t.resting.order_id, t.price, t.quantity) for t in trades] == [
+            (2, 10.01, 100),
+            (3, 10.01, 100),
+            (1, 10.02, 50),
+        ]
+        assert engine.best_ask() == 10.02
+        assert engine.size_at("SELL", 10.02) == 50
+
+    def test_limit_order_rests_and_cancels(self) -> None:
+        engine = MatchingEngine("CRZY")
+        order = SimOrder(1, "a", "CRZY", "LIMIT", 100, "BUY", 9.99)
+        assert engine.submit(order) == []
+        assert engine.book()["bids"][0]["order_id"] == 1
+        assert engine.cancel(1) is order and order.status == "CANCELLED"
+        assert engine.best_bid() is None
+
+
+class TestSimulatorServer:
+    def test_market_order_updates_position(self) -> None:
+        client = TestClient(create_app(make_exchange()))
+        assert client.get("/v1/case").json()["status"] == "ACTIVE"
+        order = client.post(
+            "/v1/orders",
+            params={
+                "ticker": "CRZY",
+                "type": "MARKET",
+                "quantity": 1000,
+                "action": "BUY",
+            },
+            headers=HEADERS,
+        ).json()
+        assert order["status"] == "TRANSACTED" and order["quantity_filled"] == 1000
+        (security,) = client.get("/v1/securities", headers=HEADERS).json()
+        assert security["position"] == 1000
+        assert client.get("/v1/securities/tas", params={"ticker": "CRZY"}).json()
+
+    def test_bulk_cancel_and_unknown_ticker(self) -> None:
+        exchange = make_exchange()
+        client = TestClient(create_app(exchange))
+        params = {"ticker": "CRZY", "type": "LIMIT", "quantity": 100, "action": "BUY"}
+        for price in (5.0, 5.01):
+            client.post(
+                "/v1/orders", params={**params, "price": price}, headers=HEADERS
+            )
+        response = client.post(
+            "/v1/commands/cancel", params={"all": 1}, headers=HEADERS
+        )
+        assert len(response.json()["cancelled_order_ids"]) == 2
+        assert client.get("/v1/orders", headers=HEADERS).json() == []
+        response = client.get("/v1/securities/book", params={"ticker": "NOPE"})
+        assert response.status_code == 400
+        assert response.json()["code"] == "INVALID_TICKER"
+
+    def test_rate_limit_answers_429_with_wait(self) -> None:
+        client = TestClient(create_app(make_exchange(rate_limit=1)))
+        assert client.get("/v1/case", headers=HEADERS).status_code == 200
+        response = client.get("/v1/case", headers=HEADERS)
+        assert response.status_code == 429
+        assert response.json()["wait"] > 0
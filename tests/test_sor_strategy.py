@@ -0,0 +1,143 @@
+import asyncio
+from typing import List
+
+import httpx
+import pytest
+
+from trading_strategies.apis.api_utility import fetch_security_records, post_order
+from trading_strategies.apis.market_data import MarketDataService
+from trading_strategies.apis.session import close_all_sessions
+from trading_strategies.apis.time_and_sales import TimeAndSalesStreamer
+from trading_strategies.models.custom_models import (
+    AuthConfig,
+    MarketDataConfig,
+    SimSecurityConfig,
+)
+from trading_strategies.models.rit_records import TenderRecord
+from trading_strategies.strategy.SOR_strategy import (
+    SORState,
+    net_position,
+    smart_order_routing,
+)
+
+SOR_CONFIG = {
+    "SOR_TRADE_UNTIL_TICK": 0,  # past the deadline, so routing never waits on price
+    "SOR_SLIPPAGE_MARGIN": 0.1,
+    "SOR_MIN_VWAP_MARGIN": 0.1,
+}
+
+
+def venues(level_size: int = 5000) -> List[SimSecurityConfig]:
+    return [
+        SimSecurityConfig(ticker="THOR_A", start_price=10.0, level_size=level_size),
+        SimSecurityConfig(ticker="THOR_M", start_price=10.0, level_size=level_size),
+    ]
+
+
+class TestSmartOrderRouting:
+    @pytest.mark.asyncio
+    async def test_routes_position_flat_on_the_same_loop(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Routing runs as a task beside its producers and flattens the position."""
+        simulated_exchange(*venues())
+        market_data = MarketDataService(auth, MarketDataConfig())
+        state = SORState(SOR_CONFIG, TimeAndSalesStreamer(auth, []))
+        await post_order(auth, "THOR_A", "MARKET", 2500, "BUY")
+        await state.accepted.put(TenderRecord(1, "THOR_A", 2500, "BUY", 10.0))
+
+        router = asyncio.create_task(smart_order_routing(auth, state, market_data))
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if state.securities and all(s.position == 0 for s in state.securities):
+                break
+        router.cancel()
+        await asyncio.gather(router, return_exceptions=True)
+
+        securities = await fetch_security_records(auth)
+        assert sum(s.position for s in securities) == 0
+        assert state.accepted.empty()
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_splits_across_venues_within_the_limit(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Nothing is routed below the tender price plus slippage; once that is
+        met, one decision sells into the bids of both venues.
+        """
+        exchange = simulated_exchange(*venues(500))
+        market_data = MarketDataService(auth, MarketDataConfig())
+        state = SORState(
+            {**SOR_CONFIG, "SOR_TRADE_UNTIL_TICK": 100}, TimeAndSalesStreamer(auth, [])
+        )
+        state.last_tender_price = 11.0
+        await post_order(auth, "THOR_A", "MARKET", 3000, "BUY")
+
+        router = asyncio.create_task(smart_order_routing(auth, state, market_data))
+        await asyncio.sleep(0.05)
+        assert exchange.account("trader").positions["THOR_A"] == 3000
+        state.last_tender_price = 9.0
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if state.securities and net_position(state.securities) == 0:
+                break
+        router.cancel()
+        await asyncio.gather(router, return_exceptions=True)
+
+        sells = [
+            o for o in exchange.orders_for("trader", None) if o["action"] == "SELL"
+        ]
+        assert {o["ticker"] for o in sells} == {"THOR_A", "THOR_M"}
+        assert all(o["quantity"] <= 1000 for o in sells)
+        assert sum(exchange.account("trader").positions.values()) == 0
+        await close_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_children_never_fill_past_the_limit(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """Bids that drop between the split and the children arriving leave
+        them unfilled and cancelled rather than sold below the limit.
+        """
+        routing = False
+
+        def drop_bids(request: httpx.Request):
+            nonlocal routing
+            if (
+                routing
+                and request.method == "POST"
+                and request.url.path == "/v1/orders"
+            ):
+                routing = False
+                for ticker in ("THOR_A", "THOR_M"):
+                    exchange.fair_values[ticker] = 8.0
+                    exchange._requote(ticker)
+
+        exchange = simulated_exchange(*venues(500), on_request=drop_bids)
+        market_data = MarketDataService(auth, MarketDataConfig())
+        state = SORState(
+            {**SOR_CONFIG, "SOR_TRADE_UNTIL_TICK": 100}, TimeAndSalesStreamer(auth, [])
+        )
+        state.last_tender_price = 9.0
+        await post_order(auth, "THOR_A", "MARKET", 3000, "BUY")
+        routing = True
+
+        def sells():
+            orders = exchange.orders_for("trader", None)
+            return [o for o in orders if o["action"] == "SELL"]
+
+        router = asyncio.create_task(smart_order_routing(auth, state, market_data))
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if sells() and not exchange.orders_for("trader"):
+                break
+        router.cancel()
+        await asyncio.gather(router, return_exceptions=True)
+
+        sells = sells()
+        assert sells and all(o["type"] == "LIMIT" and o["price"] > 9.1 for o in sells)
+        assert all(o["status"] == "CANCELLED" for o in sells)
+        assert exchange.orders_for("trader") == []
+        assert exchange.account("trader").positions["THOR_A"] == 3000
+        await close_all_sessions()
@@ -0,0 +1,66 @@
+import math
+
+import httpx
+import numpy as np
+import pytest
+
+from trading_strategies.apis.session import close_all_sessions, get_session
+from trading_strategies.apis.time_and_sales import (
+    TimeAndSalesBuffer,
+    TimeAndSalesStreamer,
+)
+from trading_strategies.models.custom_models import AuthConfig
+
+
+class TestTimeAndSalesBuffer:
+    def test_rolling_window_and_session_totals(self) -> None:
+        """Prints older than window_ticks leave the window but not the session."""
+        buffer = TimeAndSalesBuffer(capacity=8, window_ticks=2)
+        assert math.isnan(buffer.vwap)
+        buffer.append(10.0, 100, 1)
+        buffer.append(11.0, 300, 2)
+        buffer.append(12.0, 100, 3)  # tick 1 leaves the window
+        assert buffer.vwap == pytest.approx((1000 + 3300 + 1200) / 500)
+        assert buffer.window_vwap == pytest.approx((3300 + 1200) / 400)
+        assert buffer.window_prints == 2 and buffer.trade_rate == 1.0
+        assert buffer.volume_rate == 200.0
+
+    def test_ring_overwrites_oldest_prints(self) -> None:
+        """Memory stays at capacity; overwritten prints leave the window too."""
+        buffer = TimeAndSalesBuffer(capacity=3, window_ticks=100)
+        for tick in range(1, 6):
+            buffer.append(float(tick), 10, tick)
+        assert len(buffer) == 3
+        np.testing.assert_array_equal(buffer.recent()[:, 0], [3.0, 4.0, 5.0])
+        assert buffer.window_volume == 30 and buffer.window_vwap == 4.0
+        assert buffer.total_volume == 50 and buffer.vwap == 3.0
+
+
+class TestTimeAndSalesStreamer:
+    @pytest.mark.asyncio
+    async def test_pulls_only_new_prints(self, auth: AuthConfig) -> None:
+        """Each poll sends the last seen id; a new period restarts the buffer."""
+        prints = [
+            {"id": 1, "period": 1, "tick": 1, "price": 10.0, "quantity": 100},
+            {"id": 2, "period": 1, "tick": 2, "price": 12.0, "quantity": 100},
+        ]
+        cursors = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            after = request.url.params.get("after")
+            cursors.append(after)
+            new = [p for p in prints if after is None or p["id"] > int(after)]
+            return httpx.Response(200, json=new[::-1])
+
+        get_session(auth).client._transport = httpx.MockTransport(handler)
+        streamer = TimeAndSalesStreamer(auth, ["CRZY"])
+        assert await streamer.poll() == 2
+        assert streamer.global_vwap() == 11.0
+        assert await streamer.poll() == 0
+        prints.append({"id": 3, "period": 2, "tick": 1, "price": 9.0, "quantity": 50})
+        assert await streamer.poll() == 1
+
+        assert cursors == [None, "2", "2"]
+        assert streamer.global_vwap() == 9.0
+        assert streamer.global_volume() == 50
+        await close_all_sessions()
@@ -0,0 +1,74 @@
+import asyncio
+import math
+
+import numpy as np
+import pytest
+
+from trading_strategies.apis.session import close_all_sessions
+from trading_strategies.models.custom_models import AuthConfig, SimSecurityConfig
+from trading_strategies.strategy.VWAP_strategy import (
+    execute_schedule,
+    fetch_volume_profile,
+)
+from trading_strategies.strategy.VWAP_strategy_utility import (
+    bucket_edges,
+    schedule,
+    volume_profile,
+)
+
+
+class TestVolumeProfile:
+    def test_follows_reference_volume(self) -> None:
+        """Quiet observed ticks weigh nothing, unobserved ticks the average."""
+        bars = [{"tick": tick} for tick in range(1, 5)]
+        prints = np.array([[10.0, 300, 1], [10.0, 100, 2], [10.0, 200, 2]])
+        profile = volume_profile(bars, prints, bucket_edges(1, 7, 3))
+        # Ticks 1-6 expect 300, 300, 0, 0, 150, 150 shares
+        np.testing.assert_allclose(profile, [600 / 900, 0, 300 / 900])
+        np.testing.assert_allclose(
+            volume_profile([], np.empty((0, 3)), bucket_edges(1, 7, 3)), [1 / 3] * 3
+        )
+
+    def test_buckets_match_the_schedule_edges(self) -> None:
+        """Uneven buckets weigh the ticks execution will trade in them."""
+        edges = bucket_edges(0, 10, 3)
+        assert list(edges) == [0, 3, 7, 10]
+        bars = [{"tick": tick} for tick in range(10)]
+        prints = np.array([[10.0, 100, tick] for tick in range(10)])
+        np.testing.assert_allclose(volume_profile(bars, prints, edges), [0.3, 0.4, 0.3])
+
+    def test_schedule_adds_up_exactly(self) -> None:
+        sizes = schedule(1000, np.array([1 / 3] * 3))
+        assert sizes.sum() == 1000 and sorted(sizes) == [333, 333, 334]
+
+
+class TestExecuteSchedule:
+    @pytest.mark.asyncio
+    async def test_fills_schedule_and_reports_benchmark(
+        self, auth: AuthConfig, simulated_exchange
+    ) -> None:
+        """A live case is worked bucket by bucket to the exact quantity."""
+        exchange = simulated_exchange(
+            SimSecurityConfig(ticker="CRZY", start_price=25.0),
+            tick_duration=0.02,
+            noise_trade_probability=1,
+        )
+        for _ in range(5):
+            exchange.advance_tick()
+        edges = bucket_edges(6, 12, 3)
+        profile = await fetch_volume_profile(auth, "CRZY", edges)
+        assert profile.sum() == pytest.approx(1.0)
+
+        clock = asyncio.create_task(exchange.run())
+        try:
+            report = await execute_schedule(
+                auth, "CRZY", "BUY", 3000, edges, profile, interval=0.005
+            )
+        finally:
+            clock.cancel()
+        assert (report.quantity, report.filled) == (3000, 3000)
+        assert not math.isnan(report.vwap) and not math.isnan(report.benchmark_vwap)
+        assert report.market_volume >= 3000
+        assert exchange.orders_for("trader") == []
+        assert exchange.account("trader").positions["CRZY"] == 3000
+        await close_all_sessions()
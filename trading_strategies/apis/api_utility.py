@@ -1,18 +1,41 @@
 import asyncio
-import base64
 import os
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, List, Optional
 
 import httpx
 from dotenv import load_dotenv
 from fastapi import HTTPException
 
+from trading_strategies.apis.order_store import OrderStore
+from trading_strategies.apis.position_ledger import PositionLedger
+from trading_strategies.apis.session import get_session
 from trading_strategies.logger_config import setup_logger
 from trading_strategies.models.custom_models import AuthConfig
+from trading_strategies.models.rit_records import (
+    OrderBookRecord,
+    OrderRecord,
+    SecurityRecord,
+    TenderRecord,
+    decode_orders,
+    decode_securities,
+    decode_tenders,
+)
+
+try:
+    import orjson as json_decoder  # Optional, decodes several times faster
+except ImportError:
+    import json as json_decoder
 
 # Configure logging
 logger = setup_logger(__name__)
 
+SUPPORTED_METHODS = ("get", "post", "delete", "put")
+# Child orders in flight at once when flattening positions
+SQUARE_OFF_CONCURRENCY = int(os.getenv("SQUARE_OFF_CONCURRENCY", 8))
+# Order ids per bulk cancel command, keeps the query string short
+CANCEL_BATCH_SIZE = int(os.getenv("CANCEL_BATCH_SIZE", 100))
+
 
 def get_auth_config() -> AuthConfig:
     """Reads authentication config from environment and validates credentials."""
@@ -39,107 +62,428 @@ def get_auth_config() -> AuthConfig:
     )
 
 
+def _request_key(endpoint: str, params: Optional[Dict[str, Any]]):
+    """Identifies a GET request by endpoint and params, independent of param order."""
+    return endpoint, tuple(sorted((params or {}).items()))
+
+
+def _consume_exception(task: asyncio.Future):
+    """Marks a shared request's exception as retrieved if every waiter has gone."""
+    if not task.cancelled():
+        task.exception()
+
+
 async def query_api(
     method: str,
     endpoint: str,
     auth: AuthConfig,
     params: Optional[Dict[str, Any]] = None,
 ) -> Any:
-    """Generic function to query the trading API with different HTTP methods."""
-    url = f"http://{auth.server}:{auth.port}{endpoint}"
-    auth_str = f"{auth.username}:{auth.password}"
-    encoded_auth = base64.b64encode(auth_str.encode()).decode()
-    headers = {"accept": "application/json", "authorization": f"Basic {encoded_auth}"}
-
-    async with httpx.AsyncClient() as client:
+    """Generic function to query the trading API with different HTTP methods.
+    Requests go through the pooled keep-alive session of the given account.
+    Identical GETs already in flight are coalesced: later callers await the
+    same upstream response instead of sending another request. The decoded
+    JSON is shared between those callers, so it must be treated as read-only.
+    """
+    if method.lower() != "get":
         try:
-            if method.lower() == "get":
-                response = await client.get(url, headers=headers, params=params)
-            elif method.lower() == "post":
-                response = await client.post(url, headers=headers, params=params)
-            elif method.lower() == "delete":
-                response = await client.delete(url, headers=headers, params=params)
-            elif method.lower() == "put":
-                response = await client.put(url, headers=headers, params=params)
-            else:
-                raise ValueError("Unsupported HTTP method.")
-
-            response.raise_for_status()  # Raises an HTTPError for bad responses (4xx or 5xx)
-            return response.json()
-        except httpx.RequestError as e:
-            logger.error(f"Request error: {str(e)}")  # Log the request error
-            raise HTTPException(
-                status_code=500, detail=f"Error querying {endpoint}: {str(e)}"
+            return await _send_request(method, endpoint, auth, params)
+        finally:
+            invalidate_positions(auth)
+
+    inflight = get_session(auth).inflight_gets
+    key = _request_key(endpoint, params)
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_send_request(method, endpoint, auth, params))
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+        task.add_done_callback(_consume_exception)
+    # Shield so one cancelled caller does not cancel the request for the others
+    return await asyncio.shield(task)
+
+
+def invalidate_positions(auth: AuthConfig):
+    """Our own orders, cancels, tender actions and fills may have changed
+    positions and order states: drop cached securities and stop later callers
+    joining securities or orders GETs sent before now.
+    """
+    session = get_session(auth)
+    session.snapshot_cache.invalidate_securities()
+    stale = ("/v1/securities", "/v1/orders")
+    for key in [key for key in session.inflight_gets if key[0] in stale]:
+        del session.inflight_gets[key]
+
+
+async def _send_request(
+    method: str,
+    endpoint: str,
+    auth: AuthConfig,
+    params: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """Sends one request upstream and maps transport/HTTP errors to HTTPException."""
+    try:
+        if method.lower() not in SUPPORTED_METHODS:
+            raise ValueError("Unsupported HTTP method.")
+        response = await get_session(auth).request(method, endpoint, params=params)
+        response.raise_for_status()  # Raises an HTTPError for bad responses (4xx or 5xx)
+        return json_decoder.loads(response.content)
+    except httpx.RequestError as e:
+        logger.error(f"Request error: {str(e)}")  # Log the request error
+        raise HTTPException(
+            status_code=500, detail=f"Error querying {endpoint}: {str(e)}"
+        ) from e
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error: {str(e)}")  # Log the HTTP error
+        raise HTTPException(
+            status_code=e.response.status_code,
+            detail=f"Error querying {endpoint}: {str(e)}",
+        ) from e
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _square_off_slices(
+    position: int, ticker: str, batch_size: int
+) -> List[Dict[str, Any]]:
+    """Splits a position into MARKET child orders of at most batch_size."""
+    action = "SELL" if position > 0 else "BUY"
+    position = int(abs(position))
+    slices = []
+    while position > 0:
+        quantity = min(batch_size, position)
+        slices.append({"ticker": ticker, "action": action, "quantity": quantity})
+        position -= quantity
+    return slices
+
+
+async def dispatch_market_children(
+    auth: AuthConfig,
+    slices: List[Dict[str, Any]],
+    max_concurrency: int = SQUARE_OFF_CONCURRENCY,
+    max_rounds: int = 5,
+) -> List[Dict[str, Any]]:
+    """Sends MARKET child orders concurrently, at most max_concurrency at a time.
+    Each child's result is tracked; only failed or partially filled slices are
+    sent again, for up to max_rounds rounds. A child whose send failed in a way
+    that does not prove it was refused, e.g. a read timeout, is first looked
+    for among our settled orders and only sent again if it is not there.
+    Returns one result per original slice with the quantity filled and the
+    last error, if any.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results = [
+        {**child, "quantity_filled": 0, "attempts": 0, "error": None, "unsure": 0}
+        for child in slices
+    ]
+
+    async def send(result: Dict[str, Any]):
+        quantity = result["quantity"] - result["quantity_filled"]
+        async with semaphore:
+            result["attempts"] += 1
+            try:
+                response = await post_order(
+                    auth, result["ticker"], "MARKET", quantity, result["action"]
+                )
+                result["quantity_filled"] += response.get("quantity_filled", quantity)
+                result["error"] = None
+            except Exception as e:
+                result["error"] = str(e)
+                result["unsure"] = 0 if _not_placed(e) else quantity
+                logger.error(
+                    f"Error occurred when market_square_off {result['action']} {result['ticker']} {quantity}: {e}"
+                )
+
+    pending = results
+    for round_number in range(max_rounds):
+        await asyncio.gather(*(send(result) for result in pending))
+        unsure = [r for r in results if r["unsure"]]
+        if unsure:
+            await _find_unacked_children(auth, unsure)
+        # Children still unaccounted for are looked for again, not re-sent
+        pending = [
+            r
+            for r in results
+            if r["quantity_filled"] < r["quantity"] and not r["unsure"]
+        ]
+        if not pending and not any(r["unsure"] for r in results):
+            break
+        logger.info(
+            f"Retrying {len(pending)} unfilled child orders, round {round_number + 2}"
+        )
+        await asyncio.sleep(0.1)
+    for result in results:
+        if result["quantity_filled"] < result["quantity"]:
+            logger.error(
+                f"Child order {result['action']} {result['ticker']} left {result['quantity'] - result['quantity_filled']} unfilled: {result['error']}"
             )
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error: {str(e)}")  # Log the HTTP error
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"Error querying {endpoint}: {str(e)}",
+    return results
+
+
+def _not_placed(error: BaseException) -> bool:
+    """Errors that prove an order was never placed: the connection could not
+    be made, or the server answered 4xx, 429 included. Anything else, e.g. a
+    read timeout or a 5xx, may hide an order the server accepted.
+    """
+    refused = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+    if isinstance(error, HTTPException):
+        return 400 <= error.status_code < 500 or isinstance(error.__cause__, refused)
+    return isinstance(error, refused)
+
+
+async def _find_unacked_children(auth: AuthConfig, results: List[Dict[str, Any]]):
+    """Looks for MARKET orders whose sends failed ambiguously among our
+    settled orders. An order of the same ticker, side and quantity that the
+    order store has never seen was accepted without an ack: it is recorded
+    and its fill credited. A result with no such order is cleared to be sent
+    again; if the listing fails, results stay unsure for the next round.
+    """
+    store = get_order_store(auth)
+    try:
+        listings = await asyncio.gather(
+            *(
+                query_api("get", "/v1/orders", auth, params={"status": status})
+                for status in ("TRANSACTED", "CANCELLED")
             )
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
+        )
+    except Exception as e:
+        logger.error(f"Unable to look for unacknowledged MARKET orders: {e}")
+        return
+    unacked = [
+        order
+        for listing in listings
+        for order in listing
+        if order["type"] == "MARKET" and store.get(order["order_id"]) is None
+    ]
+    for result in results:
+        for order in unacked:
+            if (order["ticker"], order["action"], order["quantity"]) == (
+                result["ticker"],
+                result["action"],
+                result["unsure"],
+            ):
+                unacked.remove(order)
+                get_position_ledger(auth).on_order(order)
+                store.record(order)
+                result["quantity_filled"] += order["quantity_filled"]
+                result["error"] = None
+                break
+        result["unsure"] = 0
+
+
+async def dispatch_ioc_children(
+    auth: AuthConfig,
+    slices: List[Dict[str, Any]],
+    max_concurrency: int = SQUARE_OFF_CONCURRENCY,
+) -> List[Dict[str, Any]]:
+    """Sends LIMIT child orders concurrently, each at its slice's "price", and
+    cancels what did not trade straight away, like immediate-or-cancel orders:
+    if the book moved since the slices were priced, nothing trades beyond
+    them and nothing is left resting. Returns one result per slice with the
+    quantity filled and the error, if any.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results = [{**child, "quantity_filled": 0, "error": None} for child in slices]
+
+    async def send(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                order = await post_order(
+                    auth,
+                    result["ticker"],
+                    "LIMIT",
+                    result["quantity"],
+                    result["action"],
+                    result["price"],
+                )
+            except Exception as e:
+                result["error"] = str(e)
+                logger.error(
+                    f"Error occurred when sending {result['action']} {result['ticker']} {result['quantity']} at {result['price']}: {e}"
+                )
+                return None
+        result["quantity_filled"] = order.get("quantity_filled", 0)
+        return order
+
+    orders = await asyncio.gather(*(send(result) for result in results))
+    resting = [
+        (result, order)
+        for result, order in zip(results, orders)
+        if order is not None and order.get("status") == "OPEN"
+    ]
+    if resting:
+        await cancel_open_orders([order for _, order in resting], auth)
+        final = await asyncio.gather(
+            *(fetch_order(auth, order["order_id"]) for _, order in resting),
+            return_exceptions=True,
+        )
+        for (result, _), order in zip(resting, final):
+            if isinstance(order, Exception):
+                result["error"] = str(order)
+            else:
+                result["quantity_filled"] = order.get("quantity_filled", 0)
+    return results
 
 
 async def market_square_off_ticker(
-    position: int, ticker: str, auth: AuthConfig, batch_size: Optional[int] = 10000
+    position: int,
+    ticker: str,
+    auth: AuthConfig,
+    batch_size: Optional[int] = 10000,
+    max_concurrency: int = SQUARE_OFF_CONCURRENCY,
 ):
-    """Squares off a given position for a specific ticker in batches."""
-    action = "SELL" if position > 0 else "BUY"
-    position = abs(position)
-    endpoint = "/v1/orders"
-    params = {
-        "ticker": ticker,
-        "type": "MARKET",
-        "action": action,
-    }
-    while position != 0:
-        quantity = batch_size if position > batch_size else position
-        params["quantity"] = quantity
+    """Squares off a given position for a specific ticker in batches.
+    The batches are sent concurrently, see dispatch_market_children.
+    """
+    return await dispatch_market_children(
+        auth, _square_off_slices(position, ticker, batch_size), max_concurrency
+    )
+
+
+async def bulk_cancel(
+    auth: AuthConfig,
+    all: Optional[int] = None,
+    ticker: Optional[str] = None,
+    ids: Optional[str] = None,
+):
+    """Cancels open orders with one /v1/commands/cancel command, either all of
+    them, those for a ticker, or a comma separated list of order ids.
+    """
+    params = {}
+    if all is not None:
+        params["all"] = all
+    elif ticker is not None:
+        params["ticker"] = ticker
+    elif ids is not None:
+        params["ids"] = ids
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail="One of 'all', 'ticker', or 'ids' must be specified.",
+        )
+    return await query_api("post", "/v1/commands/cancel", auth, params=params)
+
+
+async def fetch_open_orders(auth: AuthConfig, ticker: Optional[str] = None):
+    """Fetches our OPEN orders, optionally only those for one ticker.
+    Fetch errors are logged and retried.
+    """
+    while True:
         try:
-            await query_api("post", endpoint, auth, params=params)
-            position -= quantity
-            await asyncio.sleep(0.1)
+            params = {"status": "OPEN"}
+            open_orders = await query_api("get", "/v1/orders", auth, params=params)
+            _record_orders(auth, open_orders)
+            break
         except Exception as e:
-            logger.error(
-                f"Error occurred when market_square_off {action} {ticker} {quantity}, current:{position} {e}"
-            )
+            logger.error(f"An error occurred while fetching OPEN orders: {e}")
             await asyncio.sleep(0.1)
-    return
+    if ticker is None:
+        return open_orders
+    return [order for order in open_orders if order["ticker"] == ticker]
 
 
-async def cancel_open_orders(open_orders: list, auth: AuthConfig):
-    """Cancels all open orders provided in the list."""
-    while open_orders:
-        for i, order in enumerate(open_orders):
-            try:
-                # Attempt to cancel the order
-                endpoint = f"/v1/orders/{order['order_id']}"
-                await query_api("delete", endpoint, auth)
-                await asyncio.sleep(0.1)
-                logger.info(
-                    f"Cancelled {i} {order['order_id']} of {len(open_orders)} orders"
-                )
-            except Exception as e:
+async def cancel_open_orders(
+    open_orders: list,
+    auth: AuthConfig,
+    batch_size: int = CANCEL_BATCH_SIZE,
+    max_rounds: int = 3,
+) -> List[int]:
+    """Cancels all open orders provided in the list.
+    Ids are sent in bulk cancel commands of at most batch_size ids. Ids the
+    commands confirm are done; only the others are checked by id, and those
+    still OPEN are sent again. Returns the ids still open after max_rounds
+    rounds.
+    """
+    store = get_order_store(auth)
+    ids = [order["order_id"] for order in open_orders]
+    for _ in range(max_rounds):
+        if not ids:
+            break
+        batches = [ids[i : i + batch_size] for i in range(0, len(ids), batch_size)]
+        results = await asyncio.gather(
+            *(
+                bulk_cancel(auth, ids=",".join(str(id) for id in batch))
+                for batch in batches
+            ),
+            return_exceptions=True,
+        )
+        confirmed = set()
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
                 logger.error(
-                    f"An error occurred while cancelling the order {i} {order['order_id']} of {len(open_orders)} orders: {e}"
+                    f"An error occurred while cancelling {len(batch)} orders: {result}"
                 )
-        while True:
-            try:
-                await asyncio.sleep(0.1)
-                params = {"status": "OPEN"}
-                endpoint = "/v1/orders"
-                open_orders = await query_api("get", endpoint, auth, params=params)
-                break
-            except Exception as e:
-                logger.error(f"An error occurred while fetching OPEN orders: {e}")
-    return
+            else:
+                confirmed.update(result.get("cancelled_order_ids", ()))
+        store.cancelled(confirmed)
+        ids = await _still_open(auth, [id for id in ids if id not in confirmed])
+        logger.info(f"Cancelled orders, {len(ids)} still open")
+    if ids:
+        logger.error(f"Orders {ids} still open after {max_rounds} cancel rounds")
+    return ids
+
+
+def _is_transient(error: BaseException) -> bool:
+    """Transport failures, server errors and rate limiting may clear on a retry;
+    anything else, e.g. a 404 for an order id, is a definite answer.
+    """
+    if isinstance(error, HTTPException):
+        return error.status_code >= 500 or error.status_code == 429
+    return isinstance(error, (httpx.HTTPError, asyncio.TimeoutError))
+
+
+async def _still_open(auth: AuthConfig, ids: List[int]) -> List[int]:
+    """Checks orders by id; returns those OPEN or whose state is unknown after
+    a transient error. Orders that are settled or not found are done.
+    """
+    orders = await asyncio.gather(
+        *(fetch_order(auth, id) for id in ids), return_exceptions=True
+    )
+    return [
+        id
+        for id, order in zip(ids, orders)
+        if (
+            _is_transient(order)
+            if isinstance(order, Exception)
+            else order.get("status") == "OPEN"
+        )
+    ]
+
+
+async def refresh_open_orders(
+    auth: AuthConfig, ticker: Optional[str] = None, action: Optional[str] = None
+) -> List[OrderRecord]:
+    """Brings our OPEN orders in the order store up to date with one
+    /v1/orders/{id} poll each, feeding fills to the position ledger; returns
+    those still OPEN.
+    """
+    store = get_order_store(auth)
+    live = store.live(ticker, action)
+    results = await asyncio.gather(
+        *(fetch_order(auth, order.order_id) for order in live),
+        return_exceptions=True,
+    )
+    for order, result in zip(live, results):
+        if isinstance(result, Exception):
+            logger.error(f"Unable to refresh order {order.order_id}: {result}")
+    return store.live(ticker, action)
+
+
+async def fetch_case(auth: AuthConfig):
+    """Fetches the case status, served from the tick-scoped cache when current."""
+    cache = get_session(auth).snapshot_cache
+    case_data = cache.get_case()
+    if case_data is None:
+        requested_at = time.monotonic()
+        case_data = await query_api("get", "/v1/case", auth)
+        cache.store_case(case_data, requested_at)
+    return case_data
 
 
 async def fetch_current_tick(auth: AuthConfig):
     """Fetches the current tick by querying the case API."""
     try:
-        case_data = await query_api("get", "/v1/case", auth)
+        case_data = await fetch_case(auth)
         return case_data.get("tick")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch tick: {str(e)}")
@@ -148,7 +492,7 @@ async def fetch_current_tick(auth: AuthConfig):
 async def fetch_current_period(auth: AuthConfig):
     """Fetches the current tick by querying the case API."""
     try:
-        case_data = await query_api("get", "/v1/case", auth)
+        case_data = await fetch_case(auth)
         return case_data.get("period")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch tick: {str(e)}")
@@ -164,42 +508,167 @@ async def fetch_active_tenders(auth: AuthConfig):
         )
 
 
-async def cancel_all_open_order(auth: AuthConfig):
-    """Fetches the OPEN orders and cancels them till all are cancelled.
-    If exception happens, it logs it and keeps on trying.
+async def fetch_news(
+    auth: AuthConfig, after: Optional[int] = None, limit: Optional[int] = None
+):
+    """Fetches news items, newest first, optionally only those after a news_id."""
+    params = {}
+    if after is not None:
+        params["after"] = after
+    if limit is not None:
+        params["limit"] = limit
+    return await query_api("get", "/v1/news", auth, params=params)
+
+
+async def fetch_security_history(
+    auth: AuthConfig,
+    ticker: str,
+    period: Optional[int] = None,
+    limit: Optional[int] = None,
+):
+    """Fetches the OHLC bars of a security, newest first, one per tick."""
+    params = {"ticker": ticker}
+    if period is not None:
+        params["period"] = period
+    if limit is not None:
+        params["limit"] = limit
+    return await query_api("get", "/v1/securities/history", auth, params=params)
+
+
+async def fetch_time_and_sales(
+    auth: AuthConfig,
+    ticker: str,
+    after: Optional[int] = None,
+    period: Optional[int] = None,
+    limit: Optional[int] = 20,
+):
+    """Fetches time & sales prints for a ticker, newest first, optionally only
+    those after a print id.
     """
-    # TODO @Mayuresh If error happens do to rate limiting then try again
-    open_orders = await query_api("get", "/v1/orders", auth, params={"status": "OPEN"})
-    return await cancel_open_orders(open_orders, auth)
+    params = {"ticker": ticker}
+    if after is not None:
+        params["after"] = after
+    if period is not None:
+        params["period"] = period
+    params["limit"] = limit
+    return await query_api("get", "/v1/securities/tas", auth, params=params)
+
+
+async def cancel_all_open_order(auth: AuthConfig, ticker: Optional[str] = None):
+    """Cancels every OPEN order, or those for one ticker, with a single bulk
+    cancel command. Orders the command confirms are done; only our other
+    orders still OPEN in the order store are checked by id and re-cancelled,
+    so nothing is listed unless the command itself fails.
+    Rate limiting (HTTP 429) is retried by the session scheduler.
+    """
+    try:
+        if ticker is None:
+            response = await bulk_cancel(auth, all=1)
+        else:
+            response = await bulk_cancel(auth, ticker=ticker)
+    except Exception as e:
+        logger.error(f"An error occurred during bulk cancel: {e}")
+        return await cancel_open_orders(await fetch_open_orders(auth, ticker), auth)
+    store = get_order_store(auth)
+    store.cancelled(response.get("cancelled_order_ids", ()))
+    leftovers = store.live(ticker)
+    if leftovers:
+        leftovers = await refresh_open_orders(auth, ticker)
+    return await cancel_open_orders(leftovers, auth)
 
 
-async def market_square_off_all_tickers(auth: AuthConfig, batch_size: int = 10000):
+async def market_square_off_all_tickers(
+    auth: AuthConfig,
+    batch_size: int = 10000,
+    max_concurrency: int = SQUARE_OFF_CONCURRENCY,
+):
     """Fetches the list of securities and then squares them off at the MARKET."""
-    endpoint = "/v1/securities"
-    securities_data = await query_api("get", endpoint, auth)
+    securities_data = await fetch_securities(auth)
+    slices = []
     for security in securities_data:
-        await market_square_off_ticker(
-            security["position"], security["ticker"], auth=auth, batch_size=batch_size
+        slices += _square_off_slices(
+            security["position"], security["ticker"], batch_size
         )
+    # Child orders for every ticker go out together instead of ticker by ticker
+    results = await dispatch_market_children(auth, slices, max_concurrency)
     logger.info(f"Trade for all tickers squared off")
-    return
+    return results
 
 
 async def fetch_securities(
     auth: AuthConfig,
     ticker: Optional[str] = None,
+    fresh: bool = False,
 ):
-    """Fetches the securities by querying the securities API."""
-    params = {"ticker": ticker}
-    endpoint = "/v1/securities"
-    return await query_api("get", endpoint, auth, params=params)
+    """Fetches the securities by querying the securities API.
+    Served from the tick-scoped cache when already fetched in the current tick,
+    unless `fresh` is set: callers waiting for a position to change must see
+    every new response, which then refills the cache.
+    """
+    session = get_session(auth)
+    cache = session.snapshot_cache
+    securities_data = None if fresh else cache.get_securities(ticker)
+    if securities_data is None:
+        generation = cache.generation
+        requested_at = time.monotonic()
+        params = {"ticker": ticker}
+        endpoint = "/v1/securities"
+        securities_data = await query_api("get", endpoint, auth, params=params)
+        cache.store_securities(securities_data, ticker, generation)
+        # Fills of live orders may or may not be in the response, so only
+        # sync_positions, which lists their fills too, reconciles then
+        if ticker is None and not session.order_store.live():
+            session.position_ledger.reconcile(securities_data, requested_at)
+    return securities_data
+
+
+def get_position_ledger(auth: AuthConfig) -> PositionLedger:
+    """Returns the position ledger of this account on the running loop."""
+    return get_session(auth).position_ledger
+
+
+def get_order_store(auth: AuthConfig) -> OrderStore:
+    """Returns the order store of this account on the running loop."""
+    return get_session(auth).order_store
+
+
+async def sync_positions(auth: AuthConfig) -> PositionLedger:
+    """Reconciles the position ledger against a fresh /v1/securities response
+    and the fills of our live orders: those the server lists as OPEN, which
+    include any left from an earlier run, and those we still track as live.
+    """
+    ledger, store = get_position_ledger(auth), get_order_store(auth)
+    requested_at = time.monotonic()
+    securities, orders = await asyncio.gather(
+        query_api("get", "/v1/securities", auth),
+        query_api("get", "/v1/orders", auth, params={"status": "OPEN"}),
+    )
+    listed = {order["order_id"] for order in orders}
+    orders += await asyncio.gather(
+        *(
+            query_api("get", f"/v1/orders/{order.order_id}", auth)
+            for order in store.live()
+            if order.order_id not in listed
+        )
+    )
+    ledger.reconcile(securities, requested_at, orders)
+    for order in orders:
+        store.record(order)
+    return ledger
 
 
-async def accept_tender(id: int, price: float, auth: AuthConfig):
-    """Accepts a tender with the given id and price."""
+async def accept_tender(
+    id: int, price: float, auth: AuthConfig, tender: Optional[TenderRecord] = None
+):
+    """Accepts a tender with the given id and price.
+    Pass the tender to have it applied to the position ledger once accepted.
+    """
     endpoint = f"/v1/tenders/{id}"
     params = {"price": price}
-    return await query_api("post", endpoint, auth, params=params)
+    response = await query_api("post", endpoint, auth, params=params)
+    if tender is not None and response.get("success"):
+        get_position_ledger(auth).on_tender(tender, price)
+    return response
 
 
 async def fetch_order_book(ticker: str, auth: AuthConfig, limit: Optional[int] = 20):
@@ -211,28 +680,51 @@ async def fetch_order_book(ticker: str, auth: AuthConfig, limit: Optional[int] =
     return await query_api("get", endpoint, auth, params=params)
 
 
+def tender_reflected(
+    action: str,
+    quantity: int,
+    initial_position: int,
+    position: int,
+    own_flow: int = 0,
+) -> bool:
+    """Whether `position` shows the whole tender on top of `initial_position`.
+    `own_flow` is the signed quantity our own orders filled in the meantime,
+    so a square-off running on the same ticker does not hide the tender.
+    """
+    direction = 1 if action == "BUY" else -1
+    return direction * (position - own_flow - initial_position) >= quantity
+
+
 async def is_tender_processed(
-    auth: AuthConfig, ticker: str, quantity: int, initial_position: int
+    auth: AuthConfig,
+    ticker: str,
+    quantity: int,
+    initial_position: int,
+    action: str,
+    timeout: float = 1.0,
+    interval: float = 0.1,
 ):
-    """Asynchronously checks if a tender has been processed."""
-    processing_count = 0
-    while processing_count < 10:
+    """Polls /v1/securities until the position shows the tender or `timeout`
+    seconds pass. Strategies running the market-data service should wait on
+    its securities stream instead, see MarketDataService.wait_for_position.
+    """
+    ledger = get_position_ledger(auth)
+    flow = ledger.order_flow.get(ticker, 0)
+    deadline = time.monotonic() + timeout
+    while True:
         try:
-            securities_data = await fetch_securities(auth, ticker)
-            logger.info(
-                f"Checking if tender processed, quantity:{quantity} difference:{abs(initial_position - securities_data[0]['position'])} initial_position:{initial_position} current_position:{securities_data[0]['position']} "
-            )
+            securities = await fetch_securities(auth, ticker, fresh=True)
+            position = securities[0]["position"]
+            own_flow = ledger.order_flow.get(ticker, 0) - flow
+            if tender_reflected(action, quantity, initial_position, position, own_flow):
+                logger.info(f"Tender on {ticker} processed, position {position}")
+                return True
         except Exception as e:
             logger.error(f"An error occurred while querying security {ticker}: {e}")
-        if abs(initial_position - securities_data[0]["position"]) >= int(
-            0.5 * abs(quantity)
-        ):
-            logger.info(f"Tender has been processed")
-            return True
-        await asyncio.sleep(0.1)
-        processing_count += 1
-    logger.info(f"Tender wasn't processed")
-    return False
+        if time.monotonic() + interval > deadline:
+            logger.info(f"Tender on {ticker} wasn't processed in {timeout}s")
+            return False
+        await asyncio.sleep(interval)
 
 
 async def post_order(
@@ -256,4 +748,68 @@ async def post_order(
         params["price"] = price
     if ticker_type == "MARKET" and dry_run is not None:
         params["dry_run"] = dry_run
-    return await query_api("post", endpoint, auth, params=params)
+    order = await query_api("post", endpoint, auth, params=params)
+    if not dry_run:
+        get_position_ledger(auth).on_order(order)
+        get_order_store(auth).record(order)
+    return order
+
+
+async def fetch_security_records(
+    auth: AuthConfig, ticker: Optional[str] = None
+) -> List[SecurityRecord]:
+    """Fetches the securities as typed records for strategy loops."""
+    return decode_securities(await fetch_securities(auth, ticker))
+
+
+async def fetch_tender_records(auth: AuthConfig) -> List[TenderRecord]:
+    """Fetches the active tenders as typed records for strategy loops."""
+    return decode_tenders(await fetch_active_tenders(auth))
+
+
+async def fetch_order_book_record(
+    ticker: str, auth: AuthConfig, limit: Optional[int] = 20
+) -> OrderBookRecord:
+    """Fetches the order book of a security as price/quantity arrays."""
+    return OrderBookRecord.from_json(
+        await fetch_order_book(ticker, auth, limit), ticker
+    )
+
+
+async def fetch_order_records(
+    auth: AuthConfig, status: Optional[str] = "OPEN"
+) -> List[OrderRecord]:
+    """Fetches our orders with the given status as typed records."""
+    orders = await query_api("get", "/v1/orders", auth, params={"status": status})
+    _record_orders(auth, orders)
+    return decode_orders(orders)
+
+
+async def fetch_order(auth: AuthConfig, order_id: int) -> Dict[str, Any]:
+    """Fetches one of our orders by id."""
+    order = await query_api("get", f"/v1/orders/{order_id}", auth)
+    _record_order(auth, order)
+    return order
+
+
+async def cancel_order(auth: AuthConfig, order_id: int):
+    """Cancels one of our open orders by id."""
+    response = await query_api("delete", f"/v1/orders/{order_id}", auth)
+    if response.get("success"):
+        get_order_store(auth).cancelled([order_id])
+    return response
+
+
+def _record_order(auth: AuthConfig, order: Dict[str, Any]):
+    """Feeds an order response to the position ledger and the order store.
+    A fill seen here may come from another trader hitting a resting order, so
+    it drops cached positions like our own requests do.
+    """
+    if get_position_ledger(auth).on_order(order, known_only=True):
+        invalidate_positions(auth)
+    get_order_store(auth).record(order)
+
+
+def _record_orders(auth: AuthConfig, orders: List[Dict[str, Any]]):
+    for order in orders:
+        _record_order(auth, order)
@@ -0,0 +1,144 @@
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from trading_strategies.apis.api_utility import fetch_order_book_record
+from trading_strategies.logger_config import setup_logger
+from trading_strategies.models.consolidated_book import ConsolidatedBook, merge_sides
+from trading_strategies.models.custom_models import AuthConfig
+from trading_strategies.models.market_depth import BookSide, MarketDepth
+from trading_strategies.models.rit_records import OrderBookRecord
+
+logger = setup_logger(__name__)
+
+
+class SideDelta(NamedTuple):
+    """Changes to one side of a book between two snapshots.
+    `prices` are the price levels whose total size changed and `quantities` the
+    new size there, 0 for a level that is gone. `first_level` is the first row
+    whose cumulative columns had to be recomputed.
+    """
+
+    first_level: int
+    prices: np.ndarray
+    quantities: np.ndarray
+
+
+class BookDelta(NamedTuple):
+    ticker: str
+    depth: MarketDepth  # the book after the change
+    bids: Optional[SideDelta]  # None when the side did not change
+    asks: Optional[SideDelta]
+
+
+BookSubscriber = Callable[[BookDelta], None]
+
+
+def _size_by_price(side: BookSide, prices: np.ndarray) -> np.ndarray:
+    """Total resting size of `side` at each of the sorted `prices`."""
+    return np.bincount(
+        np.searchsorted(prices, side.prices),
+        weights=side.quantities,
+        minlength=len(prices),
+    )
+
+
+def _side_delta(old: BookSide, new: BookSide, first_level: int) -> SideDelta:
+    prices = np.union1d(old.prices, new.prices)
+    before, after = _size_by_price(old, prices), _size_by_price(new, prices)
+    changed = before != after
+    return SideDelta(first_level, prices[changed], after[changed])
+
+
+class BookDeltaEngine:
+    """Diffs successive order book snapshots per ticker.
+
+    Cumulative volume and VWAP are recomputed only from the first level that
+    changed; unchanged sides keep the previous BookSide object, so consumers
+    can skip work with an identity check. Subscribers get one BookDelta per
+    snapshot that changed something, and nothing for identical snapshots.
+    """
+
+    def __init__(self, depth: Optional[int] = None):
+        self.depth = depth
+        self.books: Dict[str, MarketDepth] = {}
+        self._subscribers: List[BookSubscriber] = []
+
+    def subscribe(self, subscriber: BookSubscriber):
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: BookSubscriber):
+        self._subscribers.remove(subscriber)
+
+    def get(self, ticker: str) -> Optional[MarketDepth]:
+        return self.books.get(ticker)
+
+    def _apply_side(self, old: BookSide, prices: np.ndarray, quantities: np.ndarray):
+        start = old.first_change(prices, quantities)
+        if start == len(old) == len(prices):
+            return old, None
+        new = old.updated(prices, quantities, start)
+        return new, _side_delta(old, new, start)
+
+    def apply(self, record: OrderBookRecord) -> Optional[BookDelta]:
+        """Folds a new snapshot into the ticker's book; returns the delta, or None
+        if nothing changed.
+        """
+        depth = self.depth
+        old = self.books.get(record.ticker)
+        if old is None:
+            old = MarketDepth(BookSide.empty(), BookSide.empty())
+        bids, bid_delta = self._apply_side(
+            old.bids, record.bid_prices[:depth], record.bid_quantities[:depth]
+        )
+        asks, ask_delta = self._apply_side(
+            old.asks, record.ask_prices[:depth], record.ask_quantities[:depth]
+        )
+        if bid_delta is None and ask_delta is None and record.ticker in self.books:
+            return None
+        book = MarketDepth(bids, asks)
+        self.books[record.ticker] = book
+        delta = BookDelta(record.ticker, book, bid_delta, ask_delta)
+        for subscriber in self._subscribers:
+            subscriber(delta)
+        return delta
+
+    async def poll(self, ticker: str, auth: AuthConfig) -> Optional[BookDelta]:
+        """Fetches the ticker's book and applies it."""
+        limit = self.depth or 20
+        return self.apply(await fetch_order_book_record(ticker, auth, limit))
+
+
+class ConsolidatedView:
+    """Consolidated book of a group of venues kept in step with an engine.
+    Deltas only mark the affected side stale; it is rebuilt on the next read.
+    """
+
+    def __init__(self, engine: BookDeltaEngine, venues: Sequence[str]):
+        self.engine = engine
+        self.venues = list(venues)
+        self._book: Optional[ConsolidatedBook] = None
+        self._stale_bids = self._stale_asks = True
+        engine.subscribe(self._on_delta)
+
+    def _on_delta(self, delta: BookDelta):
+        if delta.ticker in self.venues:
+            self._stale_bids |= delta.bids is not None
+            self._stale_asks |= delta.asks is not None
+
+    def _merge(self, side: str) -> BookSide:
+        empty = BookSide.empty()
+        sides = [getattr(self.engine.get(v), side, empty) for v in self.venues]
+        return merge_sides(sides, self.venues, descending=side == "bids")
+
+    @property
+    def book(self) -> ConsolidatedBook:
+        if self._book is None:
+            self._book = ConsolidatedBook(self._merge("bids"), self._merge("asks"))
+        elif self._stale_bids or self._stale_asks:
+            self._book = ConsolidatedBook(
+                self._merge("bids") if self._stale_bids else self._book.bids,
+                self._merge("asks") if self._stale_asks else self._book.asks,
+            )
+        self._stale_bids = self._stale_asks = False
+        return self._book
@@ -1,23 +1,26 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
 
 from trading_strategies.apis.api_utility import cancel_all_open_order as caoo
 from trading_strategies.apis.api_utility import (
-    cancel_open_orders,
+    fetch_case,
     fetch_current_tick,
+    fetch_securities,
     get_auth_config,
 )
 from trading_strategies.apis.api_utility import market_square_off_all_tickers as msoat
 from trading_strategies.apis.api_utility import market_square_off_ticker as msot
-from trading_strategies.apis.api_utility import query_api
+from trading_strategies.apis.metrics import render_metrics
+from trading_strategies.apis.session import session_lifespan
 from trading_strategies.logger_config import setup_logger
 from trading_strategies.models.custom_models import AuthConfig
 
 # Configure logging
 logger = setup_logger(__name__)
 
-router = APIRouter()
+router = APIRouter(lifespan=session_lifespan)
 
 
 @router.get("/tick")
@@ -26,11 +29,17 @@ async def get_current_tick(auth: AuthConfig = Depends(get_auth_config)):
     return await fetch_current_tick(auth=auth)
 
 
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Exposes upstream RIT request latency, error and in-flight metrics for Prometheus."""
+    return render_metrics()
+
+
 @router.get("/period")
 async def get_trading_period(auth: AuthConfig = Depends(get_auth_config)):
     """Fetches the current period by querying the case API."""
     try:
-        case_data = await query_api("get", "/v1/case", auth)  # Direct API call
+        case_data = await fetch_case(auth)
     except Exception:
         return None
     return case_data["period"]
@@ -40,7 +49,7 @@ async def get_trading_period(auth: AuthConfig = Depends(get_auth_config)):
 async def get_trading_status(auth: AuthConfig = Depends(get_auth_config)):
     """Fetches the current trading status by querying the case API."""
     try:
-        case_data = await query_api("get", "/v1/case", auth)  # Direct API call
+        case_data = await fetch_case(auth)
     except Exception:
         return None
     return case_data["status"]
@@ -48,8 +57,8 @@ async def get_trading_status(auth: AuthConfig = Depends(get_auth_config)):
 
 @router.delete("/all_orders")
 async def cancel_all_open_order(auth: AuthConfig = Depends(get_auth_config)):
-    """Fetches the OPEN orders and cancels them till all are cancelled.
-    If exception happens, it logs it and keeps on trying.
+    """Cancels every OPEN order with one bulk cancel, re-checks only the ids it
+    did not confirm and returns the ids still open after max_rounds rounds.
     """
     return await caoo(auth)
 
@@ -58,15 +67,13 @@ async def cancel_all_open_order(auth: AuthConfig = Depends(get_auth_config)):
 async def cancel_all_open_order_for_ticker(
     ticker: str, auth: AuthConfig = Depends(get_auth_config)
 ):
-    """Fetches the OPEN orders for a specific ticker and cancels them till all are cancelled.
-    If exception happens, it logs it and keeps on trying.
+    """Cancels the ticker's OPEN orders with one bulk cancel, re-checks only the
+    ids it did not confirm and returns the ids still open after max_rounds
+    rounds.
     """
-    # TODO @Mayuresh If error happens do to rate limiting then try again
-    open_orders = await query_api("get", "/v1/orders", auth, params={"status": "OPEN"})
-    filtered_orders = [order for order in open_orders if order["ticker"] == ticker]
-    await cancel_open_orders(filtered_orders, auth)
-    logger.info(f"Cancelled all open orders for ticker {ticker}")
-    return True
+    still_open = await caoo(auth, ticker)
+    logger.info(f"Cancelled open orders for ticker {ticker}, {len(still_open)} left")
+    return still_open
 
 
 @router.post("/market_square_off")
@@ -87,11 +94,10 @@ async def market_square_off_ticker(
     if not ticker:
         raise HTTPException(status_code=400, detail="Ticker parameter is required.")
 
-    securities_params = {"ticker": ticker}
-    endpoint = "/v1/securities"
-    # TODO @Mayuresh If error happens do to rate limiting then try again
-    securities_data = await query_api("get", endpoint, auth, params=securities_params)
-    await msot(int(securities_data[0]["position"]), ticker, auth=auth)
+    securities_data = await fetch_securities(auth, ticker)
+    await msot(
+        int(securities_data[0]["position"]), ticker, auth=auth, batch_size=batch_size
+    )
     logger.info(
         f"Trade for {ticker} squared off with for initial position: {securities_data[0]['position']}"
     )
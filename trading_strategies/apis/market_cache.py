@@ -0,0 +1,103 @@
+import time
+from typing import Any, Dict, List, Optional
+
+
+class MarketSnapshotCache:
+    """Caches /v1/case and /v1/securities responses for the current case tick.
+
+    The case response is kept until the earliest time the tick can have moved
+    on: a tick observed right after the previous one started no earlier than
+    the last request that still saw the previous tick, so it ends no earlier
+    than that moment plus `tick_duration`. Until a tick change has been seen,
+    nothing is cached.
+
+    Securities responses are tagged with the tick they were fetched in and are
+    served only while the cached case is still on that tick. Our own order,
+    cancel and tender activity changes positions, as do fills seen on our
+    resting orders, so they drop them explicitly through
+    `invalidate_securities`. Callers waiting for a position change bypass the
+    cache altogether.
+
+    Cached payloads are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, tick_duration: float = 1.0):
+        self.tick_duration = tick_duration
+        self._case: Optional[Dict[str, Any]] = None
+        self._case_expires_at = 0.0
+        self._last_tick: Optional[int] = None
+        self._last_tick_seen_at: Optional[float] = None
+        self._tick_started_after: Optional[float] = None
+        self._securities: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        self._securities_tick: Optional[int] = None
+        # Bumped on every invalidation so responses to older requests are not stored
+        self.generation = 0
+
+    def current_tick(self) -> Optional[int]:
+        """Returns the tick of the cached case if it is still current, else None."""
+        if self._case is None or time.monotonic() >= self._case_expires_at:
+            return None
+        return self._case.get("tick")
+
+    def get_case(self) -> Optional[Dict[str, Any]]:
+        if self.current_tick() is None:
+            return None
+        return self._case
+
+    def store_case(self, case: Dict[str, Any], requested_at: float):
+        """Stores a case response; `requested_at` is when the request was sent."""
+        tick = case.get("tick")
+        if tick != self._last_tick:
+            # The tick moved after the last request that still saw the previous one
+            previous_is_adjacent = (
+                self._last_tick is not None
+                and tick is not None
+                and tick == self._last_tick + 1
+            )
+            self._tick_started_after = (
+                self._last_tick_seen_at if previous_is_adjacent else None
+            )
+            self._last_tick = tick
+            self._securities.clear()
+        self._last_tick_seen_at = requested_at
+        self._case = case
+        self._case_expires_at = (
+            self._tick_started_after + self.tick_duration
+            if self._tick_started_after is not None
+            else requested_at
+        )
+
+    def get_securities(self, ticker: Optional[str] = None):
+        """Returns cached securities for this tick, filtering the full list if needed."""
+        tick = self.current_tick()
+        if tick is None or tick != self._securities_tick:
+            return None
+        if ticker in self._securities:
+            return self._securities[ticker]
+        if ticker is not None and None in self._securities:
+            return [s for s in self._securities[None] if s["ticker"] == ticker]
+        return None
+
+    def store_securities(
+        self, securities: List[Dict[str, Any]], ticker=None, generation: int = 0
+    ):
+        """Stores a securities response if the current tick is known and nothing
+        was invalidated since `generation` was read, i.e. since the request was sent.
+        """
+        tick = self.current_tick()
+        if tick is None or generation != self.generation:
+            return
+        if tick != self._securities_tick:
+            self._securities.clear()
+            self._securities_tick = tick
+        self._securities[ticker] = securities
+
+    def invalidate_securities(self):
+        """Drops cached securities, e.g. after one of our orders may have filled."""
+        self._securities.clear()
+        self.generation += 1
+
+    def invalidate(self):
+        self.invalidate_securities()
+        self._case = None
+        self._case_expires_at = 0.0
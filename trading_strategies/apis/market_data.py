@@ -0,0 +1,275 @@
+import asyncio
+import os
+import time
+import weakref
+from types import MappingProxyType
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from trading_strategies.apis.api_utility import (
+    fetch_active_tenders,
+    fetch_case,
+    fetch_securities,
+)
+from trading_strategies.apis.book_deltas import BookDeltaEngine
+from trading_strategies.apis.news_feed import NewsFeed
+from trading_strategies.apis.session import RITSession, get_session
+from trading_strategies.logger_config import setup_logger
+from trading_strategies.models.custom_models import AuthConfig, MarketDataConfig
+from trading_strategies.models.market_depth import MarketDepth
+from trading_strategies.models.rit_records import (
+    SecurityRecord,
+    TenderRecord,
+    decode_securities,
+    decode_tenders,
+)
+
+logger = setup_logger(__name__)
+
+STREAMS = ("case", "securities", "tenders", "books", "news")
+
+
+class MarketSnapshot(NamedTuple):
+    """Latest state of every stream. A new snapshot is built on each change and
+    never modified afterwards; payloads must be treated as read-only.
+    """
+
+    version: int = 0
+    case: Optional[Mapping[str, Any]] = None
+    securities: Tuple[SecurityRecord, ...] = ()
+    tenders: Tuple[TenderRecord, ...] = ()
+    books: Mapping[str, MarketDepth] = MappingProxyType({})
+    news: Tuple[Mapping[str, Any], ...] = ()  # items published by the last poll
+
+    @property
+    def tick(self) -> Optional[int]:
+        return self.case["tick"] if self.case else None
+
+    @property
+    def status(self) -> Optional[str]:
+        return self.case["status"] if self.case else None
+
+    def security(self, ticker: str) -> Optional[SecurityRecord]:
+        return next((s for s in self.securities if s.ticker == ticker), None)
+
+
+class MarketEvent(NamedTuple):
+    stream: str  # which stream changed
+    snapshot: MarketSnapshot
+    received_at: float  # time.monotonic() when the change was seen
+
+
+def get_market_data_config() -> MarketDataConfig:
+    """Reads polling cadences from the environment, see MarketDataConfig."""
+    return MarketDataConfig(
+        case_interval=float(os.getenv("MD_CASE_INTERVAL", 0.2)),
+        securities_interval=float(os.getenv("MD_SECURITIES_INTERVAL", 0.25)),
+        tenders_interval=float(os.getenv("MD_TENDERS_INTERVAL", 0.25)),
+        books_interval=float(os.getenv("MD_BOOKS_INTERVAL", 0.25)),
+        news_interval=float(os.getenv("MD_NEWS_INTERVAL", 0.5)),
+        book_depth=int(os.getenv("MD_BOOK_DEPTH", 20)),
+    )
+
+
+class MarketDataService:
+    """Owns all market-data polling for one account and fans snapshots out.
+
+    Each stream is polled by its own task at its configured cadence and is
+    only published when its payload changed. Subscribers receive MarketEvents
+    on bounded queues; when a queue is full the oldest event is dropped, so a
+    slow subscriber always catches up to the latest snapshot instead of
+    stalling the pollers. However many strategies subscribe, upstream load is
+    one request per stream per interval (plus one per watched book).
+    """
+
+    def __init__(self, auth: AuthConfig, config: Optional[MarketDataConfig] = None):
+        self.auth = auth
+        self.config = config or get_market_data_config()
+        self.snapshot = MarketSnapshot()
+        self.book_engine = BookDeltaEngine(self.config.book_depth)
+        self.news_feed = NewsFeed(auth)
+        self.book_tickers: List[str] = []
+        self._raw: Dict[str, Any] = {}
+        self._subscribers: Dict[asyncio.Queue, Optional[frozenset]] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def watch_books(self, tickers: Iterable[str]):
+        """Adds tickers to the book stream."""
+        for ticker in tickers:
+            if ticker not in self.book_tickers:
+                self.book_tickers.append(ticker)
+
+    def subscribe(
+        self, streams: Optional[Iterable[str]] = None, maxsize: int = 100
+    ) -> asyncio.Queue:
+        """Returns a queue receiving events for the given streams (all by default)."""
+        streams = frozenset(streams) if streams else None
+        if streams and not streams <= set(STREAMS):
+            raise ValueError(f"Unknown streams {sorted(streams - set(STREAMS))}")
+        queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._subscribers[queue] = streams
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.pop(queue, None)
+
+    async def next_event(
+        self, queue: asyncio.Queue, timeout: Optional[float] = None
+    ) -> Optional[MarketEvent]:
+        """Waits for the next event on a subscriber queue, None on timeout."""
+        try:
+            return await asyncio.wait_for(queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def wait_for_position(
+        self, ticker: str, predicate: Callable[[int], bool], timeout: float
+    ) -> Optional[int]:
+        """Waits for a securities snapshot whose position in `ticker` satisfies
+        `predicate`; returns that position, or None once `timeout` seconds pass.
+
+        Securities are polled once straight away, so a change that already
+        happened is seen without waiting for the stream's next poll.
+        """
+        queue = self.subscribe(("securities",), maxsize=1)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        snapshot = self.snapshot
+        try:
+            security = snapshot.security(ticker)
+            if security is None or not predicate(security.position):
+                try:
+                    await self.poll_securities()
+                except Exception as e:
+                    logger.error(f"Market data poll poll_securities failed: {e}")
+                snapshot = self.snapshot
+            while True:
+                security = snapshot.security(ticker)
+                if security is not None and predicate(security.position):
+                    return security.position
+                event = await self.next_event(queue, deadline - loop.time())
+                if event is None:
+                    return None
+                snapshot = event.snapshot
+        finally:
+            self.unsubscribe(queue)
+
+    def _publish(self, stream: str, **changes):
+        self.snapshot = self.snapshot._replace(
+            version=self.snapshot.version + 1, **changes
+        )
+        event = MarketEvent(stream, self.snapshot, time.monotonic())
+        for queue, streams in self._subscribers.items():
+            if streams is not None and stream not in streams:
+                continue
+            if queue.full():
+                queue.get_nowait()  # drop the oldest, the newest snapshot wins
+            queue.put_nowait(event)
+
+    def _changed(self, stream: str, raw: Any) -> bool:
+        if self._raw.get(stream) == raw:
+            return False
+        self._raw[stream] = raw
+        return True
+
+    async def poll_case(self):
+        case = await fetch_case(self.auth)
+        if self._changed("case", case):
+            self._publish("case", case=MappingProxyType(dict(case)))
+
+    async def poll_securities(self):
+        # Never from the tick cache: positions change within a tick
+        securities = await fetch_securities(self.auth, fresh=True)
+        if self._changed("securities", securities):
+            self._publish("securities", securities=tuple(decode_securities(securities)))
+
+    async def poll_tenders(self):
+        tenders = await fetch_active_tenders(self.auth)
+        if self._changed("tenders", tenders):
+            self._publish("tenders", tenders=tuple(decode_tenders(tenders)))
+
+    async def poll_books(self):
+        tickers = list(self.book_tickers)
+        deltas = await asyncio.gather(
+            *(self.book_engine.poll(ticker, self.auth) for ticker in tickers)
+        )
+        if any(delta is not None for delta in deltas):
+            books = {t: self.book_engine.get(t) for t in tickers}
+            self._publish("books", books=MappingProxyType(books))
+
+    async def poll_news(self):
+        items = await self.news_feed.poll()
+        if items:
+            self._publish("news", news=tuple(MappingProxyType(n) for n in items))
+
+    async def _run_stream(self, interval: float, poll: Callable[[], Awaitable[None]]):
+        while True:
+            started = time.monotonic()
+            try:
+                await poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Market data poll {poll.__name__} failed: {e}")
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    async def start(self):
+        """Starts one polling task per stream; does nothing if already running."""
+        if self.running:
+            return
+        config = self.config
+        self._tasks = [
+            asyncio.create_task(self._run_stream(interval, poll))
+            for interval, poll in (
+                (config.case_interval, self.poll_case),
+                (config.securities_interval, self.poll_securities),
+                (config.tenders_interval, self.poll_tenders),
+                (config.books_interval, self.poll_books),
+                (config.news_interval, self.poll_news),
+            )
+            if interval > 0
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+# One service per session, i.e. per (account, event loop)
+_services: "weakref.WeakKeyDictionary[RITSession, MarketDataService]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_market_data_service(auth: AuthConfig) -> MarketDataService:
+    """Returns the shared market-data service of this account on the running loop."""
+    session = get_session(auth)
+    service = _services.get(session)
+    if service is None:
+        service = MarketDataService(auth)
+        _services[session] = service
+    return service
+
+
+async def stop_all_market_data():
+    """Shutdown hook: stops every market-data service of the running loop."""
+    loop = asyncio.get_running_loop()
+    for service in list(_services.values()):
+        if any(task.get_loop() is loop for task in service._tasks):
+            await service.stop()
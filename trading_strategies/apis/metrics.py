@@ -0,0 +1,207 @@
+import bisect
+import re
+import threading
+from typing import Dict, Optional, Tuple
+
+# Upper bounds in seconds, Prometheus style (le=...)
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_label(endpoint: str) -> str:
+    """Collapses ids so /v1/orders/123 and /v1/orders/456 share one series."""
+    return _ID_SEGMENT.sub("/{id}", endpoint)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)  # last bucket is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS + (float("inf"),), self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+Key = Tuple[str, str]  # (method, endpoint label)
+
+
+class RequestMetrics:
+    """Per-endpoint/method latency histograms, error counters and in-flight gauges
+    for upstream RIT requests. Shared by every session, so updates take a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[Key, Histogram] = {}
+        self.queue_wait: Dict[Key, Histogram] = {}
+        self.requests: Dict[Key, int] = {}
+        self.errors: Dict[Tuple[str, str, str], int] = {}
+        self.in_flight: Dict[Key, int] = {}
+
+    @staticmethod
+    def key(method: str, endpoint: str) -> Key:
+        return method.upper(), endpoint_label(endpoint)
+
+    def started(self, key: Key):
+        with self._lock:
+            self.in_flight[key] = self.in_flight.get(key, 0) + 1
+
+    def finished(self, key: Key, seconds: float, error: Optional[str] = None):
+        """Records one finished request; `error` is the status code or error kind."""
+        with self._lock:
+            self.in_flight[key] -= 1
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency.setdefault(key, Histogram()).observe(seconds)
+            if error is not None:
+                error_key = key + (error,)
+                self.errors[error_key] = self.errors.get(error_key, 0) + 1
+
+    def waited(self, key: Key, seconds: float):
+        """Records time spent queued in the rate limiter before sending."""
+        with self._lock:
+            self.queue_wait.setdefault(key, Histogram()).observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.latency.clear()
+            self.queue_wait.clear()
+            self.requests.clear()
+            self.errors.clear()
+            self.in_flight = {k: v for k, v in self.in_flight.items() if v}
+
+    def snapshot(self) -> dict:
+        """Returns a JSON-friendly copy of all series, keyed by "METHOD endpoint"."""
+        with self._lock:
+            endpoints = {}
+            for key in set(self.requests) | set(self.in_flight):
+                histogram = self.latency.get(key, Histogram())
+                wait = self.queue_wait.get(key, Histogram())
+                endpoints[f"{key[0]} {key[1]}"] = {
+                    "requests": self.requests.get(key, 0),
+                    "in_flight": self.in_flight.get(key, 0),
+                    "errors": {
+                        error: count
+                        for (method, endpoint, error), count in self.errors.items()
+                        if (method, endpoint) == key
+                    },
+                    "latency_sum_s": round(histogram.total, 6),
+                    "latency_avg_s": (
+                        round(histogram.total / histogram.count, 6)
+                        if histogram.count
+                        else None
+                    ),
+                    "latency_p50_s": histogram.quantile(0.5),
+                    "latency_p99_s": histogram.quantile(0.99),
+                    "queue_wait_avg_s": (
+                        round(wait.total / wait.count, 6) if wait.count else None
+                    ),
+                }
+            return endpoints
+
+    def render_prometheus(self) -> str:
+        """Renders all series in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines += _render_histograms(
+                "rit_client_request_duration_seconds",
+                "Latency of upstream RIT API requests.",
+                self.latency,
+            )
+            lines += _render_histograms(
+                "rit_client_queue_wait_seconds",
+                "Time requests waited in the client rate limiter.",
+                self.queue_wait,
+            )
+            lines += [
+                "# HELP rit_client_requests_total Upstream RIT API requests sent.",
+                "# TYPE rit_client_requests_total counter",
+            ]
+            for (method, endpoint), count in sorted(self.requests.items()):
+                lines.append(
+                    f"rit_client_requests_total{_labels(method, endpoint)} {count}"
+                )
+            lines += [
+                "# HELP rit_client_errors_total Failed RIT API requests by status or kind.",
+                "# TYPE rit_client_errors_total counter",
+            ]
+            for (method, endpoint, error), count in sorted(self.errors.items()):
+                labels = _labels(method, endpoint, error=error)
+                lines.append(f"rit_client_errors_total{labels} {count}")
+            lines += [
+                "# HELP rit_client_in_flight_requests RIT API requests awaiting a response.",
+                "# TYPE rit_client_in_flight_requests gauge",
+            ]
+            for (method, endpoint), count in sorted(self.in_flight.items()):
+                lines.append(
+                    f"rit_client_in_flight_requests{_labels(method, endpoint)} {count}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, endpoint: str, **extra) -> str:
+    labels = {"method": method, "endpoint": endpoint, **extra}
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels.items()) + "}"
+
+
+def _render_histograms(name: str, help: str, histograms: Dict[Key, Histogram]):
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} histogram"]
+    for (method, endpoint), histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+            cumulative += count
+            labels = _labels(method, endpoint, le=bound)
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _labels(method, endpoint, le="+Inf")
+        lines.append(f"{name}_bucket{labels} {histogram.count}")
+        lines.append(f"{name}_sum{_labels(method, endpoint)} {histogram.total}")
+        lines.append(f"{name}_count{_labels(method, endpoint)} {histogram.count}")
+    return lines
+
+
+# Process-wide registry fed by RITSession
+REQUEST_METRICS = RequestMetrics()
+
+
+def metrics_snapshot() -> dict:
+    """Programmatic view of the client request metrics."""
+    return REQUEST_METRICS.snapshot()
+
+
+def render_metrics() -> str:
+    return REQUEST_METRICS.render_prometheus()
+
+
+def reset_metrics():
+    REQUEST_METRICS.reset()
@@ -0,0 +1,68 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+from trading_strategies.apis.api_utility import fetch_news
+from trading_strategies.logger_config import setup_logger
+from trading_strategies.models.custom_models import AuthConfig
+
+logger = setup_logger(__name__)
+
+NewsParser = Callable[[Dict[str, Any]], Any]
+NewsSubscriber = Callable[[Dict[str, Any], Any], None]
+
+
+class NewsFeed:
+    """Incremental /v1/news reader.
+
+    Each poll asks only for items after the last news_id seen, so payload size
+    and parse cost depend on how much news arrived, not on the session length.
+    Every new item is run through `parser` exactly once and handed, oldest
+    first, to each subscriber as subscriber(news, parsed).
+    """
+
+    def __init__(
+        self,
+        auth: AuthConfig,
+        parser: Optional[NewsParser] = None,
+        limit: int = 100,
+    ):
+        self.auth = auth
+        self.parser = parser
+        self.limit = limit
+        self.last_id: Optional[int] = None
+        self._subscribers: List[NewsSubscriber] = []
+
+    def subscribe(self, subscriber: NewsSubscriber):
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: NewsSubscriber):
+        self._subscribers.remove(subscriber)
+
+    def reset(self):
+        """Forgets the cursor, e.g. when a new case starts numbering news again."""
+        self.last_id = None
+
+    async def poll(self) -> List[Dict[str, Any]]:
+        """Fetches and dispatches news published since the previous poll."""
+        items = await fetch_news(self.auth, after=self.last_id, limit=self.limit)
+        if not items:
+            return []
+        if len(items) >= self.limit and self.last_id is not None:
+            # RIT counts the limit back from the newest item
+            logger.warning(f"News page full after {self.last_id}, items may be missed")
+        items = sorted(items, key=lambda news: news["news_id"])
+        self.last_id = items[-1]["news_id"]
+        for news in items:
+            parsed = self.parser(news) if self.parser else None
+            for subscriber in self._subscribers:
+                subscriber(news, parsed)
+        return items
+
+    async def run(self, interval: float = 0.5):
+        """Polls forever; errors are logged and retried on the next interval."""
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.error(f"An error occurred while polling news: {e}")
+            await asyncio.sleep(interval)
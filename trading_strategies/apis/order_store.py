@@ -0,0 +1,77 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from trading_strategies.models.rit_records import OrderRecord
+
+
+class OrderStore:
+    """Our own orders, recorded as they are submitted and updated by id.
+
+    post_order records every acknowledgement and every order-status response
+    updates the record, so our OPEN orders are known without listing
+    /v1/orders. OPEN orders are also indexed on their own, so live queries
+    cost O(our open orders) however many orders the session has sent. A
+    settled order never goes back to OPEN, which makes late responses harmless.
+    """
+
+    def __init__(self):
+        self.orders: Dict[int, OrderRecord] = {}
+        self._live: Dict[int, OrderRecord] = {}
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def get(self, order_id: int) -> Optional[OrderRecord]:
+        return self.orders.get(order_id)
+
+    def record(self, order: Mapping[str, Any]) -> OrderRecord:
+        """Stores an order response; returns the up-to-date record."""
+        new = OrderRecord.from_json(order)
+        current = self.orders.get(new.order_id)
+        if current is not None:
+            if current.status != "OPEN" and new.status == "OPEN":
+                return current  # a response older than the one already applied
+            new.quantity_filled = max(new.quantity_filled, current.quantity_filled)
+        self.orders[new.order_id] = new
+        if new.status == "OPEN":
+            self._live[new.order_id] = new
+        else:
+            self._live.pop(new.order_id, None)
+        return new
+
+    def cancelled(self, order_ids: Iterable[int]) -> int:
+        """Marks orders a cancel command confirmed; returns how many were live."""
+        count = 0
+        for order_id in order_ids:
+            order = self._live.pop(order_id, None)
+            if order is not None:
+                order.status = "CANCELLED"
+                count += 1
+        return count
+
+    def live(
+        self, ticker: Optional[str] = None, action: Optional[str] = None
+    ) -> List[OrderRecord]:
+        """Our OPEN orders, optionally for one ticker and side."""
+        return [
+            order
+            for order in self._live.values()
+            if (ticker is None or order.ticker == ticker)
+            and (action is None or order.action == action)
+        ]
+
+    def query(
+        self,
+        ticker: Optional[str] = None,
+        action: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[OrderRecord]:
+        """Our orders filtered by ticker, side and status, oldest first."""
+        if status == "OPEN":
+            return self.live(ticker, action)
+        return [
+            order
+            for order in self.orders.values()
+            if (ticker is None or order.ticker == ticker)
+            and (action is None or order.action == action)
+            and (status is None or order.status == status)
+        ]
@@ -0,0 +1,144 @@
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from trading_strategies.logger_config import setup_logger
+from trading_strategies.models.rit_records import TenderRecord
+
+logger = setup_logger(__name__)
+
+PositionListener = Callable[[str, int], None]
+
+
+class PositionLedger:
+    """Positions and cash of one account, kept up to date from our own activity.
+
+    Order acknowledgements and order-status polls apply the change in
+    quantity_filled since the order was last seen, accepted tenders apply
+    their whole quantity, and `reconcile` resets everything to a
+    /v1/securities response. A reconcile also takes our live orders' fills as
+    included in the positions it sets, so later polls only apply what fills
+    after it. Net and gross positions are maintained incrementally, so risk
+    checks are O(1) lookups instead of fetches.
+
+    Listeners are called as listener(ticker, position) whenever a position
+    changes, from a local update or a reconcile.
+    """
+
+    def __init__(self):
+        self.positions: Dict[str, int] = {}
+        self.cash = 0.0
+        self.net = 0
+        self.gross = 0
+        self.changed_at = 0.0  # time.monotonic() of the last local update
+        self.tendered_at = 0.0  # time.monotonic() of the last accepted tender
+        self.reconciled_at: Optional[float] = None
+        # Signed quantity filled by our orders per ticker, tenders excluded
+        self.order_flow: Dict[str, int] = {}
+        # order_id -> (quantity_filled, notional) already applied
+        self._fills: Dict[int, Tuple[int, float]] = {}
+        self._listeners: List[PositionListener] = []
+
+    def subscribe(self, listener: PositionListener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: PositionListener):
+        self._listeners.remove(listener)
+
+    def position(self, ticker: str) -> int:
+        return self.positions.get(ticker, 0)
+
+    def with_trade(self, ticker: str, quantity: int) -> Tuple[int, int]:
+        """Net and gross positions after a signed trade, without applying it."""
+        position = self.positions.get(ticker, 0)
+        gross = self.gross - abs(position) + abs(position + quantity)
+        return self.net + quantity, gross
+
+    def _set(self, ticker: str, position: int):
+        previous = self.positions.get(ticker, 0)
+        if position == previous:
+            return
+        self.positions[ticker] = position
+        self.net += position - previous
+        self.gross += abs(position) - abs(previous)
+        for listener in self._listeners:
+            listener(ticker, position)
+
+    def apply_fill(self, ticker: str, action: str, quantity: int, price: float):
+        signed = quantity if action == "BUY" else -quantity
+        self.cash -= signed * price
+        self.changed_at = time.monotonic()
+        self._set(ticker, self.positions.get(ticker, 0) + signed)
+
+    def on_order(self, order: Mapping[str, Any], known_only: bool = False) -> int:
+        """Applies what an order acknowledgement or status poll shows as newly
+        filled; returns that quantity. Seeing the same state twice is a no-op.
+
+        With `known_only`, an order first seen after a reconcile is only
+        recorded: it was found by a listing or poll rather than placed by us
+        since, so its fills so far are in the reconciled positions.
+        """
+        order_id = order.get("order_id")
+        if order_id is None:
+            return 0
+        filled = int(order.get("quantity_filled") or 0)
+        notional = filled * (order.get("vwap") or order.get("price") or 0.0)
+        unseen = order_id not in self._fills
+        if unseen and known_only and self.reconciled_at is not None:
+            self._fills[order_id] = (filled, notional)
+            return 0
+        seen, seen_notional = self._fills.setdefault(order_id, (0, 0.0))
+        if filled <= seen:
+            return 0
+        self._fills[order_id] = (filled, notional)
+        new = filled - seen
+        ticker = order["ticker"]
+        signed = new if order["action"] == "BUY" else -new
+        self.order_flow[ticker] = self.order_flow.get(ticker, 0) + signed
+        self.apply_fill(ticker, order["action"], new, (notional - seen_notional) / new)
+        return new
+
+    def on_tender(self, tender: TenderRecord, price: Optional[float] = None):
+        """Applies an accepted tender at `price`, the tender price by default."""
+        price = tender.price if price is None else price
+        self.apply_fill(tender.ticker, tender.action, tender.quantity, price or 0.0)
+        self.tendered_at = self.changed_at
+
+    def reconcile(
+        self,
+        securities: Iterable[Mapping[str, Any]],
+        as_of: float,
+        orders: Optional[Iterable[Mapping[str, Any]]] = None,
+    ) -> bool:
+        """Resets positions and cash to a /v1/securities response requested at
+        monotonic time `as_of`; returns whether the ledger was reset.
+
+        `orders` are our live orders as listed alongside the response: their
+        quantity_filled is recorded as already included, including orders the
+        ledger has not seen. Without them, a response older than our last local
+        update may predate it and is ignored; with them, only an accepted
+        tender since `as_of` makes it stale, as order fills are accounted for.
+        """
+        if as_of <= (self.changed_at if orders is None else self.tendered_at):
+            return False
+        seen = set()
+        for security in securities:
+            ticker = security.get("ticker")
+            position = security.get("position") or 0
+            if security.get("type") == "CURRENCY":
+                self.cash = float(position)
+                continue
+            position = int(position)
+            if self.reconciled_at is not None and position != self.position(ticker):
+                logger.warning(
+                    f"Ledger drift on {ticker}: local {self.position(ticker)} server {position}"
+                )
+            self._set(ticker, position)
+            seen.add(ticker)
+        for ticker in [t for t in self.positions if t not in seen]:
+            self._set(ticker, 0)
+        for order in orders or ():
+            filled = int(order.get("quantity_filled") or 0)
+            price = order.get("vwap") or order.get("price") or 0.0
+            self._fills[order["order_id"]] = (filled, filled * price)
+        self.reconciled_at = as_of
+        return True
@@ -0,0 +1,117 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import List, Optional, Tuple
+
+import httpx
+
+# Lower value is served first
+ORDER_PRIORITY = 0
+MARKET_DATA_PRIORITY = 1
+
+
+def request_priority(method: str, endpoint: str) -> int:
+    """Order placement, cancels and tender actions jump ahead of market-data polls."""
+    if method.lower() != "get":
+        return ORDER_PRIORITY
+    return MARKET_DATA_PRIORITY
+
+
+def retry_after_seconds(response: httpx.Response, default: float = 0.5) -> float:
+    """Reads the back-off from a 429 response (Retry-After header or RIT 'wait' field)."""
+    header = response.headers.get("retry-after")
+    if header is not None:
+        try:
+            return max(float(header), 0.0)
+        except ValueError:
+            pass
+    try:
+        wait = response.json().get("wait")
+        if wait is not None:
+            return max(float(wait), 0.0)
+    except Exception:
+        pass
+    return default
+
+
+class TokenBucketScheduler:
+    """Async token bucket that releases waiting requests in priority order.
+
+    Tokens refill at `rate` per second up to `burst`. Callers that cannot get a
+    token immediately queue up and are woken by priority, then arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _can_release(self, now: float) -> bool:
+        return self._tokens >= 1 and now >= self._paused_until
+
+    async def acquire(self, priority: int = MARKET_DATA_PRIORITY):
+        """Waits until a token is available for a request of this priority."""
+        now = time.monotonic()
+        self._refill(now)
+        if not self._waiters and self._can_release(now):
+            self._tokens -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._schedule_wakeup()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Token was handed over just before cancellation, give it back
+                self._tokens += 1
+            raise
+
+    def pause(self, seconds: float):
+        """Stops releasing tokens for `seconds`, e.g. after the server answers 429."""
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+        self._updated = now
+        if self._waiters:
+            self._reschedule_wakeup()
+
+    def _dispatch(self):
+        self._wakeup = None
+        now = time.monotonic()
+        self._refill(now)
+        while self._waiters and self._can_release(now):
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+        if self._waiters:
+            self._schedule_wakeup()
+
+    def _reschedule_wakeup(self):
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        self._schedule_wakeup()
+
+    def _schedule_wakeup(self):
+        if self._wakeup is not None:
+            return
+        now = time.monotonic()
+        delay = max(
+            self._paused_until - now,
+            (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0,
+            0.0,
+        )
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
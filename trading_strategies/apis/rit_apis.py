@@ -4,27 +4,32 @@ from fastapi import Depends, FastAPI, HTTPException
 
 from trading_strategies.apis.api_utility import (
     accept_tender,
+    bulk_cancel,
     fetch_active_tenders,
+    fetch_case,
+    fetch_news,
     fetch_order_book,
     fetch_securities,
+    fetch_security_history,
+    fetch_time_and_sales,
     get_auth_config,
     post_order,
     query_api,
 )
+from trading_strategies.apis.session import session_lifespan
 from trading_strategies.logger_config import setup_logger
 from trading_strategies.models.custom_models import AuthConfig
 
 # Configure logging
 logger = setup_logger(__name__)
 
-app = FastAPI()
+app = FastAPI(lifespan=session_lifespan)
 
 
 @app.get("/case")
 async def get_case_status(auth: AuthConfig = Depends(get_auth_config)):
     """Fetches the case status by querying the case API."""
-    endpoint = "/v1/case"
-    return await query_api("get", endpoint, auth)
+    return await fetch_case(auth)
 
 
 @app.get("/trader")
@@ -48,17 +53,7 @@ async def get_recent_news(
     auth: AuthConfig = Depends(get_auth_config),
 ):
     """Fetches recent news by querying the news API."""
-    params = (
-        {
-            "limit": limit,
-            "after": after,
-        }
-        if limit or after
-        else {}
-    )
-
-    endpoint = "/v1/news"
-    return await query_api("get", endpoint, auth, params=params)
+    return await fetch_news(auth, after=after, limit=limit)
 
 
 @app.get("/assets")
@@ -112,16 +107,7 @@ async def get_security_history(
     """Gets the OHLC history for a security."""
     if not ticker:
         raise HTTPException(status_code=400, detail="Ticker parameter is required.")
-
-    endpoint = "/v1/securities/history"
-    params = {"ticker": ticker}
-
-    if period is not None:
-        params["period"] = period
-    if limit is not None:
-        params["limit"] = limit
-
-    return await query_api("get", endpoint, auth, params=params)
+    return await fetch_security_history(auth, ticker, period, limit)
 
 
 @app.get("/securities/tas")
@@ -133,14 +119,7 @@ async def get_time_and_sales(
     auth: AuthConfig = Depends(get_auth_config),  # Optional parameter
 ):
     """Gets time & sales history for a security."""
-    endpoint = "/v1/securities/tas"
-    params = {"ticker": ticker}
-    if after is not None:
-        params["after"] = after
-    if period is not None:
-        params["period"] = period
-    params["limit"] = limit  # default is 20, but can be overridden
-    return await query_api("get", endpoint, auth, params=params)
+    return await fetch_time_and_sales(auth, ticker, after, period, limit)
 
 
 @app.get("/orders")
@@ -305,18 +284,4 @@ async def bulk_cancel_orders(
     auth: AuthConfig = Depends(get_auth_config),
 ):
     """Bulk cancel open orders."""
-    endpoint = "/v1/commands/cancel"
-    params = {}
-    if all is not None:
-        params["all"] = all
-    elif ticker is not None:
-        params["ticker"] = ticker
-    elif ids is not None:
-        params["ids"] = ids
-    else:
-        raise HTTPException(
-            status_code=400,
-            detail="One of 'all', 'ticker', or 'ids' must be specified.",
-        )
-
-    return await query_api("post", endpoint, auth, params=params)
+    return await bulk_cancel(auth, all=all, ticker=ticker, ids=ids)
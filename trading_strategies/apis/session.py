@@ -0,0 +1,195 @@
+import asyncio
+import base64
+import importlib.util
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from trading_strategies.apis.market_cache import MarketSnapshotCache
+from trading_strategies.apis.metrics import REQUEST_METRICS
+from trading_strategies.apis.order_store import OrderStore
+from trading_strategies.apis.position_ledger import PositionLedger
+from trading_strategies.apis.rate_limiter import (
+    TokenBucketScheduler,
+    request_priority,
+    retry_after_seconds,
+)
+from trading_strategies.logger_config import setup_logger
+from trading_strategies.models.custom_models import AuthConfig, SessionConfig
+
+# Configure logging
+logger = setup_logger(__name__)
+
+# One session per (account, event loop); httpx clients cannot be shared across loops
+_sessions: Dict[Tuple[Any, ...], "RITSession"] = {}
+_session_config: Optional[SessionConfig] = None
+
+
+def get_session_config() -> SessionConfig:
+    """Returns the active session config, reading overrides from environment on first use."""
+    global _session_config
+    if _session_config is None:
+        _session_config = SessionConfig(
+            max_connections=int(os.getenv("RIT_MAX_CONNECTIONS", 20)),
+            max_keepalive_connections=int(os.getenv("RIT_MAX_KEEPALIVE", 10)),
+            keepalive_expiry=float(os.getenv("RIT_KEEPALIVE_EXPIRY", 30.0)),
+            timeout=float(os.getenv("RIT_TIMEOUT", 5.0)),
+            connect_timeout=float(os.getenv("RIT_CONNECT_TIMEOUT", 2.0)),
+            http2=os.getenv("RIT_HTTP2", "false").lower() in ("1", "true", "yes"),
+            rate_limit=float(os.getenv("RIT_RATE_LIMIT", 20.0)),
+            burst=int(os.getenv("RIT_BURST", 5)),
+            max_rate_limit_retries=int(os.getenv("RIT_MAX_429_RETRIES", 5)),
+            tick_duration=float(os.getenv("RIT_TICK_DURATION", 1.0)),
+        )
+    return _session_config
+
+
+def configure_sessions(config: SessionConfig):
+    """Sets the config used for sessions created from now on."""
+    global _session_config
+    _session_config = config
+
+
+class RITSession:
+    """Long-lived keep-alive HTTP session bound to one RIT account and event loop."""
+
+    def __init__(self, auth: AuthConfig, config: SessionConfig):
+        auth_str = f"{auth.username}:{auth.password}"
+        encoded_auth = base64.b64encode(auth_str.encode()).decode()
+        http2 = config.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+            http2 = False
+        self.auth = auth
+        self.config = config
+        self.client = httpx.AsyncClient(
+            base_url=f"http://{auth.server}:{auth.port}",
+            headers={
+                "accept": "application/json",
+                "authorization": f"Basic {encoded_auth}",
+            },
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+            http2=http2,
+        )
+        self.scheduler = TokenBucketScheduler(config.rate_limit, config.burst)
+        # Shared tasks for GETs in flight, keyed by (endpoint, params), see query_api
+        self.inflight_gets: Dict[Tuple[Any, ...], asyncio.Future] = {}
+        self.snapshot_cache = MarketSnapshotCache(config.tick_duration)
+        self.position_ledger = PositionLedger()
+        self.order_store = OrderStore()
+
+    async def request(
+        self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> httpx.Response:
+        """Sends a request over the pooled connections within the rate limit.
+        A 429 pauses the whole scheduler for the advertised wait and is retried.
+        """
+        priority = request_priority(method, endpoint)
+        metrics_key = REQUEST_METRICS.key(method, endpoint)
+        attempt = 0
+        while True:
+            queued_at = time.perf_counter()
+            await self.scheduler.acquire(priority)
+            sent_at = time.perf_counter()
+            REQUEST_METRICS.waited(metrics_key, sent_at - queued_at)
+            REQUEST_METRICS.started(metrics_key)
+            try:
+                response = await self.client.request(
+                    method.upper(), endpoint, params=params
+                )
+            except httpx.HTTPError as e:
+                REQUEST_METRICS.finished(
+                    metrics_key, time.perf_counter() - sent_at, type(e).__name__
+                )
+                raise
+            except BaseException:
+                # Cancelled: keep the in-flight gauge honest without counting an error
+                REQUEST_METRICS.finished(metrics_key, time.perf_counter() - sent_at)
+                raise
+            REQUEST_METRICS.finished(
+                metrics_key,
+                time.perf_counter() - sent_at,
+                str(response.status_code) if response.status_code >= 400 else None,
+            )
+            if (
+                response.status_code != 429
+                or attempt >= self.config.max_rate_limit_retries
+            ):
+                return response
+            wait = retry_after_seconds(response)
+            logger.warning(
+                f"Rate limited on {method.upper()} {endpoint}, waiting {wait}s"
+            )
+            self.scheduler.pause(wait)
+            attempt += 1
+
+    @property
+    def closed(self) -> bool:
+        return self.client.is_closed
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+def _session_key(auth: AuthConfig, loop: asyncio.AbstractEventLoop):
+    return (auth.server, str(auth.port), auth.username, auth.password, loop)
+
+
+def _prune_dead_sessions():
+    """Drops sessions whose event loop has been closed."""
+    for key in [key for key in _sessions if key[-1].is_closed()]:
+        del _sessions[key]
+
+
+def get_session(auth: AuthConfig) -> RITSession:
+    """Returns the session for this account on the running loop, creating it if needed."""
+    loop = asyncio.get_running_loop()
+    key = _session_key(auth, loop)
+    session = _sessions.get(key)
+    if session is None or session.closed:
+        _prune_dead_sessions()
+        session = RITSession(auth, get_session_config())
+        _sessions[key] = session
+    return session
+
+
+async def open_session(auth: AuthConfig, warm_up: bool = True) -> RITSession:
+    """Startup hook: creates the session and optionally opens a connection up front."""
+    session = get_session(auth)
+    if warm_up:
+        try:
+            await session.request("get", "/v1/case")
+        except httpx.HTTPError as e:
+            logger.warning(
+                f"Unable to warm up session to {session.client.base_url}: {e}"
+            )
+    return session
+
+
+async def close_session(auth: AuthConfig):
+    """Shutdown hook: closes this account's session on the running loop."""
+    session = _sessions.pop(_session_key(auth, asyncio.get_running_loop()), None)
+    if session is not None:
+        await session.aclose()
+
+
+async def close_all_sessions():
+    """Shutdown hook: closes every session owned by the running loop."""
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _sessions if key[-1] is loop]:
+        await _sessions.pop(key).aclose()
+
+
+@asynccontextmanager
+async def session_lifespan(_app):
+    """FastAPI lifespan that closes pooled sessions on shutdown."""
+    yield
+    await close_all_sessions()
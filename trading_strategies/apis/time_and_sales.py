@@ -0,0 +1,190 @@
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from trading_strategies.apis.api_utility import fetch_time_and_sales
+from trading_strategies.logger_config import setup_logger
+from trading_strategies.models.custom_models import AuthConfig
+
+logger = setup_logger(__name__)
+
+
+class TimeAndSalesBuffer:
+    """Fixed-capacity ring of prints (price, quantity, tick) in preallocated
+    NumPy arrays, with running sums so VWAP, volume and trade-rate queries are
+    O(1). Session totals cover every print appended since the last reset; the
+    rolling window covers prints from the last `window_ticks` ticks that are
+    still in the ring.
+    """
+
+    def __init__(self, capacity: int = 4096, window_ticks: int = 30):
+        self.capacity = capacity
+        self.window_ticks = window_ticks
+        self.prices = np.zeros(capacity)
+        self.quantities = np.zeros(capacity)
+        self.ticks = np.zeros(capacity, dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        self._count = 0  # prints ever appended; print n lives in slot n % capacity
+        self._window_start = 0  # first print still inside the rolling window
+        self.last_tick: Optional[int] = None
+        self.last_price: Optional[float] = None
+        self.total_volume = 0.0
+        self.total_notional = 0.0
+        self.window_volume = 0.0
+        self.window_notional = 0.0
+        self.window_prints = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def append(self, price: float, quantity: float, tick: int):
+        if self._count >= self.capacity:
+            # The slot about to be overwritten may still be inside the window
+            oldest = self._count - self.capacity
+            if oldest >= self._window_start:
+                self._leave_window(oldest)
+                self._window_start = oldest + 1
+        slot = self._count % self.capacity
+        self.prices[slot] = price
+        self.quantities[slot] = quantity
+        self.ticks[slot] = tick
+        self._count += 1
+
+        notional = price * quantity
+        self.total_volume += quantity
+        self.total_notional += notional
+        self.window_volume += quantity
+        self.window_notional += notional
+        self.window_prints += 1
+        self.last_price = price
+        if self.last_tick is None or tick > self.last_tick:
+            self.last_tick = tick
+            self._expire()
+
+    def extend(self, prints: Iterable[Dict[str, Any]]):
+        """Appends RIT time & sales prints, oldest first."""
+        for item in prints:
+            self.append(item["price"], item["quantity"], item["tick"])
+
+    def _leave_window(self, index: int):
+        slot = index % self.capacity
+        quantity = self.quantities[slot]
+        self.window_volume -= quantity
+        self.window_notional -= self.prices[slot] * quantity
+        self.window_prints -= 1
+
+    def _expire(self):
+        cutoff = self.last_tick - self.window_ticks
+        while (
+            self._window_start < self._count
+            and self.ticks[self._window_start % self.capacity] <= cutoff
+        ):
+            self._leave_window(self._window_start)
+            self._window_start += 1
+
+    @property
+    def vwap(self) -> float:
+        """Session VWAP, NaN before the first print."""
+        if not self.total_volume:
+            return float("nan")
+        return self.total_notional / self.total_volume
+
+    @property
+    def window_vwap(self) -> float:
+        """VWAP of the rolling window, NaN if it holds no prints."""
+        if self.window_volume <= 0:
+            return float("nan")
+        return self.window_notional / self.window_volume
+
+    @property
+    def trade_rate(self) -> float:
+        """Prints per tick over the rolling window."""
+        return self.window_prints / self.window_ticks
+
+    @property
+    def volume_rate(self) -> float:
+        """Shares traded per tick over the rolling window."""
+        return self.window_volume / self.window_ticks
+
+    def recent(self, n: Optional[int] = None) -> np.ndarray:
+        """Returns a (n, 3) array of the last n prints as price, quantity, tick,
+        oldest first.
+        """
+        n = len(self) if n is None else min(n, len(self))
+        slots = np.arange(self._count - n, self._count) % self.capacity
+        return np.column_stack(
+            (self.prices[slots], self.quantities[slots], self.ticks[slots])
+        )
+
+
+class TimeAndSalesStreamer:
+    """Pulls new time & sales prints per ticker with the `after` cursor and
+    feeds them into one TimeAndSalesBuffer per ticker. Run `run()` as a
+    background task, or call `poll()` from an existing loop.
+    """
+
+    def __init__(
+        self,
+        auth: AuthConfig,
+        tickers: List[str],
+        capacity: int = 4096,
+        window_ticks: int = 30,
+        limit: int = 1000,
+    ):
+        self.auth = auth
+        self.limit = limit
+        self.buffers = {
+            ticker: TimeAndSalesBuffer(capacity, window_ticks) for ticker in tickers
+        }
+        self.last_ids: Dict[str, Optional[int]] = dict.fromkeys(tickers)
+        self.periods: Dict[str, Optional[int]] = dict.fromkeys(tickers)
+
+    async def poll_ticker(self, ticker: str) -> int:
+        """Fetches prints after the ticker's cursor; returns how many were new."""
+        last_id = self.last_ids[ticker]
+        prints = await fetch_time_and_sales(
+            self.auth, ticker, after=last_id, limit=self.limit
+        )
+        if not prints:
+            return 0
+        if len(prints) >= self.limit and last_id is not None:
+            # RIT counts the limit back from the newest print
+            logger.warning(f"{ticker} time & sales page full, prints may be missed")
+        prints = sorted(prints, key=lambda item: item["id"])
+        self.last_ids[ticker] = prints[-1]["id"]
+        buffer = self.buffers[ticker]
+        for item in prints:
+            period = item.get("period")
+            if period != self.periods[ticker]:
+                # Ticks restart every period
+                self.periods[ticker] = period
+                buffer.reset()
+            buffer.append(item["price"], item["quantity"], item["tick"])
+        return len(prints)
+
+    async def poll(self) -> int:
+        counts = await asyncio.gather(*(self.poll_ticker(t) for t in self.buffers))
+        return sum(counts)
+
+    async def run(self, interval: float = 0.25):
+        """Polls forever; errors are logged and retried on the next interval."""
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.error(f"An error occurred while polling time & sales: {e}")
+            await asyncio.sleep(interval)
+
+    def global_vwap(self, tickers: Optional[Iterable[str]] = None) -> float:
+        """VWAP across tickers (all by default), NaN before any print."""
+        buffers = [self.buffers[t] for t in (tickers or self.buffers)]
+        volume = sum(b.total_volume for b in buffers)
+        if not volume:
+            return float("nan")
+        return sum(b.total_notional for b in buffers) / volume
+
+    def global_volume(self, tickers: Optional[Iterable[str]] = None) -> float:
+        return sum(self.buffers[t].total_volume for t in (tickers or self.buffers))
@@ -0,0 +1,178 @@
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from trading_strategies.models.market_depth import BookSide
+
+
+class ConsolidatedSide(BookSide):
+    """One side of a multi-venue book, best first, with each level attributed
+    to its venue. Iterating yields (price, volume, cumulative volume, VWAP,
+    venue) tuples.
+    """
+
+    __slots__ = ("venues", "venue_names")
+
+    def __init__(
+        self,
+        prices: np.ndarray,
+        quantities: np.ndarray,
+        venues: np.ndarray,
+        venue_names: Sequence[str],
+    ):
+        super().__init__(prices, quantities)
+        self.venues = venues  # index into venue_names per level
+        self.venue_names = list(venue_names)
+
+    def __iter__(self) -> Iterator[Tuple[float, float, float, float, str]]:
+        names = self.venue_names
+        return zip(
+            self.prices.tolist(),
+            self.quantities.tolist(),
+            self.cumulative.tolist(),
+            self.vwap.tolist(),
+            (names[venue] for venue in self.venues.tolist()),
+        )
+
+    def aggregated(self) -> "AggregatedSide":
+        """Collapses levels at the same price, keeping each venue's share."""
+        names = self.venue_names
+        if not len(self):
+            empty = np.empty(0)
+            return AggregatedSide(empty, empty, np.zeros((0, len(names))), names)
+        new_level = np.empty(len(self), dtype=bool)
+        new_level[0] = True
+        np.not_equal(self.prices[1:], self.prices[:-1], out=new_level[1:])
+        starts = np.flatnonzero(new_level)
+        cells = (np.cumsum(new_level) - 1) * len(names) + self.venues
+        venue_quantities = np.bincount(
+            cells, weights=self.quantities, minlength=len(starts) * len(names)
+        ).reshape(len(starts), len(names))
+        return AggregatedSide(
+            self.prices[starts],
+            np.add.reduceat(self.quantities, starts),
+            venue_quantities,
+            names,
+        )
+
+
+class AggregatedSide(BookSide):
+    """One side of a multi-venue book with one level per price.
+    `venue_quantities[level, venue]` is the size each venue shows at that level.
+    """
+
+    __slots__ = ("venue_quantities", "venue_names")
+
+    def __init__(
+        self,
+        prices: np.ndarray,
+        quantities: np.ndarray,
+        venue_quantities: np.ndarray,
+        venue_names: Sequence[str] = (),
+    ):
+        super().__init__(prices, quantities)
+        self.venue_quantities = venue_quantities
+        self.venue_names = list(venue_names)
+
+
+class ConsolidatedBook(NamedTuple):
+    bids: BookSide
+    asks: BookSide
+
+
+def merge_sides(
+    sides: Sequence[BookSide], venue_names: Sequence[str], descending: bool
+) -> ConsolidatedSide:
+    """Merges per-venue sides that are each already sorted best first.
+    A stable sort of the concatenation only has to merge the sorted runs, and
+    at equal prices the earlier venue in `venue_names` comes first.
+    """
+    if not sides:
+        return ConsolidatedSide(np.empty(0), np.empty(0), np.empty(0, int), [])
+    prices = np.concatenate([side.prices for side in sides])
+    quantities = np.concatenate([side.quantities for side in sides])
+    venues = np.repeat(np.arange(len(sides)), [len(side) for side in sides])
+    order = np.argsort(-prices if descending else prices, kind="stable")
+    return ConsolidatedSide(
+        prices[order], quantities[order], venues[order], venue_names
+    )
+
+
+def consolidate(depths: Mapping[str, Tuple[BookSide, BookSide]]) -> ConsolidatedBook:
+    """Builds the consolidated book of several venues from their (bids, asks)."""
+    venue_names = list(depths)
+    return ConsolidatedBook(
+        merge_sides([depths[v][0] for v in venue_names], venue_names, True),
+        merge_sides([depths[v][1] for v in venue_names], venue_names, False),
+    )
+
+
+def aggregate(book: ConsolidatedBook) -> ConsolidatedBook:
+    """Collapses a consolidated book to one level per price on each side."""
+    return ConsolidatedBook(book.bids.aggregated(), book.asks.aggregated())
+
+
+class VenueSplit(NamedTuple):
+    quantities: Dict[str, int]  # shares to send per venue, only venues with any
+    vwap: float  # expected VWAP of the whole split, NaN when nothing is taken
+    limits: Dict[str, float]  # worst price the split takes on each venue
+
+    @property
+    def total(self) -> int:
+        return sum(self.quantities.values())
+
+
+def split_across_venues(
+    side: ConsolidatedSide,
+    quantity: int,
+    descending: bool,
+    limit_price: Optional[float] = None,
+) -> VenueSplit:
+    """Cheapest way to trade `quantity` against a consolidated side.
+
+    The side is sorted best first across venues, so taking levels in order
+    until the quantity is covered minimises cost; each venue gets the sum of
+    its levels that were taken, and the price of the last of them is the
+    venue's limit. Levels beyond `limit_price` (below it on `descending` bids,
+    above it on asks) are left alone, so the split may be short of `quantity`.
+    """
+    quantities = side.quantities
+    if limit_price is not None:
+        allowed = (
+            side.prices >= limit_price if descending else side.prices <= limit_price
+        )
+        quantities = np.where(allowed, quantities, 0.0)
+    before = np.cumsum(quantities) - quantities
+    taken = np.clip(quantity - before, 0, quantities)
+    per_venue = np.bincount(
+        side.venues, weights=taken, minlength=len(side.venue_names)
+    ).astype(np.int64)
+    total = taken.sum()
+    vwap = float(side.prices @ taken / total) if total else float("nan")
+    split = {
+        name: int(q) for name, q in zip(side.venue_names, per_venue.tolist()) if q > 0
+    }
+    used = np.flatnonzero(taken)
+    # Levels are best first, so each venue's last taken level is its worst
+    limits = {
+        side.venue_names[venue]: price
+        for venue, price in zip(side.venues[used].tolist(), side.prices[used].tolist())
+    }
+    return VenueSplit(split, vwap, limits)
+
+
+def group_venues(tickers: Sequence[str]) -> Dict[str, List[str]]:
+    """Groups venue tickers by symbol, e.g. CRZY_A and CRZY_M under CRZY."""
+    groups: Dict[str, List[str]] = {}
+    for ticker in tickers:
+        groups.setdefault(ticker.rsplit("_", 1)[0], []).append(ticker)
+    return groups
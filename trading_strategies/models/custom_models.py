@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -14,3 +16,74 @@ class AuthConfig(BaseModel):
 
     def __getitem__(self, item):
         return getattr(self, item)
+
+
+class SessionConfig(BaseModel):
+    """
+    Connection pool, timeout and protocol settings for the RIT HTTP session.
+    Defaults can be overridden from env file, see session.get_session_config.
+    """
+
+    max_connections: int = Field(20, title="Max Pooled Connections")
+    max_keepalive_connections: int = Field(10, title="Max Idle Keep-Alive Connections")
+    keepalive_expiry: float = Field(30.0, title="Idle Connection Expiry (s)")
+    timeout: float = Field(5.0, title="Request Timeout (s)")
+    connect_timeout: float = Field(2.0, title="Connect Timeout (s)")
+    http2: bool = Field(False, title="Use HTTP/2 (requires h2)")
+    rate_limit: float = Field(20.0, title="Requests Per Second")
+    burst: int = Field(5, title="Request Burst Size")
+    max_rate_limit_retries: int = Field(5, title="Retries On HTTP 429")
+    tick_duration: float = Field(1.0, title="Case Tick Length (s)")
+
+
+class MarketDataConfig(BaseModel):
+    """
+    Polling cadence of each market-data stream, in seconds; 0 disables a stream.
+    Defaults can be overridden from env file, see market_data.get_market_data_config.
+    """
+
+    case_interval: float = Field(0.2, title="Case Poll Interval (s)")
+    securities_interval: float = Field(0.25, title="Securities Poll Interval (s)")
+    tenders_interval: float = Field(0.25, title="Tenders Poll Interval (s)")
+    books_interval: float = Field(0.25, title="Order Book Poll Interval (s)")
+    news_interval: float = Field(0.5, title="News Poll Interval (s)")
+    book_depth: int = Field(20, title="Order Book Levels Per Side")
+
+
+class SimSecurityConfig(BaseModel):
+    """Represents one security listed on the local RIT simulator."""
+
+    ticker: str = Field(..., title="Ticker")
+    type: str = Field("STOCK", title="Security Type")
+    start_price: float = Field(25.0, title="Initial Fair Value")
+    volatility: float = Field(0.02, title="Fair Value Std Dev Per Tick")
+    spread: float = Field(0.02, title="Market Maker Quoted Spread")
+    level_spacing: float = Field(0.01, title="Price Gap Between Book Levels")
+    depth_levels: int = Field(20, title="Market Maker Levels Per Side")
+    level_size: int = Field(5000, title="Average Market Maker Size Per Level")
+    noise_trade_size: int = Field(2000, title="Average Noise Trade Size")
+
+
+class SimulatorConfig(BaseModel):
+    """
+    Represents a case run by the local RIT simulator.
+    See trading_strategies.simulator.exchange.CASE_PRESETS for ready-made cases.
+    """
+
+    case_name: str = Field("LOCAL", title="Case Name")
+    securities: list[SimSecurityConfig] = Field(..., title="Listed Securities")
+    ticks_per_period: int = Field(300, title="Ticks Per Period")
+    total_periods: int = Field(1, title="Number Of Periods")
+    tick_duration: float = Field(1.0, title="Seconds Per Tick, 0 For Manual Stepping")
+    noise_trade_probability: float = Field(0.5, title="Noise Trade Chance Per Tick")
+    tender_probability: float = Field(0.05, title="Tender Chance Per Tick")
+    tender_min_quantity: int = Field(10000, title="Min Tender Quantity")
+    tender_max_quantity: int = Field(60000, title="Max Tender Quantity")
+    tender_premium: float = Field(0.15, title="Average Tender Edge Versus Fair")
+    tender_expiry_ticks: int = Field(30, title="Ticks Until A Tender Expires")
+    news_interval_ticks: int = Field(0, title="Ticks Between News, 0 Disables")
+    net_limit: int = Field(100000, title="Net Position Limit")
+    gross_limit: int = Field(250000, title="Gross Position Limit")
+    starting_cash: float = Field(0.0, title="Cash Balance Of New Traders")
+    rate_limit: float = Field(0.0, title="Requests Per Second Per Trader, 0 Disables")
+    seed: Optional[int] = Field(None, title="Random Seed")
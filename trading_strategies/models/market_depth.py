@@ -0,0 +1,201 @@
+from typing import Iterator, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from trading_strategies.models.rit_records import OrderBookRecord
+
+
+def _running_vwap(cumulative: np.ndarray, notional: np.ndarray) -> np.ndarray:
+    """notional / cumulative per level, NaN where nothing has accumulated yet."""
+    vwap = np.full(cumulative.shape, np.nan)
+    np.divide(notional, cumulative, out=vwap, where=cumulative > 0)
+    return vwap
+
+
+class BookSide:
+    """One side of an order book as NumPy columns, best level first.
+
+    Cumulative quantity and the running VWAP through each level come from
+    cumulative sums, so building a side is O(n) and queries such as the VWAP
+    to fill N shares are a binary search. Iterating yields the
+    (price, volume, cumulative volume, VWAP) tuples the display code uses.
+    """
+
+    __slots__ = ("prices", "quantities", "cumulative", "notional", "vwap")
+
+    def __init__(self, prices: np.ndarray, quantities: np.ndarray):
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.quantities = np.asarray(quantities, dtype=np.float64)
+        self.cumulative = np.cumsum(self.quantities)
+        self.notional = np.cumsum(self.prices * self.quantities)
+        self.vwap = _running_vwap(self.cumulative, self.notional)
+
+    @classmethod
+    def empty(cls) -> "BookSide":
+        return cls(np.empty(0), np.empty(0))
+
+    def first_change(self, prices: np.ndarray, quantities: np.ndarray) -> int:
+        """Index of the first level where the given columns differ from this
+        side. Equals len(self) == len(prices) when nothing changed.
+        """
+        common = min(len(self), len(prices))
+        differs = (self.prices[:common] != prices[:common]) | (
+            self.quantities[:common] != quantities[:common]
+        )
+        changed = np.flatnonzero(differs)
+        return int(changed[0]) if len(changed) else common
+
+    def updated(
+        self, prices: np.ndarray, quantities: np.ndarray, start: int
+    ) -> "BookSide":
+        """Returns the side for new columns whose levels above `start` equal this
+        side's, copying those cumulative columns and summing only from `start`.
+        """
+        side = BookSide.__new__(BookSide)
+        side.prices = np.asarray(prices, dtype=np.float64)
+        side.quantities = np.asarray(quantities, dtype=np.float64)
+        tail_prices, tail_quantities = side.prices[start:], side.quantities[start:]
+        base_volume = self.cumulative[start - 1] if start else 0.0
+        base_notional = self.notional[start - 1] if start else 0.0
+        side.cumulative = np.concatenate(
+            (self.cumulative[:start], base_volume + np.cumsum(tail_quantities))
+        )
+        side.notional = np.concatenate(
+            (
+                self.notional[:start],
+                base_notional + np.cumsum(tail_prices * tail_quantities),
+            )
+        )
+        side.vwap = np.concatenate(
+            (
+                self.vwap[:start],
+                _running_vwap(side.cumulative[start:], side.notional[start:]),
+            )
+        )
+        return side
+
+    def head(self, levels: int) -> "BookSide":
+        """The best `levels` levels; the cumulative columns are prefix sums, so
+        they are sliced rather than recomputed.
+        """
+        if len(self) <= levels:
+            return self
+        side = BookSide.__new__(BookSide)
+        for column in BookSide.__slots__:
+            setattr(side, column, getattr(self, column)[:levels])
+        return side
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __getitem__(self, level: int) -> Tuple[float, float, float, float]:
+        return (
+            float(self.prices[level]),
+            float(self.quantities[level]),
+            float(self.cumulative[level]),
+            float(self.vwap[level]),
+        )
+
+    def __iter__(self) -> Iterator[Tuple[float, float, float, float]]:
+        return zip(
+            self.prices.tolist(),
+            self.quantities.tolist(),
+            self.cumulative.tolist(),
+            self.vwap.tolist(),
+        )
+
+    def __repr__(self) -> str:
+        return f"BookSide(levels={len(self)}, volume={self.total_volume:g})"
+
+    @property
+    def total_volume(self) -> float:
+        return float(self.cumulative[-1]) if len(self) else 0.0
+
+    def level_for(self, quantity: Union[float, np.ndarray]) -> Union[int, np.ndarray]:
+        """Index of the level at which `quantity` shares are filled, or
+        len(self) when the visible depth is not enough.
+        """
+        return np.searchsorted(self.cumulative, quantity, side="left")
+
+    def vwap_to_fill(
+        self, quantity: Union[float, np.ndarray]
+    ) -> Union[float, np.ndarray]:
+        """Average price of walking the book for `quantity` shares, taking only
+        part of the last level needed. NaN when the visible depth is not enough.
+        Accepts a scalar or an array of quantities.
+        """
+        quantity = np.asarray(quantity, dtype=np.float64)
+        levels = self.level_for(quantity)
+        filled = levels < len(self)
+        safe = np.minimum(levels, max(len(self) - 1, 0))
+        if len(self):
+            before_volume = np.where(safe > 0, self.cumulative[safe - 1], 0.0)
+            before_notional = np.where(safe > 0, self.notional[safe - 1], 0.0)
+            notional = before_notional + (quantity - before_volume) * self.prices[safe]
+        else:
+            notional = np.zeros_like(quantity)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vwap = np.where(filled & (quantity > 0), notional / quantity, np.nan)
+        return float(vwap) if vwap.ndim == 0 else vwap
+
+
+def walk_books(
+    sides: Sequence[BookSide],
+    quantities: np.ndarray,
+    impacts: Union[float, np.ndarray] = 0.0,
+) -> np.ndarray:
+    """VWAP of filling quantities[i] shares against sides[i], for all rows at once.
+
+    Shares within the visible depth cost what BookSide.vwap_to_fill charges.
+    Shares beyond it are extrapolated from the last visible price, which moves
+    by impacts[i] per extra share (positive walking asks, negative walking
+    bids), so thin books cost more instead of looking like the top of book.
+    NaN for an empty side or a non-positive quantity.
+    """
+    quantities = np.asarray(quantities, dtype=np.float64)
+    count = len(sides)
+    lengths = np.fromiter((len(side) for side in sides), np.intp, count)
+    if not lengths.any():
+        return np.full(count, np.nan)
+    totals = np.fromiter((side.total_volume for side in sides), np.float64, count)
+    # Offsetting each side's cumulative volume by the volume of the sides before
+    # it makes the concatenation sorted, so one searchsorted walks every book
+    base = np.cumsum(totals) - totals
+    ends = np.cumsum(lengths)
+    cumulative = np.concatenate([side.cumulative for side in sides])
+    cumulative += np.repeat(base, lengths)
+    notional = np.concatenate([side.notional for side in sides])
+    prices = np.concatenate([side.prices for side in sides])
+
+    visible = np.minimum(quantities, totals)
+    level = np.searchsorted(cumulative, base + visible, side="left")
+    level = np.minimum(level, len(prices) - 1)
+    inside = level > ends - lengths  # the fill goes past the row's first level
+    before_volume = np.where(inside, cumulative[level - 1] - base, 0.0)
+    before_notional = np.where(inside, notional[level - 1], 0.0)
+    price = prices[level]
+    excess = quantities - visible
+    cost = (
+        before_notional
+        + (visible - before_volume) * price
+        + excess * (price + impacts * excess / 2)
+    )
+    vwap = np.full(count, np.nan)
+    np.divide(cost, quantities, out=vwap, where=(lengths > 0) & (quantities > 0))
+    return vwap
+
+
+class MarketDepth(NamedTuple):
+    """Bid and ask sides of one ticker's book."""
+
+    bids: BookSide
+    asks: BookSide
+
+    @classmethod
+    def from_record(
+        cls, record: OrderBookRecord, depth: Optional[int] = None
+    ) -> "MarketDepth":
+        return cls(
+            BookSide(record.bid_prices[:depth], record.bid_quantities[:depth]),
+            BookSide(record.ask_prices[:depth], record.ask_quantities[:depth]),
+        )
@@ -32,14 +32,14 @@ class Order(BaseModel):
     tick: conint(ge=0)  # Example: 10
     trader_id: constr(min_length=1)  # Example: trader49
     ticker: constr(min_length=1)  # Example: CRZY
-    type: constr(regex="^(MARKET|LIMIT)$")  # Enum: [ MARKET, LIMIT ]
+    type: constr(pattern="^(MARKET|LIMIT)$")  # Enum: [ MARKET, LIMIT ]
     quantity: conint(ge=0)  # Example: 100
-    action: constr(regex="^(BUY|SELL)$")  # Enum: [ BUY, SELL ]
+    action: constr(pattern="^(BUY|SELL)$")  # Enum: [ BUY, SELL ]
     price: Optional[float]  # Example: 14.21, Will be null if type is LIMIT
     quantity_filled: conint(ge=0)  # Example: 10
     vwap: Optional[float]  # Example: 14.21, null if quantity_filled is 0
     status: constr(
-        regex="^(OPEN|TRANSACTED|CANCELLED)$"
+        pattern="^(OPEN|TRANSACTED|CANCELLED)$"
     )  # Enum: [ OPEN, TRANSACTED, CANCELLED ]
 
 
@@ -49,7 +49,7 @@ class AssetLease(BaseModel):
     id: conint(ge=0)  # Lease id.
     ticker: constr(min_length=1)  # Example: CL
     type: constr(
-        regex="^(CONTAINER|PIPELINE|SHIP|REFINERY|POWER_PLANT|PRODUCER)$"
+        pattern="^(CONTAINER|PIPELINE|SHIP|REFINERY|POWER_PLANT|PRODUCER)$"
     )  # Example: CONTAINER
     start_lease_period: conint(ge=0)
     start_lease_tick: conint(ge=0)
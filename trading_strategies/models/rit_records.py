@@ -0,0 +1,274 @@
+"""
+Compact typed records for hot RIT API responses.
+
+These are built straight from decoded JSON without validation, unlike the
+pydantic models in rit_models.py, and are meant for strategy loops that read
+the same few fields many times per second. Records keep dict-style access
+(record["position"]) so existing code keeps working while it moves to
+attribute access.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+class _Record:
+    """Base for slotted records built from RIT JSON objects."""
+
+    __slots__ = ()
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+    def get(self, item, default=None):
+        return getattr(self, item, default)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class SecurityRecord(_Record):
+    """Position and market summary for one security from /v1/securities."""
+
+    __slots__ = (
+        "ticker",
+        "position",
+        "last",
+        "bid",
+        "ask",
+        "bid_size",
+        "ask_size",
+        "volume",
+        "vwap",
+        "unrealized",
+        "realized",
+    )
+
+    def __init__(
+        self,
+        ticker: str,
+        position: float = 0,
+        last: float = 0.0,
+        bid: float = 0.0,
+        ask: float = 0.0,
+        bid_size: float = 0,
+        ask_size: float = 0,
+        volume: float = 0,
+        vwap: float = 0.0,
+        unrealized: float = 0.0,
+        realized: float = 0.0,
+    ):
+        self.ticker = ticker
+        self.position = position
+        self.last = last
+        self.bid = bid
+        self.ask = ask
+        self.bid_size = bid_size
+        self.ask_size = ask_size
+        self.volume = volume
+        self.vwap = vwap
+        self.unrealized = unrealized
+        self.realized = realized
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "SecurityRecord":
+        get = data.get
+        return cls(
+            data["ticker"],
+            get("position", 0),
+            get("last", 0.0),
+            get("bid", 0.0),
+            get("ask", 0.0),
+            get("bid_size", 0),
+            get("ask_size", 0),
+            get("volume", 0),
+            get("vwap", 0.0),
+            get("unrealized", 0.0),
+            get("realized", 0.0),
+        )
+
+
+class TenderRecord(_Record):
+    """An active tender offer from /v1/tenders."""
+
+    __slots__ = (
+        "tender_id",
+        "period",
+        "tick",
+        "expires",
+        "caption",
+        "ticker",
+        "quantity",
+        "action",
+        "is_fixed_bid",
+        "price",
+    )
+
+    def __init__(
+        self,
+        tender_id: int,
+        ticker: str,
+        quantity: int,
+        action: str,
+        price: Optional[float],
+        period: int = 0,
+        tick: int = 0,
+        expires: int = 0,
+        caption: str = "",
+        is_fixed_bid: bool = True,
+    ):
+        self.tender_id = tender_id
+        self.ticker = ticker
+        self.quantity = quantity
+        self.action = action
+        self.price = price
+        self.period = period
+        self.tick = tick
+        self.expires = expires
+        self.caption = caption
+        self.is_fixed_bid = is_fixed_bid
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "TenderRecord":
+        get = data.get
+        return cls(
+            data["tender_id"],
+            data["ticker"],
+            data["quantity"],
+            data["action"],
+            get("price"),
+            get("period", 0),
+            get("tick", 0),
+            get("expires", 0),
+            get("caption", ""),
+            get("is_fixed_bid", True),
+        )
+
+
+class OrderRecord(_Record):
+    """One of our orders from /v1/orders."""
+
+    __slots__ = (
+        "order_id",
+        "period",
+        "tick",
+        "trader_id",
+        "ticker",
+        "type",
+        "quantity",
+        "action",
+        "price",
+        "quantity_filled",
+        "vwap",
+        "status",
+    )
+
+    def __init__(
+        self,
+        order_id: int,
+        ticker: str,
+        type: str,
+        quantity: int,
+        action: str,
+        price: Optional[float] = None,
+        quantity_filled: int = 0,
+        vwap: Optional[float] = None,
+        status: str = "OPEN",
+        period: int = 0,
+        tick: int = 0,
+        trader_id: str = "",
+    ):
+        self.order_id = order_id
+        self.ticker = ticker
+        self.type = type
+        self.quantity = quantity
+        self.action = action
+        self.price = price
+        self.quantity_filled = quantity_filled
+        self.vwap = vwap
+        self.status = status
+        self.period = period
+        self.tick = tick
+        self.trader_id = trader_id
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "OrderRecord":
+        get = data.get
+        return cls(
+            data["order_id"],
+            data["ticker"],
+            get("type", "MARKET"),
+            data["quantity"],
+            data["action"],
+            get("price"),
+            get("quantity_filled", 0),
+            get("vwap"),
+            get("status", "OPEN"),
+            get("period", 0),
+            get("tick", 0),
+            get("trader_id", ""),
+        )
+
+
+class OrderBookRecord(_Record):
+    """Order book from /v1/securities/book held as price/quantity arrays.
+    Bids are sorted best (highest) first and asks best (lowest) first.
+    Quantities are what is still resting, i.e. quantity - quantity_filled.
+    """
+
+    __slots__ = (
+        "ticker",
+        "bid_prices",
+        "bid_quantities",
+        "ask_prices",
+        "ask_quantities",
+    )
+
+    def __init__(
+        self,
+        ticker: str,
+        bid_prices: np.ndarray,
+        bid_quantities: np.ndarray,
+        ask_prices: np.ndarray,
+        ask_quantities: np.ndarray,
+    ):
+        self.ticker = ticker
+        self.bid_prices = bid_prices
+        self.bid_quantities = bid_quantities
+        self.ask_prices = ask_prices
+        self.ask_quantities = ask_quantities
+
+    @staticmethod
+    def _levels(orders: List[Dict[str, Any]], descending: bool):
+        prices = np.fromiter((o["price"] for o in orders), np.float64, len(orders))
+        quantities = np.fromiter(
+            (o["quantity"] - (o.get("quantity_filled") or 0) for o in orders),
+            np.float64,
+            len(orders),
+        )
+        steps = np.diff(prices)
+        if (steps > 0).any() if descending else (steps < 0).any():
+            # Server normally sends books sorted, only re-sort when it did not
+            order = np.argsort(-prices if descending else prices, kind="stable")
+            prices, quantities = prices[order], quantities[order]
+        return prices, quantities
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any], ticker: str = "") -> "OrderBookRecord":
+        bid_prices, bid_quantities = cls._levels(data.get("bids") or [], True)
+        ask_prices, ask_quantities = cls._levels(data.get("asks") or [], False)
+        return cls(ticker, bid_prices, bid_quantities, ask_prices, ask_quantities)
+
+
+def decode_securities(data: List[Dict[str, Any]]) -> List[SecurityRecord]:
+    return [SecurityRecord.from_json(security) for security in data]
+
+
+def decode_tenders(data: List[Dict[str, Any]]) -> List[TenderRecord]:
+    return [TenderRecord.from_json(tender) for tender in data]
+
+
+def decode_orders(data: List[Dict[str, Any]]) -> List[OrderRecord]:
+    return [OrderRecord.from_json(order) for order in data]
@@ -0,0 +1,564 @@
+import asyncio
+import itertools
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+from trading_strategies.logger_config import setup_logger
+from trading_strategies.models.custom_models import (
+    SimSecurityConfig,
+    SimulatorConfig,
+)
+from trading_strategies.simulator.matching_engine import MatchingEngine, SimOrder, Trade
+
+logger = setup_logger(__name__)
+
+MARKET_MAKER = "MM"
+NOISE_TRADER = "NOISE"
+
+
+class SimulatorError(Exception):
+    """Rejected request, reported to clients as an RIT style 400 error."""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class TraderAccount:
+    """Positions, average cost and realized P&L of one trader."""
+
+    __slots__ = ("trader_id", "cash", "positions", "average_cost", "realized")
+
+    def __init__(self, trader_id: str, cash: float = 0.0):
+        self.trader_id = trader_id
+        self.cash = cash
+        self.positions: Dict[str, int] = {}
+        self.average_cost: Dict[str, float] = {}
+        self.realized: Dict[str, float] = {}
+
+    def apply_fill(self, ticker: str, action: str, quantity: int, price: float):
+        signed = quantity if action == "BUY" else -quantity
+        self.cash -= signed * price
+        position = self.positions.get(ticker, 0)
+        cost = self.average_cost.get(ticker, 0.0)
+        if position == 0 or (position > 0) == (signed > 0):
+            new_position = position + signed
+            cost = (cost * abs(position) + price * quantity) / abs(new_position)
+        else:
+            closed = min(abs(signed), abs(position))
+            direction = 1 if position > 0 else -1
+            self.realized[ticker] = (
+                self.realized.get(ticker, 0.0) + (price - cost) * closed * direction
+            )
+            new_position = position + signed
+            if new_position == 0:
+                cost = 0.0
+            elif (new_position > 0) != (position > 0):
+                cost = price  # Position flipped, remainder opened at this price
+        self.positions[ticker] = new_position
+        self.average_cost[ticker] = cost
+
+
+class SimulatedExchange:
+    """In-memory stand-in for the RIT case server.
+
+    Runs one MatchingEngine per security and advances a case clock. On every
+    tick a market maker re-quotes a ladder around a random-walk fair value,
+    noise traders cross the spread, tenders are offered and news is published.
+    Every other trader id is a client account trading through the /v1 API.
+    """
+
+    def __init__(
+        self,
+        config: SimulatorConfig,
+        news_factory: Optional[Callable[["SimulatedExchange"], Tuple[str, str]]] = None,
+    ):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.news_factory = news_factory or analyst_expectation_news
+        self.securities: Dict[str, SimSecurityConfig] = {
+            security.ticker: security for security in config.securities
+        }
+        self.engines = {ticker: MatchingEngine(ticker) for ticker in self.securities}
+        self.fair_values = {t: s.start_price for t, s in self.securities.items()}
+        self.last_prices = dict(self.fair_values)
+        self.volumes = {ticker: 0 for ticker in self.securities}
+        self.period = 1
+        self.tick = 0
+        self.status = "ACTIVE"
+        self.accounts: Dict[str, TraderAccount] = {}
+        self.orders: Dict[int, SimOrder] = {}
+        self.time_and_sales: Dict[str, List[dict]] = {t: [] for t in self.securities}
+        self.history: Dict[str, List[dict]] = {t: [] for t in self.securities}
+        self.tenders: Dict[int, dict] = {}
+        self._resolved_tenders: Dict[str, set] = {}
+        self.news: List[dict] = []
+        self._order_ids = itertools.count(1)
+        self._tender_ids = itertools.count(1)
+        self._print_ids = itertools.count(1)
+        self._news_ids = itertools.count(1)
+        self._tick_prints: Dict[str, List[float]] = {t: [] for t in self.securities}
+        for ticker in self.securities:
+            self._requote(ticker)
+
+    # Case clock ###################################################################
+
+    async def run(self):
+        """Advances the case every tick_duration seconds until it stops."""
+        while self.status != "STOPPED":
+            await asyncio.sleep(self.config.tick_duration)
+            self.advance_tick()
+
+    def advance_tick(self):
+        """Moves the case one tick forward and runs the background participants."""
+        if self.status != "ACTIVE":
+            return
+        self._close_bars()
+        if self.tick >= self.config.ticks_per_period:
+            self._end_period()
+            return
+        self.tick += 1
+        for ticker, security in self.securities.items():
+            self.fair_values[ticker] = max(
+                0.01,
+                round(
+                    self.fair_values[ticker]
+                    + self.random.gauss(0, security.volatility),
+                    2,
+                ),
+            )
+            self._requote(ticker)
+            if self.random.random() < self.config.noise_trade_probability:
+                self._noise_trade(ticker, security)
+        self._expire_tenders()
+        if self.random.random() < self.config.tender_probability:
+            self._offer_tender()
+        interval = self.config.news_interval_ticks
+        if interval and self.tick % interval == 0:
+            headline, body = self.news_factory(self)
+            self.publish_news(headline, body)
+
+    def _end_period(self):
+        """Closes out every account at the last price, like RIT does at period end."""
+        for ticker, engine in self.engines.items():
+            for order in engine.resting_orders():
+                engine.cancel(order.order_id)
+        for account in self.accounts.values():
+            for ticker, position in list(account.positions.items()):
+                if position:
+                    action = "SELL" if position > 0 else "BUY"
+                    account.apply_fill(
+                        ticker, action, abs(position), self.last_prices[ticker]
+                    )
+        self.tenders.clear()
+        if self.period >= self.config.total_periods:
+            self.status = "STOPPED"
+            return
+        self.period += 1
+        self.tick = 0
+        for ticker in self.securities:
+            self._requote(ticker)
+
+    def _close_bars(self):
+        for ticker, prints in self._tick_prints.items():
+            last = self.last_prices[ticker]
+            self.history[ticker].append(
+                {
+                    "tick": self.tick,
+                    "open": prints[0] if prints else last,
+                    "high": max(prints) if prints else last,
+                    "low": min(prints) if prints else last,
+                    "close": last,
+                }
+            )
+            prints.clear()
+
+    # Background participants ######################################################
+
+    def _requote(self, ticker: str):
+        """Replaces the market maker ladder around the current fair value."""
+        engine = self.engines[ticker]
+        security = self.securities[ticker]
+        for order in engine.resting_orders():
+            if order.trader_id == MARKET_MAKER:
+                engine.cancel(order.order_id)
+        fair = self.fair_values[ticker]
+        half_spread = security.spread / 2
+        for level in range(security.depth_levels):
+            offset = half_spread + level * security.level_spacing
+            for action, price in (("BUY", fair - offset), ("SELL", fair + offset)):
+                if price <= 0:
+                    continue
+                size = max(
+                    100,
+                    int(self.random.expovariate(1 / security.level_size)) // 100 * 100,
+                )
+                self._submit(MARKET_MAKER, ticker, "LIMIT", size, action, price)
+
+    def _noise_trade(self, ticker: str, security: SimSecurityConfig):
+        size = max(100, int(self.random.expovariate(1 / security.noise_trade_size)))
+        action = self.random.choice(("BUY", "SELL"))
+        self._submit(NOISE_TRADER, ticker, "MARKET", size, action)
+
+    def _offer_tender(self):
+        ticker = self.random.choice(list(self.securities))
+        action = self.random.choice(("BUY", "SELL"))
+        quantity = self.random.randrange(
+            self.config.tender_min_quantity, self.config.tender_max_quantity + 1, 1000
+        )
+        edge = self.random.uniform(-0.5, 1.5) * self.config.tender_premium
+        fair = self.fair_values[ticker]
+        price = fair - edge if action == "BUY" else fair + edge
+        tender_id = next(self._tender_ids)
+        self.tenders[tender_id] = {
+            "tender_id": tender_id,
+            "period": self.period,
+            "tick": self.tick,
+            "expires": self.tick + self.config.tender_expiry_ticks,
+            "caption": f"A client wants you to {action} {quantity} shares of {ticker}",
+            "quantity": quantity,
+            "action": action,
+            "is_fixed_bid": True,
+            "price": round(price, 2),
+            "ticker": ticker,
+        }
+
+    def _expire_tenders(self):
+        for tender_id in [
+            t for t, tender in self.tenders.items() if tender["expires"] < self.tick
+        ]:
+            del self.tenders[tender_id]
+
+    def publish_news(self, headline: str, body: str, ticker: str = ""):
+        self.news.append(
+            {
+                "news_id": next(self._news_ids),
+                "period": self.period,
+                "tick": self.tick,
+                "ticker": ticker,
+                "headline": headline,
+                "body": body,
+            }
+        )
+
+    # Client API ###################################################################
+
+    def account(self, trader_id: str) -> TraderAccount:
+        if trader_id not in self.accounts:
+            self.accounts[trader_id] = TraderAccount(
+                trader_id, self.config.starting_cash
+            )
+        return self.accounts[trader_id]
+
+    def case(self) -> dict:
+        return {
+            "name": self.config.case_name,
+            "period": self.period,
+            "tick": self.tick,
+            "ticks_per_period": self.config.ticks_per_period,
+            "total_periods": self.config.total_periods,
+            "status": self.status,
+            "is_enforce_trading_limits": True,
+        }
+
+    def trader(self, trader_id: str) -> dict:
+        return {
+            "trader_id": trader_id,
+            "first_name": trader_id,
+            "last_name": "",
+            "nlv": round(sum(s["nlv"] for s in self.securities_for(trader_id)), 2),
+        }
+
+    def limits(self, trader_id: str) -> List[dict]:
+        positions = self.account(trader_id).positions.values()
+        return [
+            {
+                "name": "LIMIT-STOCK",
+                "gross": sum(abs(p) for p in positions),
+                "net": sum(positions),
+                "gross_limit": self.config.gross_limit,
+                "net_limit": self.config.net_limit,
+                "gross_fine": 0,
+                "net_fine": 0,
+            }
+        ]
+
+    def securities_for(self, trader_id: str, ticker: Optional[str] = None):
+        account = self.account(trader_id)
+        tickers = [ticker] if ticker else list(self.securities)
+        result = []
+        for symbol in tickers:
+            engine = self.engines[self._check_ticker(symbol)]
+            position = account.positions.get(symbol, 0)
+            if self.securities[symbol].type == "CURRENCY":
+                position = round(account.cash, 2)  # Cash balance, like RIT's CASH
+            cost = account.average_cost.get(symbol, 0.0)
+            last = self.last_prices[symbol]
+            bid, ask = engine.best_bid(), engine.best_ask()
+            result.append(
+                {
+                    "ticker": symbol,
+                    "type": self.securities[symbol].type,
+                    "size": 1,
+                    "position": position,
+                    "vwap": round(cost, 4),
+                    "nlv": round(position * last, 2),
+                    "last": last,
+                    "bid_size": engine.size_at("BUY", bid),
+                    "bid": bid or 0.0,
+                    "ask_size": engine.size_at("SELL", ask),
+                    "ask": ask or 0.0,
+                    "volume": self.volumes[symbol],
+                    "unrealized": round((last - cost) * position, 2),
+                    "realized": round(account.realized.get(symbol, 0.0), 2),
+                    "currency": "CAD",
+                    "total_volume": self.volumes[symbol],
+                    "is_tradeable": True,
+                    "is_shortable": True,
+                }
+            )
+        return result
+
+    def order_book(self, ticker: str, limit: Optional[int] = None) -> dict:
+        return self.engines[self._check_ticker(ticker)].book(limit)
+
+    def security_history(self, ticker: str, limit: Optional[int] = None):
+        bars = self.history[self._check_ticker(ticker)][::-1]
+        return bars[:limit] if limit else bars
+
+    def time_and_sales_for(
+        self, ticker: str, after: Optional[int] = None, limit: Optional[int] = None
+    ):
+        prints = self.time_and_sales[self._check_ticker(ticker)]
+        if after is not None:
+            prints = [p for p in prints if p["id"] > after]
+        prints = prints[::-1]
+        return prints[:limit] if limit else prints
+
+    def news_for(self, after: Optional[int] = None, limit: Optional[int] = None):
+        items = (
+            self.news
+            if after is None
+            else [n for n in self.news if n["news_id"] > after]
+        )
+        items = items[::-1]
+        return items[:limit] if limit else items
+
+    def place_order(
+        self,
+        trader_id: str,
+        ticker: str,
+        type: str,
+        quantity: int,
+        action: str,
+        price: Optional[float] = None,
+        dry_run: Optional[int] = None,
+    ) -> dict:
+        self._require_active()
+        self._check_ticker(ticker)
+        if type not in ("MARKET", "LIMIT"):
+            raise SimulatorError("INVALID_TYPE", f"Unknown order type {type}")
+        if action not in ("BUY", "SELL"):
+            raise SimulatorError("INVALID_ACTION", f"Unknown action {action}")
+        if quantity <= 0:
+            raise SimulatorError("INVALID_QUANTITY", "Quantity must be positive")
+        if type == "LIMIT" and price is None:
+            raise SimulatorError("MISSING_PRICE", "LIMIT orders require a price")
+        if type == "MARKET" and dry_run:
+            return self._dry_run(trader_id, ticker, quantity, action)
+        return self._submit(trader_id, ticker, type, quantity, action, price).to_json()
+
+    def orders_for(self, trader_id: str, status: Optional[str] = "OPEN"):
+        return [
+            order.to_json()
+            for order in self.orders.values()
+            if order.trader_id == trader_id
+            and (status is None or order.status == status)
+        ]
+
+    def order_for(self, trader_id: str, order_id: int) -> dict:
+        order = self.orders.get(order_id)
+        if order is None or order.trader_id != trader_id:
+            raise SimulatorError("NOT_FOUND", f"Order {order_id} not found")
+        return order.to_json()
+
+    def cancel_order(self, trader_id: str, order_id: int) -> bool:
+        order = self.orders.get(order_id)
+        if order is None or order.trader_id != trader_id:
+            raise SimulatorError("NOT_FOUND", f"Order {order_id} not found")
+        return self.engines[order.ticker].cancel(order_id) is not None
+
+    def bulk_cancel(
+        self,
+        trader_id: str,
+        all: Optional[int] = None,
+        ticker: Optional[str] = None,
+        ids: Optional[List[int]] = None,
+    ) -> List[int]:
+        cancelled = []
+        for order in list(self.orders.values()):
+            if order.trader_id != trader_id or order.status != "OPEN":
+                continue
+            if (
+                all
+                or (ticker is not None and order.ticker == ticker)
+                or (ids is not None and order.order_id in ids)
+            ):
+                if self.engines[order.ticker].cancel(order.order_id) is not None:
+                    cancelled.append(order.order_id)
+        return cancelled
+
+    def tenders_for(self, trader_id: str) -> List[dict]:
+        resolved = self._resolved_tenders.get(trader_id, set())
+        return [t for t in self.tenders.values() if t["tender_id"] not in resolved]
+
+    def accept_tender(self, trader_id: str, tender_id: int, price: Optional[float]):
+        self._require_active()
+        tender = self._open_tender(trader_id, tender_id)
+        fill_price = tender["price"] if tender["is_fixed_bid"] else price
+        self.account(trader_id).apply_fill(
+            tender["ticker"], tender["action"], tender["quantity"], fill_price
+        )
+        self._resolved_tenders.setdefault(trader_id, set()).add(tender_id)
+        return True
+
+    def decline_tender(self, trader_id: str, tender_id: int):
+        self._open_tender(trader_id, tender_id)
+        self._resolved_tenders.setdefault(trader_id, set()).add(tender_id)
+        return True
+
+    # Internals ####################################################################
+
+    def _check_ticker(self, ticker: str) -> str:
+        if ticker not in self.engines:
+            raise SimulatorError("INVALID_TICKER", f"Unknown ticker {ticker}")
+        return ticker
+
+    def _require_active(self):
+        if self.status != "ACTIVE":
+            raise SimulatorError("CASE_NOT_ACTIVE", f"Case is {self.status}")
+
+    def _open_tender(self, trader_id: str, tender_id: int) -> dict:
+        tender = self.tenders.get(tender_id)
+        if tender is None or tender_id in self._resolved_tenders.get(trader_id, set()):
+            raise SimulatorError("NOT_FOUND", f"Tender {tender_id} not found")
+        return tender
+
+    def _submit(self, trader_id, ticker, type, quantity, action, price=None):
+        order = SimOrder(
+            next(self._order_ids),
+            trader_id,
+            ticker,
+            type,
+            quantity,
+            action,
+            price,
+            self.period,
+            self.tick,
+        )
+        if trader_id not in (MARKET_MAKER, NOISE_TRADER):
+            self.orders[order.order_id] = order
+        for trade in self.engines[ticker].submit(order):
+            self._record_trade(ticker, trade)
+        return order
+
+    def _record_trade(self, ticker: str, trade: Trade):
+        for order in (trade.aggressor, trade.resting):
+            self.account(order.trader_id).apply_fill(
+                ticker, order.action, trade.quantity, trade.price
+            )
+        self.last_prices[ticker] = trade.price
+        self.volumes[ticker] += trade.quantity
+        self._tick_prints[ticker].append(trade.price)
+        self.time_and_sales[ticker].append(
+            {
+                "id": next(self._print_ids),
+                "period": self.period,
+                "tick": self.tick,
+                "price": trade.price,
+                "quantity": trade.quantity,
+            }
+        )
+
+    def _dry_run(self, trader_id, ticker, quantity, action) -> dict:
+        """Prices a MARKET order against the book without executing it."""
+        book = self.engines[ticker].book()["asks" if action == "BUY" else "bids"]
+        remaining, notional = quantity, 0.0
+        for level in book:
+            take = min(remaining, level["quantity"] - level["quantity_filled"])
+            notional += take * level["price"]
+            remaining -= take
+            if remaining == 0:
+                break
+        filled = quantity - remaining
+        return {
+            "order_id": 0,
+            "period": self.period,
+            "tick": self.tick,
+            "trader_id": trader_id,
+            "ticker": ticker,
+            "type": "MARKET",
+            "quantity": quantity,
+            "action": action,
+            "price": None,
+            "quantity_filled": filled,
+            "vwap": round(notional / filled, 4) if filled else None,
+            "status": "TRANSACTED",
+        }
+
+
+def analyst_expectation_news(exchange: SimulatedExchange) -> Tuple[str, str]:
+    """Default news: analyst price targets a few ticks ahead, in the format the
+    VaR case publishes (bonds are quoted without the dollar sign).
+    """
+    target_tick = exchange.tick + exchange.config.news_interval_ticks
+    parts = []
+    for ticker, security in exchange.securities.items():
+        target = exchange.fair_values[ticker] * (1 + exchange.random.gauss(0, 0.02))
+        if security.type == "BOND":
+            parts.append(f"{ticker} {target:.2f}")
+        else:
+            parts.append(f"{ticker} = ${target:.2f}")
+    return (
+        "Analyst expectations",
+        f"By tick {target_tick} analysts expect: " + ", ".join(parts),
+    )
+
+
+def _securities(*specs: Tuple[str, float], **overrides) -> List[SimSecurityConfig]:
+    return [
+        SimSecurityConfig(ticker=ticker, start_price=price, **overrides)
+        for ticker, price in specs
+    ]
+
+
+# Ready-made cases mirroring the strategies in this repo
+CASE_PRESETS: Dict[str, Callable[[], SimulatorConfig]] = {
+    "lt3": lambda: SimulatorConfig(
+        case_name="LT3",
+        securities=_securities(("CRZY_A", 25.0), ("CRZY_M", 25.0), ("TAME", 10.0)),
+        tender_probability=0.1,
+    ),
+    "sor": lambda: SimulatorConfig(
+        case_name="SOR",
+        securities=_securities(("THOR_A", 20.0), ("THOR_M", 20.0)),
+        tender_probability=0.05,
+    ),
+    "var": lambda: SimulatorConfig(
+        case_name="VAR",
+        securities=[
+            SimSecurityConfig(ticker="US", start_price=100.0, volatility=0.1),
+            SimSecurityConfig(ticker="BRIC", start_price=50.0, volatility=0.08),
+            SimSecurityConfig(
+                ticker="BOND", type="BOND", start_price=95.0, volatility=0.05
+            ),
+            SimSecurityConfig(
+                ticker="CASH", type="CURRENCY", start_price=1.0, volatility=0.0
+            ),
+        ],
+        tender_probability=0.0,
+        news_interval_ticks=15,
+        starting_cash=1000000.0,
+    ),
+}
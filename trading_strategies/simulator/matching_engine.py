@@ -0,0 +1,192 @@
+import bisect
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+
+class SimOrder:
+    """An order held by the simulator, serialised in the RIT /v1/orders format."""
+
+    __slots__ = (
+        "order_id",
+        "period",
+        "tick",
+        "trader_id",
+        "ticker",
+        "type",
+        "quantity",
+        "action",
+        "price",
+        "quantity_filled",
+        "vwap",
+        "status",
+        "_notional",
+    )
+
+    def __init__(
+        self,
+        order_id: int,
+        trader_id: str,
+        ticker: str,
+        type: str,
+        quantity: int,
+        action: str,
+        price: Optional[float] = None,
+        period: int = 1,
+        tick: int = 0,
+    ):
+        self.order_id = order_id
+        self.period = period
+        self.tick = tick
+        self.trader_id = trader_id
+        self.ticker = ticker
+        self.type = type
+        self.quantity = quantity
+        self.action = action
+        self.price = None if price is None else round(price, 2)
+        self.quantity_filled = 0
+        self.vwap: Optional[float] = None
+        self.status = "OPEN"
+        self._notional = 0.0
+
+    @property
+    def remaining(self) -> int:
+        return self.quantity - self.quantity_filled
+
+    def fill(self, quantity: int, price: float):
+        self.quantity_filled += quantity
+        self._notional += quantity * price
+        self.vwap = round(self._notional / self.quantity_filled, 4)
+        if self.remaining == 0:
+            self.status = "TRANSACTED"
+
+    def to_json(self) -> dict:
+        return {
+            "order_id": self.order_id,
+            "period": self.period,
+            "tick": self.tick,
+            "trader_id": self.trader_id,
+            "ticker": self.ticker,
+            "type": self.type,
+            "quantity": self.quantity,
+            "action": self.action,
+            "price": self.price,
+            "quantity_filled": self.quantity_filled,
+            "vwap": self.vwap,
+            "status": self.status,
+        }
+
+
+class Trade(NamedTuple):
+    """One execution between an incoming (aggressor) and a resting order."""
+
+    aggressor: SimOrder
+    resting: SimOrder
+    price: float
+    quantity: int
+
+
+class MatchingEngine:
+    """Price-time priority limit order book for a single security.
+
+    Each side keeps a FIFO queue of orders per price level and an ascending
+    list of the level prices, so the best bid is the last bid price and the
+    best ask the first ask price.
+    """
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+        self._levels: Dict[str, Dict[float, Deque[SimOrder]]] = {"BUY": {}, "SELL": {}}
+        self._prices: Dict[str, List[float]] = {"BUY": [], "SELL": []}
+        self._resting: Dict[int, SimOrder] = {}
+
+    def best_bid(self) -> Optional[float]:
+        prices = self._prices["BUY"]
+        return prices[-1] if prices else None
+
+    def best_ask(self) -> Optional[float]:
+        prices = self._prices["SELL"]
+        return prices[0] if prices else None
+
+    def size_at(self, action: str, price: Optional[float]) -> int:
+        if price is None:
+            return 0
+        return sum(order.remaining for order in self._levels[action].get(price, ()))
+
+    def _crosses(self, order: SimOrder, best: float) -> bool:
+        if order.type == "MARKET":
+            return True
+        return best <= order.price if order.action == "BUY" else best >= order.price
+
+    def submit(self, order: SimOrder) -> List[Trade]:
+        """Matches an incoming order against the book and rests any LIMIT remainder.
+        An unfilled MARKET remainder is cancelled.
+        """
+        trades = []
+        opposite = "SELL" if order.action == "BUY" else "BUY"
+        while order.remaining > 0:
+            best = self.best_ask() if order.action == "BUY" else self.best_bid()
+            if best is None or not self._crosses(order, best):
+                break
+            queue = self._levels[opposite][best]
+            while queue and order.remaining > 0:
+                resting = queue[0]
+                quantity = min(order.remaining, resting.remaining)
+                resting.fill(quantity, best)
+                order.fill(quantity, best)
+                trades.append(Trade(order, resting, best, quantity))
+                if resting.remaining == 0:
+                    queue.popleft()
+                    del self._resting[resting.order_id]
+            if not queue:
+                self._remove_level(opposite, best)
+
+        if order.remaining > 0:
+            if order.type == "LIMIT":
+                self._rest(order)
+            else:
+                order.status = "TRANSACTED" if order.quantity_filled else "CANCELLED"
+        return trades
+
+    def cancel(self, order_id: int) -> Optional[SimOrder]:
+        """Removes a resting order from the book; returns it, or None if not resting."""
+        order = self._resting.pop(order_id, None)
+        if order is None:
+            return None
+        queue = self._levels[order.action][order.price]
+        queue.remove(order)
+        if not queue:
+            self._remove_level(order.action, order.price)
+        order.status = "CANCELLED"
+        return order
+
+    def resting_orders(self) -> List[SimOrder]:
+        return list(self._resting.values())
+
+    def book(self, limit: Optional[int] = None) -> dict:
+        """Returns the book in the RIT /v1/securities/book format, best first."""
+        return {
+            "bids": self._side(self._prices["BUY"][::-1], "BUY", limit),
+            "asks": self._side(self._prices["SELL"], "SELL", limit),
+        }
+
+    def _side(self, prices: List[float], action: str, limit: Optional[int]):
+        orders = []
+        for price in prices:
+            for order in self._levels[action][price]:
+                orders.append(order.to_json())
+                if limit is not None and len(orders) >= limit:
+                    return orders
+        return orders
+
+    def _rest(self, order: SimOrder):
+        levels = self._levels[order.action]
+        if order.price not in levels:
+            levels[order.price] = deque()
+            bisect.insort(self._prices[order.action], order.price)
+        levels[order.price].append(order)
+        self._resting[order.order_id] = order
+
+    def _remove_level(self, action: str, price: float):
+        del self._levels[action][price]
+        prices = self._prices[action]
+        del prices[bisect.bisect_left(prices, price)]
@@ -0,0 +1,229 @@
+import argparse
+import asyncio
+import base64
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from trading_strategies.logger_config import setup_logger
+from trading_strategies.simulator.exchange import (
+    CASE_PRESETS,
+    SimulatedExchange,
+    SimulatorError,
+)
+
+logger = setup_logger(__name__)
+
+
+class _TraderRateLimiter:
+    """Per-trader token bucket that answers like RIT once a trader is over the limit."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._buckets: Dict[str, list] = {}
+
+    def wait_for(self, trader_id: str) -> float:
+        """Takes a token and returns 0, or returns how long to wait for one."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(trader_id, [self.rate, now])
+        tokens = min(self.rate, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            self._buckets[trader_id] = [tokens - 1, now]
+            return 0.0
+        self._buckets[trader_id] = [tokens, now]
+        return round((1 - tokens) / self.rate, 3)
+
+
+def create_app(exchange: SimulatedExchange) -> FastAPI:
+    """Builds a FastAPI app serving the RIT /v1 REST API from a SimulatedExchange.
+    The case clock runs for the lifetime of the app unless tick_duration is 0.
+    """
+
+    @asynccontextmanager
+    async def lifespan(_app):
+        clock = None
+        if exchange.config.tick_duration > 0:
+            clock = asyncio.create_task(exchange.run())
+        yield
+        if clock is not None:
+            clock.cancel()
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.exchange = exchange
+    limiter = (
+        _TraderRateLimiter(exchange.config.rate_limit)
+        if exchange.config.rate_limit > 0
+        else None
+    )
+
+    @app.exception_handler(SimulatorError)
+    async def simulator_error(_request: Request, error: SimulatorError):
+        return JSONResponse(
+            status_code=400, content={"code": error.code, "message": error.message}
+        )
+
+    @app.middleware("http")
+    async def rate_limit(request: Request, call_next):
+        if limiter is not None:
+            wait = limiter.wait_for(_trader_id(request))
+            if wait > 0:
+                return JSONResponse(
+                    status_code=429,
+                    content={
+                        "code": "TOO_MANY_REQUESTS",
+                        "message": "API request was throttled",
+                        "wait": wait,
+                    },
+                    headers={"Retry-After": str(wait)},
+                )
+        return await call_next(request)
+
+    def trader(request: Request) -> str:
+        return _trader_id(request)
+
+    @app.get("/v1/case")
+    async def get_case():
+        return exchange.case()
+
+    @app.get("/v1/trader")
+    async def get_trader(trader_id: str = Depends(trader)):
+        return exchange.trader(trader_id)
+
+    @app.get("/v1/limits")
+    async def get_limits(trader_id: str = Depends(trader)):
+        return exchange.limits(trader_id)
+
+    @app.get("/v1/news")
+    async def get_news(after: Optional[int] = None, limit: Optional[int] = None):
+        return exchange.news_for(after, limit)
+
+    @app.get("/v1/securities")
+    async def get_securities(
+        ticker: Optional[str] = None, trader_id: str = Depends(trader)
+    ):
+        return exchange.securities_for(trader_id, ticker or None)
+
+    @app.get("/v1/securities/book")
+    async def get_book(ticker: str, limit: Optional[int] = None):
+        return exchange.order_book(ticker, limit)
+
+    @app.get("/v1/securities/history")
+    async def get_history(
+        ticker: str, period: Optional[int] = None, limit: Optional[int] = None
+    ):
+        return exchange.security_history(ticker, limit)
+
+    @app.get("/v1/securities/tas")
+    async def get_tas(
+        ticker: str,
+        after: Optional[int] = None,
+        period: Optional[int] = None,
+        limit: Optional[int] = None,
+    ):
+        return exchange.time_and_sales_for(ticker, after, limit)
+
+    @app.get("/v1/orders")
+    async def get_orders(status: Optional[str] = "OPEN", trader_id=Depends(trader)):
+        return exchange.orders_for(trader_id, status)
+
+    @app.post("/v1/orders")
+    async def post_order(
+        ticker: str,
+        type: str,
+        quantity: int,
+        action: str,
+        price: Optional[float] = None,
+        dry_run: Optional[int] = None,
+        trader_id: str = Depends(trader),
+    ):
+        return exchange.place_order(
+            trader_id, ticker, type, quantity, action, price, dry_run
+        )
+
+    @app.get("/v1/orders/{id}")
+    async def get_order(id: int, trader_id: str = Depends(trader)):
+        return exchange.order_for(trader_id, id)
+
+    @app.delete("/v1/orders/{id}")
+    async def delete_order(id: int, trader_id: str = Depends(trader)):
+        return {"success": exchange.cancel_order(trader_id, id)}
+
+    @app.get("/v1/tenders")
+    async def get_tenders(trader_id: str = Depends(trader)):
+        return exchange.tenders_for(trader_id)
+
+    @app.post("/v1/tenders/{id}")
+    async def accept_tender(
+        id: int, price: Optional[float] = None, trader_id: str = Depends(trader)
+    ):
+        return {"success": exchange.accept_tender(trader_id, id, price)}
+
+    @app.delete("/v1/tenders/{id}")
+    async def decline_tender(id: int, trader_id: str = Depends(trader)):
+        return {"success": exchange.decline_tender(trader_id, id)}
+
+    @app.post("/v1/commands/cancel")
+    async def bulk_cancel(
+        all: Optional[int] = None,
+        ticker: Optional[str] = None,
+        ids: Optional[str] = None,
+        trader_id: str = Depends(trader),
+    ):
+        if all is None and ticker is None and ids is None:
+            raise SimulatorError(
+                "MISSING_ARGUMENT",
+                "One of 'all', 'ticker', or 'ids' must be specified.",
+            )
+        id_list = [int(i) for i in ids.split(",") if i] if ids else None
+        cancelled = exchange.bulk_cancel(trader_id, all, ticker, id_list)
+        return {"cancelled_order_ids": cancelled}
+
+    return app
+
+
+def _trader_id(request: Request) -> str:
+    """Uses the Basic auth username as the trader id, any password is accepted."""
+    header = request.headers.get("authorization", "")
+    if header.lower().startswith("basic "):
+        try:
+            return base64.b64decode(header[6:]).decode().split(":", 1)[0]
+        except ValueError:
+            pass
+    return "anonymous"
+
+
+def main():
+    """Runs the simulator, e.g. `python -m trading_strategies.simulator.server --case lt3`."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local RIT case simulator")
+    parser.add_argument("--case", choices=sorted(CASE_PRESETS), default="lt3")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=16621)
+    parser.add_argument("--tick-duration", type=float, default=None)
+    parser.add_argument("--ticks-per-period", type=int, default=None)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = CASE_PRESETS[args.case]()
+    overrides = {
+        "tick_duration": args.tick_duration,
+        "ticks_per_period": args.ticks_per_period,
+        "rate_limit": args.rate_limit,
+        "seed": args.seed,
+    }
+    config = config.model_copy(
+        update={key: value for key, value in overrides.items() if value is not None}
+    )
+    logger.info(
+        f"Starting simulated {config.case_name} case on {args.host}:{args.port}"
+    )
+    uvicorn.run(create_app(SimulatedExchange(config)), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,86 +1,182 @@
 import asyncio
-import random
-from typing import Awaitable, Callable
+from typing import Awaitable, Callable, List, Optional
 
 import trading_strategies.apis.rit_apis as rit
 from trading_strategies.apis.api_utility import (
     accept_tender,
     cancel_all_open_order,
-    fetch_active_tenders,
-    fetch_current_tick,
-    fetch_securities,
+    fetch_case,
+    get_position_ledger,
     is_tender_processed,
     market_square_off_all_tickers,
-    post_order,
+    sync_positions,
+    tender_reflected,
+)
+from trading_strategies.apis.market_data import (
+    MarketDataService,
+    get_market_data_service,
 )
 from trading_strategies.logger_config import setup_logger
 from trading_strategies.models.custom_models import AuthConfig
-from trading_strategies.strategy.LT3_strategy_utility import generate_lt3_signal
+from trading_strategies.models.rit_records import TenderRecord
+from trading_strategies.strategy.execution_engine import (
+    EXECUTION_HORIZON_TICKS,
+    ExecutionEngine,
+)
+from trading_strategies.strategy.LT3_strategy_utility import (
+    evaluate_tenders,
+    select_tenders,
+)
 
 # Configure logging
 logger = setup_logger(__name__)
 
 
-async def limit_square_off_ticker_randomized_price(
+async def adaptive_square_off(
     auth: AuthConfig,
     ticker: str,
     action: str,
-    price: int,
+    price: float,
     quantity: int,
     batch_size: int = 10000,
 ):
-    """Squares off a ticker position with randomized price using limit orders."""
-    while True:
-        random_choice = random.choice([0.05,0.06,0.07,0.08,0.09,0.10,0.11,0.12,0.13,0.14,0.15,0.16,0.17,0.18,0.19,0.20])
-        logger.info(f"Random choice is {random_choice} ####")
-        # TODO: if error happens then this computation cannot be recovered back, add new logic @mayuresh
-        ticker_type = ""
-        if quantity >= batch_size:
-            ticker = ticker
-            ticker_type = "MARKET" if random_choice == 0 else "LIMIT"
-            temp_price = (
-                None
-                if random_choice == 0
-                else price - random_choice
-                if action == "BUY"
-                else price + random_choice
-            )
-            action = action
-            temp_quantity = batch_size
-            quantity -= batch_size
-        elif quantity > 0 and quantity < batch_size:
-            ticker = ticker
-            ticker_type = "MARKET" if random_choice == 0 else "LIMIT"
-            temp_price = (
-                None
-                if random_choice == 0
-                else price - random_choice
-                if action == "BUY"
-                else price + random_choice
-            )
-            action = action
-            temp_quantity = quantity
-            quantity = 0
-        else:
-            break
-        try:
-            await post_order(
-                auth=auth,
-                ticker=ticker,
-                ticker_type=ticker_type,
-                quantity=temp_quantity,
-                action=action,
-                price=temp_price,
-                dry_run=0,
+    """Squares off a tender position with the execution engine, working LIMIT
+    children no worse than the tender price until the horizon runs out.
+    """
+    case = await fetch_case(auth)
+    end_tick = min(
+        case["tick"] + EXECUTION_HORIZON_TICKS,
+        case.get("ticks_per_period") or case["tick"] + EXECUTION_HORIZON_TICKS,
+    )
+    engine = ExecutionEngine(
+        auth,
+        ticker,
+        action,
+        quantity,
+        end_tick,
+        limit_price=price,
+        max_child=batch_size,
+        book_engine=get_market_data_service(auth).book_engine,
+    )
+    return await engine.run()
+
+
+async def _confirm_and_square_off(
+    auth: AuthConfig,
+    market_data: Optional[MarketDataService],
+    tender: TenderRecord,
+    initial_position: int,
+    strategy_func: Callable[[AuthConfig, str, str, int, int, int], Awaitable[None]],
+    lt3_config,
+):
+    """Starts the square-off as soon as the server position shows the tender."""
+    ledger = get_position_ledger(auth)
+    flow = ledger.order_flow.get(tender.ticker, 0)
+    timeout = lt3_config["T3_TENDER_CONFIRM_TIMEOUT"]
+    if market_data is not None and market_data.running:
+        processed = (
+            await market_data.wait_for_position(
+                tender.ticker,
+                lambda position: tender_reflected(
+                    tender.action,
+                    tender.quantity,
+                    initial_position,
+                    position,
+                    ledger.order_flow.get(tender.ticker, 0) - flow,
+                ),
+                timeout,
             )
-            logger.info(
-                f"Trade for {action} {temp_quantity} {ticker} placed at  {temp_price}"
+            is not None
+        )
+    else:
+        processed = await is_tender_processed(
+            auth,
+            tender.ticker,
+            tender.quantity,
+            initial_position,
+            tender.action,
+            timeout,
+        )
+    if not processed:
+        logger.info(f"Tender {tender.tender_id} not reflected within {timeout}s")
+        return
+    squareoff_action = "SELL" if tender.action == "BUY" else "BUY"
+    await strategy_func(
+        auth,
+        tender.ticker,
+        squareoff_action,
+        tender.price,
+        tender.quantity,
+        lt3_config["T3_SQUARE_OFF_BATCH_SIZE"],
+    )
+
+
+async def process_tenders(
+    auth: AuthConfig,
+    tenders: List[TenderRecord],
+    strategy_func: Callable[[AuthConfig, str, str, int, int, int], Awaitable[None]],
+    lt3_config,
+    market_data: Optional[MarketDataService] = None,
+) -> List[int]:
+    """Evaluates all live tenders at once and accepts the best set that fits the
+    position limits. Books are fetched concurrently, positions are read from the
+    ledger and accepts are sent together, so the round trips do not grow with
+    the tender count.
+    Returns the ids of the accepted tenders.
+    """
+    ledger = get_position_ledger(auth)
+    decisions, _ = await asyncio.gather(
+        evaluate_tenders(
+            auth,
+            tenders,
+            lt3_config["T3_MIN_VWAP_MARGIN"],
+            book_engine=market_data.book_engine if market_data else None,
+            impact_per_share=lt3_config["T3_IMPACT_PER_SHARE"],
+        ),
+        # Positions come from the ledger, fetched only until it is first reconciled
+        sync_positions(auth) if ledger.reconciled_at is None else asyncio.sleep(0),
+    )
+    logger.info(f"Signals analysed: \n{decisions}")
+    positions = dict(ledger.positions)
+    chosen = select_tenders(
+        decisions, positions, lt3_config["T3_NET_LIMIT"], lt3_config["T3_GROSS_LIMIT"]
+    )
+    if not chosen:
+        logger.info(f"Waiting for favorable condition to accept tender")
+        return []
+
+    responses = await asyncio.gather(
+        *(
+            accept_tender(
+                auth=auth, id=d.tender.tender_id, price=d.tender.price, tender=d.tender
             )
-        except Exception as e:
-            logger.info(
-                f"An error occurred while posting the order {(ticker, ticker_type, quantity, action, price,)}: {e}"
+            for d in chosen
+        ),
+        return_exceptions=True,
+    )
+    accepted = []
+    for decision, response in zip(chosen, responses):
+        tender = decision.tender
+        logger.info(f"Tender {tender.tender_id} accepted: {response}")
+        if isinstance(response, Exception) or not response.get("success"):
+            continue
+        accepted.append(tender.tender_id)
+        # A later tender on the same ticker is confirmed on top of earlier ones
+        initial_position = positions.get(tender.ticker, 0)
+        signed = tender.quantity if tender.action == "BUY" else -tender.quantity
+        positions[tender.ticker] = initial_position + signed
+        # Confirmation and square-off run beside the strategy loop
+        asyncio.create_task(
+            _confirm_and_square_off(
+                auth,
+                market_data,
+                tender,
+                initial_position,
+                strategy_func,
+                lt3_config,
             )
-        await asyncio.sleep(0.1)
+        )
+    return accepted
 
 
 async def run_l3_strategy(
@@ -91,17 +187,27 @@ async def run_l3_strategy(
     auth = AuthConfig(**lt3_config["auth"])
     logger.info(await rit.get_case_status(auth))
     end_of_time_hit = False
+    handled = set()  # tenders already accepted, the snapshot may still list them
+    # Tick and tenders come from the shared market-data poller
+    market_data = get_market_data_service(auth)
+    await market_data.start()
+    updates = market_data.subscribe(("case", "tenders"), maxsize=1)
     while True:
         tender_response = []
         try:
-            current_tick = await fetch_current_tick(auth)
+            # Wake up on the next tick or tender change
+            await market_data.next_event(updates, timeout=1)
+            snapshot = market_data.snapshot
+            current_tick = snapshot.tick
+            if current_tick is None:
+                continue
             logger.info(f"Current tick is {current_tick}")        
 
             if current_tick == 0:  # start of new session
                 end_of_time_hit = False
             # fetch new tenders if available
             if current_tick <= lt3_config["T3_TRADE_UNTIL_TICK"]:
-                tender_response = await fetch_active_tenders(auth)
+                tender_response = snapshot.tenders
             else:  # end of period
                 logger.info(
                     f"Current tick is {current_tick} more than cutoff time {lt3_config['T3_TRADE_UNTIL_TICK']} end_of_time_hit:{end_of_time_hit}"
@@ -118,79 +224,19 @@ async def run_l3_strategy(
                     )
                     end_of_time_hit = True
 
-            if tender_response:
-                logger.info(f"Details of tender received is: \n{tender_response}")
-                for tender in tender_response:
-                    signal_response = await generate_lt3_signal(
+            tenders = [t for t in tender_response if t.tender_id not in handled]
+            if tenders:
+                logger.info(f"Details of tender received is: \n{tenders}")
+                handled.update(
+                    await process_tenders(
                         auth,
-                        tender["ticker"],
-                        tender["price"],
-                        tender["action"],
-                        tender["quantity"],
-                        lt3_config["T3_MIN_VWAP_MARGIN"],
+                        tenders,
+                        strategy_func,
+                        lt3_config,
+                        market_data,
                     )
-                    squareoff_action = "SELL" if tender["action"] == "BUY" else "BUY"
-                    logger.info(f"Signal analysed: \n{signal_response}")
-                    if signal_response[0]:
-                        securities_data = await fetch_securities(auth)
-                        net_position = 0
-                        gross_position = 0
-                        security_position = {}
-                        # Initialize security_position from securities_data
-                        for security in securities_data:
-                            security_position[security["ticker"]] = security["position"]
-
-                        tender_quantity = (
-                            -1 * tender["quantity"]
-                            if tender["action"] == "SELL"
-                            else tender["quantity"]
-                        )
-                        security_position[tender["ticker"]] += tender_quantity
-
-                        for ticker, position in security_position.items():
-                            net_position += position
-                            gross_position += abs(position)
-
-                        logger.info(
-                            f"net_position:{net_position} gross_position:{gross_position}"
-                        )
-                        if (
-                            abs(net_position) > lt3_config["T3_NET_LIMIT"]
-                            or gross_position > lt3_config["T3_GROSS_LIMIT"]
-                        ):
-                            logger.info(f"Cannot accept this tender at this time")
-                            break
-                        securities_data = await fetch_securities(auth, tender["ticker"])
-                        logger.info(
-                            f"Queried intial position for {ticker} is {securities_data[0]['position']}"
-                        )
-                        tender_response = await accept_tender(
-                            auth=auth, id=tender["tender_id"], price=tender["price"]
-                        )
-                        logger.info(f"Tender accepted: {tender_response}")
-                        if tender_response["success"]:
-                            is_tender_processed_flag = await is_tender_processed(
-                                auth,
-                                tender["ticker"],
-                                tender["quantity"],
-                                securities_data[0]["position"],
-                            )
-                            if is_tender_processed_flag:
-                                asyncio.create_task(
-                                    strategy_func(
-                                        auth,
-                                        tender["ticker"],
-                                        squareoff_action,
-                                        tender["price"],
-                                        tender["quantity"],
-                                        lt3_config["T3_SQUARE_OFF_BATCH_SIZE"],
-                                    )
-                                )
-
-                    else:
-                        logger.info(f"Waiting for favorable condition to accept tender")
+                )
 
-            await asyncio.sleep(1)
         except Exception as e:
             logger.error(f"Unable to get current tick {e}, redo loop")
             await asyncio.sleep(0.2)
@@ -1,4 +1,13 @@
+import asyncio
+import os
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from trading_strategies.apis.book_deltas import BookDeltaEngine
 from trading_strategies.models.custom_models import AuthConfig
+from trading_strategies.models.market_depth import MarketDepth, walk_books
+from trading_strategies.models.rit_records import TenderRecord
 from trading_strategies.strategy.strategy_utility import (
     generate_single_market_depth_for_ticker,
     get_env_variable,
@@ -25,9 +34,58 @@ def parse_lt3_env_variables():
         ),
         "T3_NET_LIMIT": get_env_variable("T3_NET_LIMIT", int, True),
         "T3_GROSS_LIMIT": get_env_variable("T3_GROSS_LIMIT", int, True),
+        # Price move per share beyond visible depth when valuing a tender unwind
+        "T3_IMPACT_PER_SHARE": float(os.getenv("T3_IMPACT_PER_SHARE", 0.00001)),
+        # Seconds to wait for an accepted tender to show in our position
+        "T3_TENDER_CONFIRM_TIMEOUT": float(os.getenv("T3_TENDER_CONFIRM_TIMEOUT", 2.0)),
     }
 
 
+class TenderDecision(NamedTuple):
+    tender: TenderRecord
+    accept: bool  # the edge per share beats the margin
+    vwap: float  # expected VWAP of unwinding the tender quantity
+    edge: float  # expected profit of the whole tender, NaN without a book
+
+
+def value_tenders(
+    tenders: Sequence[TenderRecord],
+    depths: Mapping[str, MarketDepth],
+    margin: float,
+    impact_per_share: float = 0.0,
+) -> List[TenderDecision]:
+    """Values a batch of tenders against the current books in one NumPy pass.
+
+    A tender is priced at the VWAP of unwinding it: a BUY tender is sold into
+    the bids and a SELL tender bought back from the asks, walking the book and
+    extrapolating `impact_per_share` beyond its visible depth. It is accepted
+    when that beats the tender price by more than `margin` per share.
+    """
+    if not tenders:
+        return []
+    buys = np.array([tender.action == "BUY" for tender in tenders])
+    sides = [
+        depths[t.ticker].bids if buy else depths[t.ticker].asks
+        for t, buy in zip(tenders, buys)
+    ]
+    quantities = np.array([tender.quantity for tender in tenders], dtype=np.float64)
+    prices = np.array([tender.price for tender in tenders], dtype=np.float64)
+    direction = np.where(buys, 1.0, -1.0)  # a long unwind gains as the VWAP rises
+
+    vwaps = walk_books(sides, quantities, -direction * impact_per_share)
+    edge_per_share = direction * (vwaps - prices)
+    accept = edge_per_share > margin  # False for NaN, no book means no trade
+    return list(
+        map(
+            TenderDecision,
+            tenders,
+            accept.tolist(),
+            vwaps.tolist(),
+            (edge_per_share * quantities).tolist(),
+        )
+    )
+
+
 async def generate_lt3_signal(
     auth: AuthConfig,
     ticker: str,
@@ -36,22 +94,66 @@ async def generate_lt3_signal(
     quantity: int,
     margin: float,
     market_depth: int = 20,
+    book_engine: Optional[BookDeltaEngine] = None,
+    impact_per_share: float = 0.0,
 ):
-    """Generates a trading signal for the LT3 strategy based on market depth data."""
-    bid_data, ask_data = await generate_single_market_depth_for_ticker(
-        auth, ticker, market_depth
+    """Generates a trading signal for the LT3 strategy based on market depth data.
+    Returns whether to accept the tender and its expected unwind VWAP.
+    """
+    depth = await generate_single_market_depth_for_ticker(
+        auth, ticker, market_depth, book_engine
     )
+    tender = TenderRecord(0, ticker, quantity, action, price)
+    decision = value_tenders([tender], {ticker: depth}, margin, impact_per_share)[0]
+    return (decision.accept, decision.vwap)
 
-    if action == "SELL":
-        for bid_price, bid_volume, cumulative_bid_vol, bid_vwap in bid_data:
-            if cumulative_bid_vol >= quantity:
-                return (price - margin > bid_vwap, bid_vwap)
-        return (price - margin > bid_data[0][3], bid_data[0][3])
 
-    elif action == "BUY":
-        for ask_price, ask_volume, cumulative_ask_vol, ask_vwap in ask_data:
-            if cumulative_ask_vol >= quantity:
-                return (price + margin < ask_vwap, ask_vwap)
-        return (price + margin < ask_data[0][3], ask_data[0][3])
+async def evaluate_tenders(
+    auth: AuthConfig,
+    tenders: Sequence[TenderRecord],
+    margin: float,
+    market_depth: int = 20,
+    book_engine: Optional[BookDeltaEngine] = None,
+    impact_per_share: float = 0.0,
+) -> List[TenderDecision]:
+    """Values every tender against books fetched concurrently, one per ticker."""
+    tickers = list(dict.fromkeys(tender.ticker for tender in tenders))
+    depths = await asyncio.gather(
+        *(
+            generate_single_market_depth_for_ticker(
+                auth, ticker, market_depth, book_engine
+            )
+            for ticker in tickers
+        )
+    )
+    return value_tenders(tenders, dict(zip(tickers, depths)), margin, impact_per_share)
+
 
-    return (False, -1)
+def select_tenders(
+    decisions: Iterable[TenderDecision],
+    positions: Mapping[str, int],
+    net_limit: int,
+    gross_limit: int,
+) -> List[TenderDecision]:
+    """Picks accepted tenders by descending edge while the positions they add
+    stay within the net and gross limits. A tender that would breach a limit is
+    skipped, not the end of the search, so smaller ones can still fit.
+    """
+    positions: Dict[str, int] = dict(positions)
+    net = sum(positions.values())
+    gross = sum(abs(position) for position in positions.values())
+    chosen = []
+    for decision in sorted(
+        (d for d in decisions if d.accept), key=lambda d: d.edge, reverse=True
+    ):
+        tender = decision.tender
+        signed = -tender.quantity if tender.action == "SELL" else tender.quantity
+        position = positions.get(tender.ticker, 0)
+        new_net = net + signed
+        new_gross = gross - abs(position) + abs(position + signed)
+        if abs(new_net) > net_limit or new_gross > gross_limit:
+            continue
+        positions[tender.ticker] = position + signed
+        net, gross = new_net, new_gross
+        chosen.append(decision)
+    return chosen
@@ -1,28 +1,55 @@
 import asyncio
-import threading
+import math
+from typing import Optional, Sequence, Tuple
 
 import trading_strategies.apis.rit_apis as rit
 from trading_strategies.apis.api_utility import (
     accept_tender,
-    fetch_active_tenders,
-    fetch_current_tick,
-    fetch_securities,
-    post_order,
+    dispatch_ioc_children,
+    dispatch_market_children,
+    fetch_security_records,
 )
+from trading_strategies.apis.book_deltas import ConsolidatedView
+from trading_strategies.apis.market_data import (
+    MarketDataService,
+    get_market_data_service,
+)
+from trading_strategies.apis.time_and_sales import TimeAndSalesStreamer
 from trading_strategies.logger_config import setup_logger
+from trading_strategies.models.consolidated_book import split_across_venues
 from trading_strategies.models.custom_models import AuthConfig
+from trading_strategies.models.rit_records import SecurityRecord, TenderRecord
 from trading_strategies.strategy.SOR_strategy_utility import parse_SOR_env_variables
 
 logger = setup_logger(__name__)
-last_tender_price = 0
-current_tick = 0
-max_tick = 0
-slippage_margin = 0
-securities_data = []
+
+
+class SORState:
+    """State shared by the SOR tasks. Every task runs on the same event loop,
+    so reads and writes need no locking; tasks hand work to each other through
+    the `accepted` queue.
+    """
+
+    def __init__(self, sor_config: dict, time_and_sales: TimeAndSalesStreamer):
+        self.max_tick = sor_config["SOR_TRADE_UNTIL_TICK"]
+        self.slippage_margin = sor_config["SOR_SLIPPAGE_MARGIN"]
+        self.min_vwap_margin = sor_config["SOR_MIN_VWAP_MARGIN"]
+        self.time_and_sales = time_and_sales
+        self.current_tick = 0
+        self.last_tender_price = 0.0
+        self.securities: Tuple[SecurityRecord, ...] = ()
+        # Accepted TenderRecords, from the tender task to the routing task
+        self.accepted: asyncio.Queue = asyncio.Queue()
+
+
+def net_position(securities: Sequence[SecurityRecord]) -> int:
+    """Position across all venues, routing sells on one venue against buys on another."""
+    return sum(int(s.position) for s in securities)
 
 
 async def generate_sor_signal(
     auth: AuthConfig,
+    state: SORState,
     ticker: str,
     price: float,
     action: str,
@@ -30,122 +57,201 @@ async def generate_sor_signal(
     vwap_margin: float,
     tender_id: int,
 ):
-    global securities_data
-    # securities_data = await fetch_securities(auth)
-    
-    # Compute Global VWAP
-    total_volume = sum(security["volume"] for security in securities_data)
-    global_vwap = sum(security["volume"] * security["last"] for security in securities_data) / total_volume
-    current_position = next((s["position"] for s in securities_data), 0)
+    securities_data = state.securities
+
+    # Global VWAP from streamed time & sales, volume * last until prints arrive
+    global_vwap = state.time_and_sales.global_vwap()
+    if math.isnan(global_vwap):
+        total_volume = sum(security.volume for security in securities_data)
+        global_vwap = (
+            sum(security.volume * security.last for security in securities_data)
+            / total_volume
+        )
+    current_position = net_position(securities_data)
     multiplier = -1 if action == "SELL" else 1
-    if current_position + quantity*multiplier >= 100000 or current_position + quantity*multiplier <= -100000:
+    if (
+        current_position + quantity * multiplier >= 100000
+        or current_position + quantity * multiplier <= -100000
+    ):
         logger.info(f"Waiting for previous squareoff to happen")
         return {"success": False}
 
     # Evaluate execution condition
     price_threshold = price + vwap_margin if action == "BUY" else price - vwap_margin
-    logger.info(f"tender_price {price} action {action} margin {vwap_margin} threshold {price_threshold} global vwap {global_vwap}")
-    if (action == "BUY" and price_threshold < global_vwap) or (action == "SELL" and price_threshold > global_vwap):
-        logger.info(f"Tender accepted: {ticker} {price} {action} {quantity}, global_vwap: {global_vwap}")
-        return await accept_tender(auth=auth, id=tender_id, price=price)
-    
-    logger.info(f"Waiting for better conditions: {ticker} {price} {action} {quantity}, global_vwap: {global_vwap}")
+    logger.info(
+        f"tender_price {price} action {action} margin {vwap_margin} threshold {price_threshold} global vwap {global_vwap}"
+    )
+    if (action == "BUY" and price_threshold < global_vwap) or (
+        action == "SELL" and price_threshold > global_vwap
+    ):
+        logger.info(
+            f"Tender accepted: {ticker} {price} {action} {quantity}, global_vwap: {global_vwap}"
+        )
+        tender = TenderRecord(tender_id, ticker, quantity, action, price)
+        return await accept_tender(auth=auth, id=tender_id, price=price, tender=tender)
+
+    logger.info(
+        f"Waiting for better conditions: {ticker} {price} {action} {quantity}, global_vwap: {global_vwap}"
+    )
     return {"success": False}
 
 
-async def smart_order_routing(auth: AuthConfig, block_quantity: int = 1000):
-    global last_tender_price, current_tick, max_tick, slippage_margin, securities_data
+def routing_limit(state: SORState, action: str) -> Optional[float]:
+    """Worst price worth routing at, or None near the deadline when anything goes."""
+    if state.current_tick > state.max_tick - 10:
+        return None
+    if action == "SELL":
+        return state.last_tender_price + state.slippage_margin
+    return state.last_tender_price - state.slippage_margin
+
+
+async def smart_order_routing(
+    auth: AuthConfig,
+    state: SORState,
+    market_data: MarketDataService,
+    block_quantity: int = 1000,
+):
+    """Routes the open position out across all venues at once.
+
+    Each decision refreshes every venue's book and splits the whole position
+    over the consolidated book, best levels first and only at profitable
+    prices; the per-venue children, at most `block_quantity` each, go out
+    concurrently as LIMIT orders at the worst level their venue's split takes
+    and are cancelled if they rest, so a book that moved meanwhile never
+    fills them past the limit. Near the deadline, when anything goes, they
+    are MARKET orders. Sleeps on the accepted-tender queue while flat and on
+    securities or book updates while no level is profitable.
+    """
     logger.info("STARTING SMART ORDER ROUTING")
-    
+    updates = market_data.subscribe(("securities", "books"), maxsize=1)
+    engine = market_data.book_engine
+    view: Optional[ConsolidatedView] = None
+
     while True:
         try:
-            securities_data = await fetch_securities(auth)
-            current_position = next((s["position"] for s in securities_data), 0)
-            last_A = next((s["last"] for s in securities_data if s["ticker"].endswith("A")), 0)
-            last_M = next((s["last"] for s in securities_data if s["ticker"].endswith("M")), 0)
-            
+            # Cached per tick and dropped after our own orders, so this is fresh
+            state.securities = tuple(await fetch_security_records(auth))
+            current_position = net_position(state.securities)
+
             if current_position == 0:
                 logger.info("NO POSITION TO ROUTE")
-                await asyncio.sleep(1)
+                try:
+                    tender = await asyncio.wait_for(state.accepted.get(), 1)
+                    logger.info(f"Routing position from tender {tender.tender_id}")
+                except asyncio.TimeoutError:
+                    pass
                 continue
-            
-            logger.info("#### ROUTING NOW ...")
-            logger.info(f"tick {current_tick}: tender price: {last_tender_price}, slippage {slippage_margin}, last_A {last_A}, last_M {last_M}")
+
+            if view is None:
+                view = ConsolidatedView(engine, [s.ticker for s in state.securities])
+            await asyncio.gather(*(engine.poll(venue, auth) for venue in view.venues))
+
             squareoff_action = "SELL" if current_position > 0 else "BUY"
-            quantity = min(abs(current_position), block_quantity)
-            ticker = "THOR_A" if (squareoff_action == "SELL" and last_A > last_M) or (squareoff_action == "BUY" and last_A < last_M) else "THOR_M"
-            
-            logger.info(f"squareoff details {squareoff_action} {quantity} of {ticker}")
-            
-            price_condition = (
-                (squareoff_action == "SELL" and ticker == "THOR_A" and last_A > last_tender_price + slippage_margin) or
-                (squareoff_action == "SELL" and ticker == "THOR_M" and last_M > last_tender_price + slippage_margin) or
-                (squareoff_action == "BUY" and ticker == "THOR_A" and last_A < last_tender_price - slippage_margin) or
-                (squareoff_action == "BUY" and ticker == "THOR_M" and last_M < last_tender_price - slippage_margin) or
-                (current_tick > max_tick - 10)
+            selling = squareoff_action == "SELL"
+            limit_price = routing_limit(state, squareoff_action)
+            book = view.book
+            split = split_across_venues(
+                book.bids if selling else book.asks,
+                abs(current_position),
+                descending=selling,
+                limit_price=limit_price,
             )
-            
-            if price_condition:
-                await post_order(auth, ticker, "MARKET", quantity, squareoff_action)
+            logger.info(
+                f"tick {state.current_tick}: tender price {state.last_tender_price}, limit {limit_price}, {squareoff_action} split {split.quantities} at expected {split.vwap:.4f}"
+            )
+
+            if split.total:
+                slices = [
+                    {
+                        "ticker": venue,
+                        "action": squareoff_action,
+                        "quantity": min(block_quantity, quantity - sent),
+                        "price": split.limits[venue],
+                    }
+                    for venue, quantity in split.quantities.items()
+                    for sent in range(0, quantity, block_quantity)
+                ]
+                # The next decision sees fresh books, so nothing is retried blind
+                if limit_price is None:
+                    await dispatch_market_children(auth, slices, max_rounds=1)
+                else:
+                    await dispatch_ioc_children(auth, slices)
             else:
                 logger.info("Price is not profitable.......")
-            await asyncio.sleep(0.05)        
+                await market_data.next_event(updates, timeout=1)
         except Exception as e:
             logger.error(f"Error {e}, redo smart order routing")
             await asyncio.sleep(0.05)
-            continue
 
-def run_async_in_thread(auth):
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    loop.run_until_complete(smart_order_routing(auth))
-    loop.close()
+
+async def evaluate_tenders(
+    auth: AuthConfig, state: SORState, market_data: MarketDataService
+):
+    """Evaluates live tenders on every tick or tender change and hands accepted
+    ones to the routing task.
+    """
+    updates = market_data.subscribe(("case", "tenders"), maxsize=1)
+    while True:
+        try:
+            await market_data.next_event(updates, timeout=1)
+            snapshot = market_data.snapshot
+            if snapshot.tick is None:
+                continue
+            state.current_tick = snapshot.tick
+            logger.info(f"Current tick is {state.current_tick}")
+
+            # Only look at new tenders while current_tick is within allowed range
+            if state.current_tick > state.max_tick or not snapshot.tenders:
+                continue
+            logger.info(f"Details of tender received: \n{snapshot.tenders}")
+            for tender in snapshot.tenders:
+                logger.info(tender)
+                tender_response = await generate_sor_signal(
+                    auth=auth,
+                    state=state,
+                    ticker=tender.ticker,
+                    price=tender.price,
+                    action=tender.action,
+                    quantity=tender.quantity,
+                    vwap_margin=state.min_vwap_margin,
+                    tender_id=tender.tender_id,
+                )
+                if tender_response["success"]:
+                    await _hand_over(state, tender)
+                    break
+        except Exception as e:
+            logger.error(f"Error {e}, retrying...")
+            await asyncio.sleep(1)
+
+
+async def _hand_over(state: SORState, tender: TenderRecord):
+    state.last_tender_price = tender.price
+    await state.accepted.put(tender)
+    logger.info(
+        "Tender accepted now sleeping tender check for 30 seconds to square off"
+    )
+    await asyncio.sleep(30)
 
 
 async def SOR():
-    global max_tick, last_tender_price, current_tick, slippage_margin
     sor_config = parse_SOR_env_variables()
-    max_tick = sor_config["SOR_TRADE_UNTIL_TICK"]
-    slippage_margin = sor_config["SOR_SLIPPAGE_MARGIN"]
     auth = AuthConfig(**sor_config["auth"])
 
     logger.info(sor_config)
     logger.info(await rit.get_case_status(auth=auth))
-    # Create and start a new thread
-    threading.Thread(target=run_async_in_thread, args=(auth,), daemon=True).start()
+    market_data = get_market_data_service(auth)
+    await market_data.start()
+    securities = await fetch_security_records(auth)
+    state = SORState(
+        sor_config, TimeAndSalesStreamer(auth, [s.ticker for s in securities])
+    )
+    state.securities = tuple(securities)
+    market_data.watch_books(s.ticker for s in securities)
 
-    while True:
-        try:
-            current_tick = await fetch_current_tick(auth)
-            logger.info(f"Current tick is {current_tick}")
-            
-            # Fetch new tenders if current_tick is within allowed range
-            tender_response = {"success": False}
-            if current_tick <= max_tick:
-                logger.info("Looking for new tenders")
-                tender_response = await fetch_active_tenders(auth)
-                if tender_response:
-                    logger.info(f"Details of tender received: \n{tender_response}")
-                    for tender in tender_response:
-                        logger.info(tender)                        
-                        tender_response = await generate_sor_signal(
-                            auth=auth,
-                            ticker=tender["ticker"],
-                            price=tender["price"],
-                            action=tender["action"],
-                            quantity=tender["quantity"],
-                            vwap_margin=sor_config["SOR_MIN_VWAP_MARGIN"],
-                            tender_id=tender["tender_id"],
-                        )
-                    if tender_response["success"]:
-                        last_tender_price = tender["price"]
-                        logger.info("Tender accepted now sleeping tender check for 30 seconds to square off")
-                        await asyncio.sleep(30)
-            else:
-                # End of period - Sleep briefly
-                await asyncio.sleep(1)
-                continue
-
-        except Exception as e:
-            logger.error(f"Error {e}, retrying...")
-        await asyncio.sleep(1)
+    # Tender evaluation and routing are tasks on this loop sharing one
+    # connection pool, instead of a second loop on a thread
+    await asyncio.gather(
+        state.time_and_sales.run(),
+        evaluate_tenders(auth, state, market_data),
+        smart_order_routing(auth, state, market_data),
+    )
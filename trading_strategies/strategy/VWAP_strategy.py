@@ -0,0 +1,164 @@
+import asyncio
+import math
+from typing import Optional
+
+import numpy as np
+
+import trading_strategies.apis.rit_apis as rit
+from trading_strategies.apis.api_utility import (
+    fetch_case,
+    fetch_current_tick,
+    fetch_security_history,
+    fetch_time_and_sales,
+)
+from trading_strategies.apis.time_and_sales import TimeAndSalesStreamer
+from trading_strategies.logger_config import setup_logger
+from trading_strategies.models.custom_models import AuthConfig
+from trading_strategies.strategy.execution_engine import ExecutionEngine
+from trading_strategies.strategy.VWAP_strategy_utility import (
+    ExecutionReport,
+    bucket_edges,
+    parse_vwap_env_variables,
+    schedule,
+    volume_profile,
+)
+
+logger = setup_logger(__name__)
+
+
+async def fetch_volume_profile(
+    auth: AuthConfig,
+    ticker: str,
+    edges: np.ndarray,
+    period: int = 1,
+) -> np.ndarray:
+    """Volume profile over the buckets between `edges` from the previous
+    period's history and time & sales, or the current period's in the first one.
+    """
+    reference = period - 1 if period > 1 else period
+    bars, prints = await asyncio.gather(
+        fetch_security_history(auth, ticker, period=reference),
+        fetch_time_and_sales(auth, ticker, period=reference, limit=10000),
+    )
+    prints = np.array(
+        [(p["price"], p["quantity"], p["tick"]) for p in prints], dtype=float
+    ).reshape(-1, 3)
+    return volume_profile(bars, prints, edges)
+
+
+async def _wait_for_tick(auth: AuthConfig, tick: int, interval: float):
+    while await fetch_current_tick(auth) < tick:
+        await asyncio.sleep(interval)
+
+
+async def execute_schedule(
+    auth: AuthConfig,
+    ticker: str,
+    action: str,
+    quantity: int,
+    edges: np.ndarray,
+    profile: np.ndarray,
+    max_participation: float = 0.2,
+    finish_with_market: bool = True,
+    max_child: int = 10000,
+    interval: float = 0.25,
+    time_and_sales: Optional[TimeAndSalesStreamer] = None,
+) -> ExecutionReport:
+    """Works `quantity` in the tick buckets between `edges`, the ones `profile`
+    was computed over, each worked by an ExecutionEngine that crosses the
+    spread only in the last tick of its bucket.
+
+    A bucket targets the schedule to date less what is filled, so shortfalls
+    carry forward, capped at `max_participation` of the volume expected in the
+    bucket from the recent traded volume rate. With `finish_with_market` the
+    last bucket is uncapped and sweeps what is left at the MARKET.
+    """
+    streamer = time_and_sales or TimeAndSalesStreamer(auth, [ticker])
+    buffer = streamer.buffers[ticker]
+    await streamer.poll()
+    start_volume, start_notional = buffer.total_volume, buffer.total_notional
+
+    targets = np.cumsum(schedule(quantity, profile))
+    filled, notional = 0, 0.0
+    for index, (bucket_start, bucket_end) in enumerate(zip(edges[:-1], edges[1:])):
+        last = index == len(profile) - 1
+        due = int(targets[index]) - filled
+        if bucket_end <= bucket_start or (due <= 0 and not last):
+            continue
+        await _wait_for_tick(auth, bucket_start, interval)
+        await streamer.poll()
+        expected_volume = buffer.volume_rate * (bucket_end - bucket_start)
+        sweep = last and finish_with_market
+        if expected_volume > 0 and not sweep:
+            due = min(due, int(max_participation * expected_volume))
+        if due <= 0:
+            continue
+        engine = ExecutionEngine(
+            auth,
+            ticker,
+            action,
+            due,
+            int(bucket_end),
+            max_child=max_child,
+            urgency_ticks=1,
+            interval=interval,
+            finish_with_market=sweep,
+        )
+        await engine.run()
+        filled += engine.filled
+        notional += engine.notional
+        logger.info(
+            f"Bucket {index} [{bucket_start}, {bucket_end}): filled {engine.filled} of {due}, total {filled} of {quantity}"
+        )
+
+    await streamer.poll()
+    market_volume = buffer.total_volume - start_volume
+    report = ExecutionReport(
+        ticker=ticker,
+        action=action,
+        quantity=quantity,
+        filled=filled,
+        vwap=notional / filled if filled else math.nan,
+        benchmark_vwap=(
+            (buffer.total_notional - start_notional) / market_volume
+            if market_volume > 0
+            else math.nan
+        ),
+        market_volume=market_volume,
+        start_tick=int(edges[0]),
+        end_tick=int(edges[-1]),
+    )
+    logger.info(
+        f"{action} {filled}/{quantity} {ticker} at {report.vwap:.4f} vs benchmark {report.benchmark_vwap:.4f}: {report.slippage_bps:.1f} bps, participation {report.participation:.1%}"
+    )
+    return report
+
+
+async def VWAP():
+    vwap_config = parse_vwap_env_variables()
+    auth = AuthConfig(**vwap_config["auth"])
+    logger.info(vwap_config)
+    logger.info(await rit.get_case_status(auth=auth))
+
+    ticker = vwap_config["VWAP_TICKER"]
+    slices = vwap_config["VWAP_TRADES"]
+    case = await fetch_case(auth)
+    start_tick = case["tick"]
+    end_tick = case["ticks_per_period"]
+    if vwap_config["VWAP_DURATION_TICKS"] > 0:
+        end_tick = min(end_tick, start_tick + vwap_config["VWAP_DURATION_TICKS"])
+    edges = bucket_edges(start_tick, end_tick, slices)
+    if vwap_config["VWAP_ALGO"] == "TWAP":
+        profile = np.full(slices, 1 / slices)
+    else:
+        profile = await fetch_volume_profile(auth, ticker, edges, case.get("period", 1))
+    logger.info(f"{vwap_config['VWAP_ALGO']} profile {np.round(profile, 3)}")
+    return await execute_schedule(
+        auth,
+        ticker,
+        vwap_config["VWAP_TRADE_ACTION"],
+        vwap_config["VWAP_SHARES_TO_FILL"],
+        edges,
+        profile,
+        max_participation=vwap_config["VWAP_MAX_PARTICIPATION"],
+    )
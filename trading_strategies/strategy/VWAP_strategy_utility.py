@@ -0,0 +1,103 @@
+import math
+import os
+from typing import Any, Dict, Iterable, NamedTuple
+
+import numpy as np
+
+from trading_strategies.strategy.strategy_utility import get_env_variable
+
+
+def parse_vwap_env_variables():
+    """Parses and returns VWAP strategy-specific environment variables."""
+    return {
+        "auth": {
+            "username": get_env_variable("USERNAME", str, True),
+            "password": get_env_variable("PASSWORD", str, True),
+            "server": get_env_variable("SERVER", str, True),
+            "port": get_env_variable("VWAP_PORT", str, True),
+        },
+        "VWAP_TICKER": get_env_variable("VWAP_TICKER", str, True),
+        "VWAP_SHARES_TO_FILL": get_env_variable("VWAP_SHARES_TO_FILL", int, True),
+        # Number of schedule buckets the parent order is split into
+        "VWAP_TRADES": get_env_variable("VWAP_TRADES", int, True),
+        "VWAP_TRADE_ACTION": get_env_variable("VWAP_TRADE_ACTION", str, True),
+        # VWAP follows the volume profile, TWAP trades the same amount per bucket
+        "VWAP_ALGO": os.getenv("VWAP_ALGO", "VWAP").upper(),
+        # Ticks to trade over, the rest of the period by default
+        "VWAP_DURATION_TICKS": int(os.getenv("VWAP_DURATION_TICKS", 0)),
+        # Most of the traded volume our children may take
+        "VWAP_MAX_PARTICIPATION": float(os.getenv("VWAP_MAX_PARTICIPATION", 0.2)),
+    }
+
+
+class ExecutionReport(NamedTuple):
+    ticker: str
+    action: str
+    quantity: int
+    filled: int
+    vwap: float  # realized VWAP of our fills, NaN without fills
+    benchmark_vwap: float  # market VWAP over the execution window
+    market_volume: float  # shares traded by everyone over the window
+    start_tick: int
+    end_tick: int
+
+    @property
+    def participation(self) -> float:
+        return self.filled / self.market_volume if self.market_volume else math.nan
+
+    @property
+    def slippage_bps(self) -> float:
+        """Cost against the benchmark in basis points, positive when we did worse."""
+        side = 1 if self.action == "BUY" else -1
+        return side * (self.vwap - self.benchmark_vwap) / self.benchmark_vwap * 1e4
+
+
+def bucket_edges(start_tick: int, end_tick: int, slices: int) -> np.ndarray:
+    """Tick edges of `slices` near-equal buckets of [start_tick, end_tick);
+    bucket i is [edges[i], edges[i + 1]). The profile and the execution of a
+    schedule must share them.
+    """
+    return np.linspace(start_tick, end_tick, slices + 1).round().astype(np.int64)
+
+
+def volume_profile(
+    bars: Iterable[Dict[str, Any]],
+    prints: np.ndarray,
+    edges: np.ndarray,
+) -> np.ndarray:
+    """Share of the parent order to trade in each tick bucket between `edges`,
+    as made by bucket_edges.
+
+    `prints` are (price, quantity, tick) rows of a reference period and give
+    the volume traded at each tick. Ticks with a bar in that period's history
+    were observed, so a quiet one counts as zero volume; ticks outside it get
+    the average observed volume. Uniform, i.e. TWAP, when nothing was observed.
+    """
+    start_tick, end_tick, slices = int(edges[0]), int(edges[-1]), len(edges) - 1
+    ticks = np.arange(start_tick, end_tick)
+    size = max(end_tick, int(prints[:, 2].max()) + 1 if len(prints) else 0)
+    volume = np.bincount(
+        prints[:, 2].astype(np.int64), weights=prints[:, 1], minlength=size
+    )
+    observed = np.zeros(size, dtype=bool)
+    observed[[bar["tick"] for bar in bars if bar["tick"] < size]] = True
+    observed[prints[:, 2].astype(np.int64)] = True
+    mean = volume[observed].mean() if observed.any() else 0.0
+    expected = np.where(observed[ticks], volume[ticks], mean)
+    cumulative = np.concatenate(([0.0], np.cumsum(expected)))
+    buckets = np.diff(cumulative[edges - start_tick])
+    total = buckets.sum()
+    if total <= 0:
+        return np.full(slices, 1 / slices)
+    return buckets / total
+
+
+def schedule(quantity: int, profile: np.ndarray) -> np.ndarray:
+    """Whole-share bucket sizes following `profile` that add up to `quantity`,
+    rounding by largest remainder.
+    """
+    exact = quantity * np.asarray(profile, dtype=float)
+    sizes = np.floor(exact).astype(np.int64)
+    short = quantity - int(sizes.sum())
+    sizes[np.argsort(sizes - exact)[:short]] += 1
+    return sizes
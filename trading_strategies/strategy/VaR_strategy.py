@@ -1,19 +1,17 @@
 import asyncio
-import re
 
 import numpy as np
 
 import trading_strategies.apis.rit_apis as rit
-from trading_strategies.apis.api_utility import (
-    fetch_current_tick,
-    fetch_securities,
-    post_order,
-)
+from trading_strategies.apis.api_utility import fetch_security_records, post_order
+from trading_strategies.apis.market_data import get_market_data_service
 from trading_strategies.logger_config import setup_logger
 from trading_strategies.models.custom_models import AuthConfig
 from trading_strategies.strategy.Var_utility import (
+    AnalystExpectations,
     calculate_units,
     calculate_var,
+    parse_analyst_expectation,
     parse_var_env_variables,
 )
 
@@ -38,34 +36,18 @@ def calculate_fractions(portfolio: dict) -> list[float]:
     return fractions, total_value
 
 
-async def fetch_securities_position(auth: AuthConfig):
+def securities_position(securities) -> dict:
     current_value = {}
-    securities = await fetch_securities(auth=auth)
     for security in securities:
         ticker_detail = {}
-        ticker_detail["position"] = security["position"]
-        ticker_detail["last"] = security["last"]
-        current_value[security["ticker"]] = ticker_detail
+        ticker_detail["position"] = security.position
+        ticker_detail["last"] = security.last
+        current_value[security.ticker] = ticker_detail
     return current_value
 
 
-async def parse_recent_news(auth: AuthConfig):
-    all_news = await rit.get_recent_news(auth=auth)
-    print("news received of length", len(all_news))
-    # pattern = r"tick (\d+).*?US = \$(\d+\.\d+).*?BRIC = \$(\d+\.\d+).*?BOND (\d+\.\d+)"
-    pattern = r"tick (\d+).*?US = \$(\d+(?:\.\d{1,2})?).*?BRIC = \$(\d+(?:\.\d{1,2})?).*?BOND (\d+(?:\.\d{1,2})?)"
-    if len(all_news) <= 1:
-        return {}, 0
-    match = re.search(pattern, all_news[0]["body"])
-    if match:
-        tick, us, bric, bond = match.groups()
-        return {
-            "tick": int(tick),
-            "US": float(us),
-            "BRIC": float(bric),
-            "BOND": float(bond),
-        }, len(all_news)
-    return {}, len(all_news)
+async def fetch_securities_position(auth: AuthConfig):
+    return securities_position(await fetch_security_records(auth=auth))
 
 
 async def batch_post_order(
@@ -172,26 +154,38 @@ async def Var(risk_value: float = 20000):
         ]
     )
 
-    # Portfolio value
-    number_of_news = 0
+    # Case, positions and news come from the shared market-data poller;
+    # news is read incrementally and parsed once into the expectations index
+    market_data = get_market_data_service(auth)
+    expectations = AnalystExpectations()
+    market_data.news_feed.subscribe(
+        lambda news, _: expectations.on_news(news, parse_analyst_expectation(news))
+    )
+    await market_data.start()
+    updates = market_data.subscribe(("case", "securities", "news"), maxsize=1)
+    seen_version = 0
     value_at_risk = 0
 
     while True:
         try:
-            case_status = (await rit.get_case_status(auth))["status"]
+            # Wait for the next case, position or news change
+            await market_data.next_event(updates, timeout=1)
+            snapshot = market_data.snapshot
+            case_status = snapshot.status
             if case_status != "ACTIVE":
                 logger.info(f"Case is NOT ACTIVE: {case_status}")
-                number_of_news = 0
+                market_data.news_feed.reset()
+                expectations.clear()
+                seen_version = expectations.version
                 value_at_risk = 0
-                await asyncio.sleep(1)
                 continue
-            current_value.update(await fetch_securities_position(auth))
+            current_value.update(securities_position(snapshot.securities))
             logger.info(f"Current value: {current_value}")
-            analyst_expectation, new_news_length = await parse_recent_news(auth=auth)
+            analyst_expectation = expectations.latest or {}
             logger.info(f"Analyst expectation {analyst_expectation}")
             # make a new transaction only if new news arrives
-            if new_news_length > number_of_news:
-                number_of_news = new_news_length
+            if expectations.version > seen_version:
+                seen_version = expectations.version
                 expected_returns = np.array(
                     [
                         (analyst_expectation["US"] - current_value["US"]["last"])
@@ -251,7 +245,7 @@ async def Var(risk_value: float = 20000):
                 logger.info(f"Transaction details {transaction_response}")
                 # await batch_post_order(auth=auth,quantity=units_to_transact, ticker=max_return_ticker, action=square_off_action, order_type="LIMIT", price=analyst_expectation[max_return_ticker])
 
-            current_tick = await fetch_current_tick(auth=auth)
+            current_tick = market_data.snapshot.tick
             current_value["tick"] = current_tick
             logger.info(f"Current tick is {current_tick}")
             current_value.update(await fetch_securities_position(auth))
@@ -277,7 +271,6 @@ async def Var(risk_value: float = 20000):
                 current_position=current_value,
                 analyst_expectation=analyst_expectation,
             )
-            await asyncio.sleep(1)
         except Exception as e:
             logger.error(f"{e}, redo loop")
             await asyncio.sleep(0.2)
@@ -1,3 +1,7 @@
+import bisect
+import re
+from typing import Dict, List, Optional
+
 import numpy as np
 from cvxopt import matrix, solvers
 from scipy.stats import norm
@@ -20,6 +24,65 @@ def parse_var_env_variables():
     }
 
 
+# Compiled once; bonds are quoted without the dollar sign
+ANALYST_EXPECTATION_PATTERN = re.compile(
+    r"tick (\d+).*?US = \$(\d+(?:\.\d{1,2})?).*?BRIC = \$(\d+(?:\.\d{1,2})?).*?BOND (\d+(?:\.\d{1,2})?)"
+)
+
+
+def parse_analyst_expectation(news: dict) -> Optional[dict]:
+    """Parses the analyst price targets out of a news item, None if it has none."""
+    match = ANALYST_EXPECTATION_PATTERN.search(news["body"])
+    if match is None:
+        return None
+    tick, us, bric, bond = match.groups()
+    return {
+        "tick": int(tick),
+        "US": float(us),
+        "BRIC": float(bric),
+        "BOND": float(bond),
+    }
+
+
+class AnalystExpectations:
+    """Analyst price targets indexed by the tick they are for.
+    Subscribe `on_news` to a NewsFeed parsing with parse_analyst_expectation.
+    `version` counts the expectations received so far, letting a strategy act
+    only when a new one has arrived.
+    """
+
+    def __init__(self):
+        self._ticks: List[int] = []
+        self._by_tick: Dict[int, dict] = {}
+        self.latest: Optional[dict] = None
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+    def on_news(self, news: dict, expectation: Optional[dict]):
+        if expectation is None:
+            return
+        tick = expectation["tick"]
+        if tick not in self._by_tick:
+            bisect.insort(self._ticks, tick)
+        self._by_tick[tick] = expectation
+        self.latest = expectation
+        self.version += 1
+
+    def for_tick(self, tick: int) -> Optional[dict]:
+        """Returns the expectation for the first target tick at or after `tick`."""
+        index = bisect.bisect_left(self._ticks, tick)
+        if index == len(self._ticks):
+            return None
+        return self._by_tick[self._ticks[index]]
+
+    def clear(self):
+        self._ticks.clear()
+        self._by_tick.clear()
+        self.latest = None
+
+
 def variance_covariance_matrix(volatilities, correlation_matrix):
     """
     Computes the variance-covariance matrix from a given volatility vector and correlation matrix.
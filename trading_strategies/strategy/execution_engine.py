@@ -0,0 +1,256 @@
+import asyncio
+import math
+import os
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from trading_strategies.apis.api_utility import (
+    cancel_order,
+    fetch_current_tick,
+    fetch_order,
+    invalidate_positions,
+    post_order,
+)
+from trading_strategies.apis.book_deltas import BookDeltaEngine
+from trading_strategies.logger_config import setup_logger
+from trading_strategies.models.custom_models import AuthConfig
+from trading_strategies.models.market_depth import MarketDepth
+from trading_strategies.strategy.strategy_utility import (
+    generate_single_market_depth_for_ticker,
+)
+
+logger = setup_logger(__name__)
+
+# Ticks a square-off may take before it crosses the spread for what is left
+EXECUTION_HORIZON_TICKS = int(os.getenv("EXECUTION_HORIZON_TICKS", 30))
+
+
+class ChildOrder:
+    """A child order of a parent being worked, with the fills applied so far."""
+
+    __slots__ = ("order_id", "type", "price", "quantity", "filled", "notional", "live")
+
+    def __init__(self, order_id: int, type: str, price: Optional[float], quantity: int):
+        self.order_id = order_id
+        self.type = type
+        self.price = price
+        self.quantity = quantity
+        self.filled = 0
+        self.notional = 0.0
+        self.live = True
+
+    @property
+    def open_quantity(self) -> int:
+        return self.quantity - self.filled if self.live else 0
+
+    def __repr__(self):
+        return (
+            f"ChildOrder(order_id={self.order_id}, {self.type} {self.quantity}"
+            f" @ {self.price}, filled={self.filled}, live={self.live})"
+        )
+
+
+class ExecutionEngine:
+    """Works a parent order in one ticker through LIMIT children.
+
+    Each step refreshes the live child by id, then sizes the quantity to work
+    from the visible depth opposite us and the ticks left before `end_tick`,
+    sending a child only for what resting children do not already cover. The
+    child joins the best price on our side, never worse than `limit_price`;
+    within `urgency_ticks` of the end it crosses the spread instead. A child
+    whose price is no longer the target is cancelled and replaced. Fills are
+    taken from the child order states, so `remaining` is always exact. At
+    `end_tick` live children are cancelled and, with `finish_with_market`, the
+    rest is sent as MARKET orders, less whatever children that could not be
+    read back after their cancel may still fill.
+    """
+
+    def __init__(
+        self,
+        auth: AuthConfig,
+        ticker: str,
+        action: str,
+        quantity: int,
+        end_tick: int,
+        limit_price: Optional[float] = None,
+        max_child: int = 10000,
+        participation: float = 0.5,
+        depth_levels: int = 5,
+        urgency_ticks: int = 5,
+        interval: float = 0.25,
+        finish_with_market: bool = True,
+        market_depth: int = 20,
+        book_engine: Optional[BookDeltaEngine] = None,
+    ):
+        self.auth = auth
+        self.ticker = ticker
+        self.action = action
+        self.quantity = int(quantity)
+        self.end_tick = end_tick
+        self.limit_price = limit_price
+        self.max_child = max_child
+        self.participation = participation
+        self.depth_levels = depth_levels
+        self.urgency_ticks = urgency_ticks
+        self.interval = interval
+        self.finish_with_market = finish_with_market
+        self.market_depth = market_depth
+        self.book_engine = book_engine
+        self.filled = 0
+        self.notional = 0.0
+        self.children: Dict[int, ChildOrder] = {}
+
+    @property
+    def remaining(self) -> int:
+        return self.quantity - self.filled
+
+    @property
+    def open_quantity(self) -> int:
+        return sum(child.open_quantity for child in self.children.values())
+
+    @property
+    def vwap(self) -> float:
+        return self.notional / self.filled if self.filled else math.nan
+
+    def _apply(self, child: ChildOrder, order: Mapping[str, Any]):
+        filled = int(order.get("quantity_filled") or 0)
+        if filled > child.filled:
+            invalidate_positions(self.auth)  # a resting child may fill between ticks
+            notional = filled * (order.get("vwap") or order.get("price") or 0.0)
+            self.filled += filled - child.filled
+            self.notional += notional - child.notional
+            child.filled, child.notional = filled, notional
+        child.live = order.get("status", "OPEN") == "OPEN" and child.filled < (
+            child.quantity
+        )
+
+    async def _send(self, type: str, quantity: int, price: Optional[float] = None):
+        order = await post_order(
+            self.auth, self.ticker, type, quantity, self.action, price
+        )
+        child = ChildOrder(order["order_id"], type, price, quantity)
+        self.children[child.order_id] = child
+        self._apply(child, order)
+        return child
+
+    async def refresh(self):
+        """Brings every live child up to date with one GET per child."""
+        live = [child for child in self.children.values() if child.live]
+        orders = await asyncio.gather(
+            *(fetch_order(self.auth, child.order_id) for child in live),
+            return_exceptions=True,
+        )
+        for child, order in zip(live, orders):
+            if isinstance(order, Exception):
+                logger.error(f"Unable to refresh child {child.order_id}: {order}")
+            else:
+                self._apply(child, order)
+
+    async def cancel(self, child: ChildOrder) -> bool:
+        """Cancels a child and applies whatever it filled before the cancel.
+        Returns False if the child could not be read back; it then stays live,
+        its state unknown, and counts as open until a later read settles it.
+        """
+        try:
+            await cancel_order(self.auth, child.order_id)
+        except Exception as e:
+            logger.info(f"Cancel of child {child.order_id} failed: {e}")
+        try:
+            self._apply(child, await fetch_order(self.auth, child.order_id))
+        except Exception as e:
+            logger.error(f"Unable to refresh child {child.order_id}: {e}")
+            return False
+        return True
+
+    async def cancel_all(self, max_rounds: int = 3) -> bool:
+        """Cancels every live child, re-checking those left unknown for up to
+        max_rounds rounds. Returns True once no child is live.
+        """
+        for _ in range(max_rounds):
+            live = [child for child in self.children.values() if child.live]
+            if not live:
+                return True
+            await asyncio.gather(*(self.cancel(child) for child in live))
+        unknown = [c.order_id for c in self.children.values() if c.live]
+        if unknown:
+            logger.error(f"Children {unknown} unsettled after {max_rounds} rounds")
+        return not unknown
+
+    def target(self, depth: MarketDepth, tick: int) -> Tuple[Optional[float], int]:
+        """Price and size of the child to work at `tick`, price None if the book
+        offers nothing to price against.
+        """
+        ours, theirs = (
+            (depth.asks, depth.bids)
+            if self.action == "SELL"
+            else (depth.bids, depth.asks)
+        )
+        ticks_left = max(self.end_tick - tick, 1)
+        if ticks_left <= self.urgency_ticks and len(theirs):
+            price = float(theirs.prices[0])  # cross the spread
+        elif len(ours):
+            price = float(ours.prices[0])  # join the best price on our side
+            if self.limit_price is not None:
+                worse = (
+                    price < self.limit_price
+                    if self.action == "SELL"
+                    else (price > self.limit_price)
+                )
+                price = self.limit_price if worse else price
+        elif self.limit_price is not None:
+            price = self.limit_price
+        else:
+            return None, 0
+        levels = min(self.depth_levels, len(theirs))
+        visible = float(theirs.cumulative[levels - 1]) if levels else 0.0
+        pace = math.ceil(self.remaining / ticks_left)
+        size = max(pace, int(visible * self.participation))
+        return price, min(size, self.remaining, self.max_child)
+
+    async def step(self, tick: int):
+        """One refresh, reprice and replace cycle."""
+        await self.refresh()
+        if self.remaining <= 0:
+            return
+        depth = await generate_single_market_depth_for_ticker(
+            self.auth, self.ticker, self.market_depth, self.book_engine
+        )
+        price, size = self.target(depth, tick)
+        if price is None:
+            return
+        stale = [c for c in self.children.values() if c.live and c.price != price]
+        if stale:
+            await asyncio.gather(*(self.cancel(child) for child in stale))
+        # `size` is what should be working, so only top up what is resting
+        size = min(size, self.remaining) - self.open_quantity
+        if size > 0:
+            await self._send("LIMIT", size, price)
+
+    async def _sweep(self):
+        # Children whose state is unknown may still fill, so they are not swept
+        while self.remaining - self.open_quantity > 0:
+            size = min(self.remaining - self.open_quantity, self.max_child)
+            child = await self._send("MARKET", size)
+            if child.filled == 0:
+                logger.error(f"MARKET child {child.order_id} did not fill")
+                return
+
+    async def run(self) -> "ExecutionEngine":
+        """Works the order until it is filled or `end_tick` is reached."""
+        try:
+            while self.remaining > 0:
+                try:
+                    tick = await fetch_current_tick(self.auth)
+                    if tick >= self.end_tick:
+                        break
+                    await self.step(tick)
+                except Exception as e:
+                    logger.error(f"Execution step for {self.ticker} failed: {e}")
+                await asyncio.sleep(self.interval)
+        finally:
+            await self.cancel_all()
+        if self.remaining > 0 and self.finish_with_market:
+            await self._sweep()
+        logger.info(
+            f"{self.action} {self.quantity} {self.ticker}: filled {self.filled} at {self.vwap:.4f}, remaining {self.remaining}"
+        )
+        return self